@@ -1,119 +1,30 @@
 import os
 import sys
 import time
+import collections
 import threading
 import subprocess
-import re
-import shutil
 import webbrowser
-import concurrent.futures
+import tkinter as tk
+import sqlite3
 import customtkinter as ctk
 
+from filemanager import (
+    CATEGORY_NAMES, DirectoryWatcher, FileIndex, Query, QueryCache, SearchCancelled, Stats, TrigramIndex,
+    find_duplicates, format_organize_report, get_ext, get_previews, normalize_roots, organize, parse_roots,
+    plan_organize, resume_organize, scan_directory, scan_roots, search_query, split_member_path,
+    undo_organize,
+)
+from filemanager.common import RANK_TOP_K
+
 # --- GLOBAL CONFIG & DATA ---
-MAX_FILE_SIZE = 50 * 1024 * 1024 
+# Konfigurasi backend (ukuran file, jumlah worker, lokasi index) ada di filemanager.common
+PROGRESS_INTERVAL_MS = 100  # progress & hasil baru digabung per interval ini
+ALL_CATEGORIES = "Semua kategori"
+MAX_CACHED_ROOTS = 8  # hasil scan root yang disimpan; root lain dipindai ulang saat dipakai lagi
 
 ALL_FILES = []
 TEXT_FILES = []
-_lock = threading.Lock()
-
-# --- FUNGSI BACKEND ---
-def is_text_candidate(path):
-    try:
-        if os.path.getsize(path) > MAX_FILE_SIZE:
-            return False
-    except Exception:
-        return False
-
-    try:
-        with open(path, "rb") as file:
-            chunk = file.read(2048)
-            if not chunk:
-                return True
-            if b"\x00" in chunk:
-                return False
-            try:
-                chunk.decode("utf-8")
-                return True
-            except Exception:
-                try:
-                    chunk.decode("latin-1")
-                    return True
-                except Exception:
-                    return False
-    except Exception:
-        return False
-
-# --- SEARCH LOGIC (BACKEND) ---
-def scan_directory(root_path, callback=None):
-    all_files = []
-    text_files = []
-    count = 0
-    
-    for dirpath, _, filenames in os.walk(root_path):
-        for fn in filenames:
-            full_path = os.path.join(dirpath, fn)
-            all_files.append(full_path)
-            
-            if is_text_candidate(full_path):
-                text_files.append(full_path)
-            
-            count += 1
-            # Update UI every 50 files to prevent lag
-            if callback and count % 50 == 0:
-                callback(count)
-                
-    if callback: callback(count) # Final update
-    return all_files, text_files
-
-def search_name_contains(keyword: str, file_list: list):
-    k = keyword.lower()
-    found = [f for f in file_list if k in os.path.basename(f).lower()]
-    
-    folder_matches = {
-        os.path.dirname(f) 
-        for f in file_list 
-        if k in os.path.basename(os.path.dirname(f)).lower()
-    }
-    return sorted(set(found) | folder_matches)
-
-def _check_file_content(path, keywords, mode_and):
-    try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            data = f.read().lower()
-
-        if mode_and:
-            if all(token in data for token in keywords):
-                return path
-        else:
-            if any(token in data for token in keywords):
-                return path
-    except Exception:
-        pass
-    return None
-
-def search_content(keywords: list, file_list: list, mode_and: bool = True, callback=None):
-    kw = [k.lower() for k in keywords]
-    found = []
-    total = len(file_list)
-    completed = 0
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        future_to_file = {
-            executor.submit(_check_file_content, path, kw, mode_and): path 
-            for path in file_list
-        }
-        
-        for future in concurrent.futures.as_completed(future_to_file):
-            result = future.result()
-            if result:
-                found.append(result)
-            
-            completed += 1
-            if callback and completed % 5 == 0:
-                callback(completed, total)
-                
-    if callback: callback(total, total)
-    return sorted(found)
 
 def open_path(path: str):
     try:
@@ -126,147 +37,149 @@ def open_path(path: str):
     except Exception as e:
         print("Gagal membuka path:", e)
 
-def get_previews(path: str, keywords: list, context_lines: int = 1, max_snippets: int = 3):
-    kws = [k.lower() for k in keywords]
-    snippets = []
-    
-    def _highlight(text: str, keywords: list):
-        def repl(m):
-            return f"--> {m.group(0)} <--"
-        for kw in keywords:
-            try:
-                text = re.sub(re.escape(kw), repl, text, flags=re.IGNORECASE)
-            except re.error:
-                continue
-        return text
-
-    try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.read().splitlines()
-    except Exception:
-        return snippets
-
-    for i, line in enumerate(lines):
-        low = line.lower()
-        if any(kw in low for kw in kws):
-            start = max(0, i - context_lines)
-            end = min(len(lines), i + context_lines + 1)
-            snippet = lines[start:end]
-            snippet_hl = [_highlight(ln, keywords) for ln in snippet]
-            snippets.append((i + 1, snippet_hl))
-
-            if len(snippets) >= max_snippets:
-                break
-    return snippets        
-
-FILE_CATEGORIES = {
-    "Gambar": [
-        ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif",
-        ".svg", ".webp", ".ico", ".heic", ".heif", ".raw",
-        ".arw", ".cr2", ".nef", ".orf", ".rw2", ".psd", ".ai", ".eps"
-    ],
-
-    "Dokumen": [
-        ".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt",
-        ".xls", ".xlsx", ".csv", ".tsv", ".ppt", ".pptx",
-        ".epub", ".md"
-    ],
-
-    "Video": [
-        ".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv",
-        ".webm", ".mpeg", ".mpg", ".3gp", ".m4v"
-    ],
-
-    "Suara": [
-        ".mp3", ".wav", ".flac", ".aac", ".ogg", ".oga",
-        ".wma", ".m4a", ".amr", ".aiff"
-    ],
-
-    "Arsip": [
-        ".zip", ".rar", ".7z", ".tar", ".gz", ".bz2",
-        ".xz", ".iso", ".lz", ".zst"
-    ],
-
-    "Kode": [
-        ".py", ".js", ".ts", ".html", ".css", ".php",
-        ".java", ".cpp", ".c", ".h", ".hpp", ".cs",
-        ".rb", ".go", ".rs", ".kt", ".swift", ".m",
-        ".lua", ".sql", ".xml", ".json", ".yaml", ".yml"
-    ],
-
-    "3DModel": [
-        ".obj", ".fbx", ".stl", ".dae", ".blend",
-        ".gltf", ".glb"
-    ],
-
-    "Aplikasi-Executable-Installer": [
-        ".exe", ".msi", ".bat", ".cmd", ".sh", ".apk",
-        ".app", ".deb", ".rpm"
-    ],
-
-    "Database": [
-        ".db", ".sqlite", ".sqlite3", ".mdb",
-        ".accdb", ".sql", ".dbf"
-    ],
-
-    "GIS-MapData": [
-        ".shp", ".kml", ".kmz", ".geojson", ".gpx"
-    ],
-
-    "Font": [
-        ".ttf", ".otf", ".woff", ".woff2"
-    ],
-
-    "EBook": [
-        ".epub", ".mobi", ".azw3", ".fb2"
-    ]
-}
-
-def get_category(file):
-    ext = os.path.splitext(file)[1].lower()
-    for category, extensions in FILE_CATEGORIES.items():
-        if ext in extensions:
-            return category
-    return "Lainnya"
-
-def get_ext(file):
-    ext = os.path.splitext(file)[1].lower()
-    return ext
-
-def organize(folder_path, isKelompok, isExt):
-    if not os.path.isdir(folder_path):
-        return
-    # Menyesuaikan kelompok semua file yang ada di folder target
-    for file in os.listdir(folder_path):
-        filePath = os.path.join(folder_path, file)
-        
-        if os.path.isdir(filePath):
-            continue
-        
-        kategori = get_category(file)
-        ext = get_ext(file)
-        
-        # Membuat path baru untuk folder program file organizer
-        organizedFolder = os.path.join(folder_path, "ORGANIZED FILES")
-        folderKategori = os.path.join(organizedFolder, kategori) if isKelompok == "y" else organizedFolder
-        folderExt = os.path.join(folderKategori, ext) if isExt == "y" else folderKategori
-
-        # Buat folder kalau belum ada
-        os.makedirs(organizedFolder, exist_ok=True)
-        if isKelompok == "y": os.makedirs(folderKategori, exist_ok=True)
-        if isExt == "y": os.makedirs(folderExt, exist_ok=True)
-        
-        #Pindahkan file/folder
-        shutil.move(filePath, os.path.join(folderExt, file))
-
-        #Hasil pemindahan/pengelompokan
-        print(f"[OK] {file} -> {kategori} ({get_ext(file)})")
-
 
 # --- UI ---
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
+class VirtualResultList(ctk.CTkFrame):
+    # Daftar hasil virtual: hanya baris yang terlihat yang digambar di canvas,
+    # data tetap berupa list path milik pemanggil (tidak disalin)
+    def __init__(self, master, on_select=None, on_activate=None, row_height=22, **kwargs):
+        super().__init__(master, **kwargs)
+        self.items = []
+        self.message = ""
+        self.top = 0
+        self.selected = None
+        self.row_height = row_height
+        self.on_select = on_select
+        self.on_activate = on_activate
+        self._rows = []  # pool (rect, text) yang dipakai ulang saat scroll
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self._bg = self._apply_appearance_mode(("#F9F9FA", "#1D1E1E"))
+        self._fg = self._apply_appearance_mode(("gray10", "#DCE4EE"))
+        self._sel = self._apply_appearance_mode(("#3B8ED0", "#1F538D"))
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg=self._bg)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll(3))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Double-Button-1>", self._on_double_click)
+        for key, delta in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-"), ("<Next>", "page+")):
+            self.canvas.bind(key, lambda e, d=delta: self._on_key(d))
+
+    def _visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height + 1)
+
+    def set_items(self, items, message=""):
+        self.items = items
+        self.message = message
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def set_message(self, message):
+        self.message = message
+        self.refresh()
+
+    def scroll(self, rows):
+        self.top = max(0, min(self.top + rows, len(self.items) - self._visible_rows() + 1))
+        self.refresh()
+
+    def refresh(self):
+        visible = self._visible_rows()
+        self.top = max(0, min(self.top, len(self.items) - 1))
+        width = self.canvas.winfo_width()
+        while len(self._rows) < visible:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, width=0, fill=self._bg)
+            text = self.canvas.create_text(6, 0, anchor="w", fill=self._fg, font=("Arial", 12))
+            self._rows.append((rect, text))
+
+        for j, (rect, text) in enumerate(self._rows):
+            i = self.top + j
+            y = j * self.row_height
+            if j < visible and i < len(self.items):
+                fill = self._sel if i == self.selected else self._bg
+                self.canvas.coords(rect, 0, y, width, y + self.row_height)
+                self.canvas.itemconfigure(rect, fill=fill, state="normal")
+                self.canvas.coords(text, 6, y + self.row_height // 2)
+                self.canvas.itemconfigure(text, text=f"[{i + 1}] {self.items[i]}", state="normal")
+            elif j == 0 and not self.items and self.message:
+                self.canvas.itemconfigure(rect, state="hidden")
+                self.canvas.coords(text, 6, self.row_height // 2)
+                self.canvas.itemconfigure(text, text=self.message, state="normal")
+            else:
+                self.canvas.itemconfigure(rect, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + visible - 1) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.top = int(float(value) * len(self.items))
+            self.refresh()
+        elif action == "scroll":
+            step = self._visible_rows() - 1 if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def _on_wheel(self, event):
+        # Windows mengirim kelipatan 120, macOS nilai kecil
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll(-3 * delta)
+
+    def _row_at(self, y):
+        i = self.top + int(y // self.row_height)
+        return i if 0 <= i < len(self.items) else None
+
+    def _select(self, i):
+        self.selected = i
+        if i < self.top:
+            self.top = i
+        elif i >= self.top + self._visible_rows() - 1:
+            self.top = i - self._visible_rows() + 2
+        self.refresh()
+        if self.on_select:
+            self.on_select(i + 1)
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        i = self._row_at(event.y)
+        if i is not None:
+            self._select(i)
+
+    def _on_double_click(self, event):
+        i = self._row_at(event.y)
+        if i is not None and self.on_activate:
+            self.on_activate(i + 1)
+
+    def _on_key(self, delta):
+        if not self.items:
+            return
+        if delta in ("page-", "page+"):
+            delta = (self._visible_rows() - 1) * (1 if delta == "page+" else -1)
+        current = self.selected if self.selected is not None else self.top - 1
+        self._select(max(0, min(len(self.items) - 1, current + delta)))
+
+# Kunci pengurutan hasil pencarian
+RESULT_SORT_KEYS = {
+    "Path": lambda p: p.lower(),
+    "Nama": lambda p: os.path.basename(p).lower(),
+    "Folder": lambda p: (os.path.dirname(p).lower(), os.path.basename(p).lower()),
+    "Ekstensi": lambda p: (get_ext(p), os.path.basename(p).lower()),
+}
+RELEVANCE = "Relevansi"  # skor dari pencarian berperingkat, bukan dari path
+
 class FileManagerApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -276,10 +189,31 @@ class FileManagerApp(ctk.CTk):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
         
-        self.current_search_root = ""
-        self.scanned_files = []      
-        self.scanned_text_files = [] 
+        self.current_roots = []  # root pencarian terakhir (sudah dinormalisasi)
+        self.scans = collections.OrderedDict()  # root -> ScanResult, urutan LRU
         self.search_results = []
+        self.result_scores = {}  # path -> skor, hanya dari pencarian berperingkat
+        self.trigram_index = None
+        self._trigram_lock = threading.Lock()
+        self.query_cache = QueryCache()  # hasil pencarian isi per (root, generation scan), hanya saat watcher aktif
+
+        # State pencarian yang ditulis thread worker dan dibaca _poll_search (thread Tk)
+        self._search_running = False
+        self._cancel_event = threading.Event()
+        self._progress = None
+        self._results_lock = threading.Lock()
+        self._pending_results = []
+        self._seen_results = set()
+        self._typing_job = None
+        self._dup_cancel_event = threading.Event()
+        self.watchers = {}  # root -> DirectoryWatcher
+        self.last_stats = None  # Stats dari pencarian terakhir (tombol Statistik)
+
+        try:
+            self.file_index = FileIndex()
+        except (OSError, sqlite3.Error) as e:
+            print("Index tidak tersedia:", e)
+            self.file_index = None
         
         self.main_container = ctk.CTkFrame(self)
         self.main_container.grid(row=0, column=0, sticky="nsew")
@@ -291,6 +225,7 @@ class FileManagerApp(ctk.CTk):
         self.frames["MainMenu"] = self._create_main_menu_frame(self.main_container)
         self.frames["FileFinder"] = self._create_file_finder_frame(self.main_container)
         self.frames["FileOrganizer"] = self._create_file_organizer_frame(self.main_container)
+        self.frames["DuplicateFinder"] = self._create_duplicate_finder_frame(self.main_container)
         
         for f in self.frames.values():
             f.grid(row=0, column=0, sticky="nsew")
@@ -332,6 +267,9 @@ class FileManagerApp(ctk.CTk):
 
         ctk.CTkButton(btn_box, text="🗂️ File Organizer", command=lambda: self.show_frame("FileOrganizer"), 
                       width=200, height=50, font=("Arial", 18, "bold"), fg_color="red", hover_color="#CC0000").pack(side="left", padx=20)
+
+        ctk.CTkButton(btn_box, text="📑 Duplicate Finder", command=lambda: self.show_frame("DuplicateFinder"), 
+                      width=200, height=50, font=("Arial", 18, "bold"), fg_color="red", hover_color="#CC0000").pack(side="left", padx=20)
         
         return frame
 
@@ -356,9 +294,10 @@ class FileManagerApp(ctk.CTk):
         path_box = ctk.CTkFrame(control_frame, fg_color="transparent")
         path_box.pack(fill="x", padx=10)
         
-        self.entry_finder_path = ctk.CTkEntry(path_box, placeholder_text="Pilih folder root...")
+        self.entry_finder_path = ctk.CTkEntry(path_box, placeholder_text=f"Pilih folder root (beberapa dipisah '{os.pathsep}')...")
         self.entry_finder_path.pack(side="left", fill="x", expand=True)
         ctk.CTkButton(path_box, text="📂", width=40, command=self._select_finder_root).pack(side="left", padx=(5,0))
+        ctk.CTkButton(path_box, text="+", width=40, command=lambda: self._select_finder_root(add=True)).pack(side="left", padx=(5,0))
 
         # Keywords
         ctk.CTkLabel(control_frame, text="2. Kriteria Pencarian:", font=("Arial", 14, "bold")).pack(pady=(20, 5), anchor="w", padx=10)
@@ -366,6 +305,7 @@ class FileManagerApp(ctk.CTk):
         ctk.CTkLabel(control_frame, text="Nama File (Opsional):").pack(anchor="w", padx=10)
         self.entry_name_kw = ctk.CTkEntry(control_frame, placeholder_text="misal: skripsi")
         self.entry_name_kw.pack(fill="x", padx=10, pady=(0, 10))
+        self.entry_name_kw.bind("<KeyRelease>", self._on_name_typed)
 
         ctk.CTkLabel(control_frame, text="Isi Teks (Opsional):").pack(anchor="w", padx=10)
         self.entry_content_kw = ctk.CTkTextbox(control_frame, height=80)
@@ -378,12 +318,59 @@ class FileManagerApp(ctk.CTk):
         ctk.CTkRadioButton(row_radio, text="AND", variable=self.search_mode, value="and", fg_color="red").pack(side="left", padx=10)
         ctk.CTkRadioButton(row_radio, text="OR", variable=self.search_mode, value="or", fg_color="red").pack(side="left")
 
+        # Filter dijalankan pada data hasil scan, sebelum ada file yang dibuka
+        ctk.CTkLabel(control_frame, text="Filter (Opsional):").pack(anchor="w", padx=10, pady=(10, 0))
+        filter_box = ctk.CTkFrame(control_frame, fg_color="transparent")
+        filter_box.pack(fill="x", padx=10)
+        filter_box.grid_columnconfigure((0, 1), weight=1)
+        self.entry_min_size = ctk.CTkEntry(filter_box, placeholder_text="Ukuran min (10K)")
+        self.entry_max_size = ctk.CTkEntry(filter_box, placeholder_text="Ukuran maks (5M)")
+        self.entry_after = ctk.CTkEntry(filter_box, placeholder_text="Diubah setelah (7d)")
+        self.entry_before = ctk.CTkEntry(filter_box, placeholder_text="Diubah sebelum (2024-12-31)")
+        self.entry_glob = ctk.CTkEntry(filter_box, placeholder_text="Pola nama (*.log)")
+        self.entry_regex = ctk.CTkEntry(filter_box, placeholder_text="Regex nama")
+        filter_entries = (self.entry_min_size, self.entry_max_size, self.entry_after, self.entry_before,
+                          self.entry_glob, self.entry_regex)
+        for n, entry in enumerate(filter_entries):
+            entry.grid(row=n // 2, column=n % 2, sticky="ew", padx=(0, 5) if n % 2 == 0 else 0, pady=2)
+        self.filter_category = ctk.StringVar(value=ALL_CATEGORIES)
+        ctk.CTkOptionMenu(filter_box, variable=self.filter_category, values=[ALL_CATEGORIES, *CATEGORY_NAMES],
+                          fg_color="gray").grid(row=3, column=0, columnspan=2, sticky="ew", pady=2)
+
+        self.use_trigram_index = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(control_frame, text="Gunakan indeks isi (trigram)", variable=self.use_trigram_index,
+                        fg_color="red").pack(anchor="w", padx=10, pady=(10, 0))
+
+        self.search_archives = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(control_frame, text="Cari juga di dalam arsip (zip/tar)", variable=self.search_archives,
+                        fg_color="red").pack(anchor="w", padx=10, pady=(10, 0))
+
+        self.rank_results = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(control_frame, text=f"Urutkan menurut relevansi (top {RANK_TOP_K})", variable=self.rank_results,
+                        fg_color="red").pack(anchor="w", padx=10, pady=(10, 0))
+
+        # Kosong = otomatis (SEARCH_WORKERS thread, atau satu proses per core)
+        self.entry_search_workers = ctk.CTkEntry(control_frame, placeholder_text="Worker pencarian isi (otomatis)")
+        self.entry_search_workers.pack(fill="x", padx=10, pady=(10, 0))
+
+        self.use_watcher = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(control_frame, text="Pantau perubahan folder (live)", variable=self.use_watcher,
+                        command=self._sync_watchers, fg_color="red").pack(anchor="w", padx=10, pady=(10, 0))
+
         # Start Button
-        self.btn_search = ctk.CTkButton(control_frame, text="MULAI PENCARIAN", command=self._start_search_thread, 
+        button_row = ctk.CTkFrame(control_frame, fg_color="transparent")
+        button_row.pack(fill="x", padx=10, pady=20)
+        self.btn_search = ctk.CTkButton(button_row, text="MULAI PENCARIAN", command=self._start_search_thread, 
                                         height=40, font=("Arial", 14, "bold"), fg_color="red", hover_color="#CC0000")
-        self.btn_search.pack(fill="x", padx=10, pady=20)
+        self.btn_search.pack(side="left", fill="x", expand=True)
+        self.btn_cancel = ctk.CTkButton(button_row, text="BATAL", command=self._cancel_search, width=70,
+                                        height=40, fg_color="gray", state="disabled")
+        self.btn_cancel.pack(side="left", padx=(5, 0))
         
         # --- PROGRESS BAR SECTION ---
+        self.progress_bar = ctk.CTkProgressBar(control_frame, progress_color="red")
+        self.progress_bar.pack(fill="x", padx=10, pady=(0, 5))
+        self.progress_bar.set(0)
         self.progress_label = ctk.CTkLabel(control_frame, text="Status: Siap", text_color="gray")
         self.progress_label.pack(pady=(0, 5))
 
@@ -392,11 +379,17 @@ class FileManagerApp(ctk.CTk):
         result_frame.grid_columnconfigure(0, weight=1)
         result_frame.grid_rowconfigure(1, weight=1)
 
-        ctk.CTkLabel(result_frame, text="Hasil Pencarian:", font=("Arial", 14, "bold")).grid(row=0, column=0, sticky="w", padx=10, pady=10)
+        result_header = ctk.CTkFrame(result_frame, fg_color="transparent")
+        result_header.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+        ctk.CTkLabel(result_header, text="Hasil Pencarian:", font=("Arial", 14, "bold")).pack(side="left")
+        self.sort_mode = ctk.StringVar(value="Path")
+        ctk.CTkOptionMenu(result_header, values=[*RESULT_SORT_KEYS, RELEVANCE], variable=self.sort_mode, width=100,
+                          command=lambda _: self._sort_results(), fg_color="gray").pack(side="right")
+        ctk.CTkLabel(result_header, text="Urutkan:").pack(side="right", padx=5)
         
-        self.results_textbox = ctk.CTkTextbox(result_frame)
-        self.results_textbox.grid(row=1, column=0, sticky="nsew", padx=10)
-        self.results_textbox.configure(state="disabled")
+        self.results_list = VirtualResultList(result_frame, on_select=self._select_result_number,
+                                              on_activate=lambda _: self._action_on_result("open"))
+        self.results_list.grid(row=1, column=0, sticky="nsew", padx=10)
 
         # Action Buttons
         action_box = ctk.CTkFrame(result_frame, fg_color="transparent")
@@ -408,23 +401,40 @@ class FileManagerApp(ctk.CTk):
         ctk.CTkButton(action_box, text="Buka File", command=lambda: self._action_on_result("open"), width=80, fg_color="#3498DB").pack(side="left", padx=5)
         ctk.CTkButton(action_box, text="Buka Folder", command=lambda: self._action_on_result("folder"), width=80, fg_color="#2ECC71").pack(side="left", padx=5)
         ctk.CTkButton(action_box, text="Preview Teks", command=lambda: self._action_on_result("preview"), width=80, fg_color="#F39C12").pack(side="left", padx=5)
+        ctk.CTkButton(action_box, text="Statistik", command=self._show_stats, width=80, fg_color="gray").pack(side="left", padx=5)
 
         return frame
 
-    def _select_finder_root(self):
+    def _select_finder_root(self, add=False):
+        # add=True: folder ditambahkan ke daftar root yang sudah ada
         folder = ctk.filedialog.askdirectory()
         if folder:
+            current = self.entry_finder_path.get().strip()
+            if add and current:
+                folder = current + os.pathsep + folder
+            else:
+                # Folder dipilih ulang: dipindai ulang saat Cari diklik
+                self.scans.pop(os.path.abspath(folder), None)
             self.entry_finder_path.delete(0, "end")
             self.entry_finder_path.insert(0, folder)
-            self.current_search_root = ""
-            self.scanned_files = []
-            self.scanned_text_files = []
+            self.current_roots = []
+            self._sync_watchers()
             self.progress_label.configure(text="Lokasi berubah. Klik Cari untuk memindai.", text_color="yellow")
             self.progress_bar.set(0)
 
     def _update_scan_progress(self, count):
         self.progress_label.configure(text=f"Scanning... Found {count} files", text_color="yellow")
     
+    def _update_classify_progress(self, current, total):
+        if total > 0:
+            self.progress_bar.set(current / total)
+            self.progress_label.configure(text=f"Checking file types: {current} out of {total} files", text_color="yellow")
+
+    def _update_index_progress(self, current, total):
+        if total > 0:
+            self.progress_bar.set(current / total)
+            self.progress_label.configure(text=f"Indexing content: {current} out of {total} files", text_color="yellow")
+
     def _update_search_progress(self, current, total):
         if total > 0:
             val = current / total
@@ -432,103 +442,292 @@ class FileManagerApp(ctk.CTk):
             self.progress_label.configure(text=f"Checking content: {current} out of {total} files", text_color="yellow")
 
     # --- MAIN SEARCH LOGIC ---
+    def _finder_roots(self):
+        return normalize_roots(parse_roots(self.entry_finder_path.get()))
+
+    def _active_scans(self):
+        return [self.scans[r] for r in self.current_roots if r in self.scans]
+
     def _start_search_thread(self):
-        root_path = self.entry_finder_path.get().strip()
-        if not root_path or not os.path.exists(root_path):
+        roots = self._finder_roots()
+        if not roots or not all(os.path.isdir(r) for r in roots):
             self.progress_label.configure(text="Error: Pilih folder yang valid!", text_color="red")
             return
 
-        name_kw = self.entry_name_kw.get().strip()
-        content_kw_raw = self.entry_content_kw.get("1.0", "end").strip()
-        content_kws = [k.strip() for k in content_kw_raw.split('\n') if k.strip()]
-        mode_and = (self.search_mode.get() == "and")
-
-        if not name_kw and not content_kws:
-            self.progress_label.configure(text="Error: Masukkan kata kunci.", text_color="red")
+        try:
+            query = self._build_query()
+        except ValueError as e:
+            self.progress_label.configure(text=f"Error: {e}", text_color="red")
+            return
+        if query.is_empty():
+            self.progress_label.configure(text="Error: Masukkan kata kunci atau filter.", text_color="red")
+            return
+        workers = self.entry_search_workers.get().strip()
+        if workers and (not workers.isdigit() or int(workers) < 1):
+            self.progress_label.configure(text="Error: Worker pencarian harus angka minimal 1.", text_color="red")
             return
+        search_workers = int(workers) if workers else None
+        # Opsi dibaca di thread UI; variabel Tk tidak aman dibaca dari thread worker
+        use_trigram = self.use_trigram_index.get()
+        archives = self.search_archives.get()
+        rank = bool(query.content) and self.rank_results.get()
 
         # Prepare UI
         self.btn_search.configure(state="disabled")
-        self.results_textbox.configure(state="normal")
-        self.results_textbox.delete("0.0", "end")
-        self.results_textbox.insert("0.0", "Memulai proses...\n")
-        self.results_textbox.configure(state="disabled")
+        self.btn_cancel.configure(state="normal")
+        self.search_results = []
+        self.results_list.set_items(self.search_results, "Memulai proses...")
+        self._seen_results = set()
+        self._pending_results = []
+        self._progress = None
+        self._cancel_event = threading.Event()
+        self._search_running = True
+        self.after(PROGRESS_INTERVAL_MS, self._poll_search)
         
         threading.Thread(target=self._run_search_logic, 
-                         args=(root_path, name_kw, content_kws, mode_and), 
+                         args=(roots, query, self._cancel_event, search_workers, use_trigram, archives, rank), 
                          daemon=True).start()
 
-    def _run_search_logic(self, root_path, name_kw, content_kws, mode_and):
+    def _build_query(self):
+        # ValueError kalau ada filter yang tidak bisa dibaca (ukuran, waktu, regex)
+        def value(entry):
+            return entry.get().strip() or None
+
+        content_kw_raw = self.entry_content_kw.get("1.0", "end").strip()
+        category = self.filter_category.get()
+        return Query(self.entry_name_kw.get(), [k.strip() for k in content_kw_raw.split('\n') if k.strip()],
+                     self.search_mode.get() == "and",
+                     min_size=value(self.entry_min_size), max_size=value(self.entry_max_size),
+                     modified_after=value(self.entry_after), modified_before=value(self.entry_before),
+                     categories=() if category == ALL_CATEGORIES else (category,),
+                     glob=value(self.entry_glob), regex=value(self.entry_regex))
+
+    def _on_name_typed(self, event=None):
+        # Debounce: pencarian nama baru jalan setelah user berhenti mengetik sebentar
+        if self._typing_job is not None:
+            self.after_cancel(self._typing_job)
+        self._typing_job = self.after(150, self._run_live_name_search)
+
+    def _run_live_name_search(self):
+        # Search-as-you-type hanya kalau folder sudah dipindai dan kolom isi kosong
+        self._typing_job = None
+        name_kw = self.entry_name_kw.get().strip()
+        scans = self._active_scans()
+        if self._search_running or not name_kw or not scans or self._finder_roots() != self.current_roots:
+            return
+        if self.entry_content_kw.get("1.0", "end").strip():
+            return
+        try:
+            query = self._build_query()
+        except ValueError:
+            return
         start_time = time.time()
-        
+        self.search_results = sorted({p for scan in scans for p in query.name_matches(scan)})
+        self.result_scores = {}
+        self._update_results_ui(sum(len(scan) for scan in scans), time.time() - start_time)
+
+    def _sync_watchers(self):
+        # Satu watcher untuk tiap root yang sedang dipakai. Watcher yang masih
+        # memantau hasil scan yang sama dibiarkan jalan: memulai watcher berarti
+        # membaca ulang semua folder, dan event di antaranya bisa terlewat
+        wanted = {scan.root: scan for scan in self._active_scans()} if self.use_watcher.get() else {}
+        for root, watcher in list(self.watchers.items()):
+            if wanted.get(root) is not watcher.scan:
+                watcher.stop()
+                del self.watchers[root]
+        on_change = lambda paths: self.after(0, lambda: self._on_files_changed(len(paths)))
+        for root, scan in wanted.items():
+            if root not in self.watchers:
+                self.watchers[root] = DirectoryWatcher(scan, index=self.file_index, on_change=on_change).start()
+
+    def _on_files_changed(self, count):
+        if self._search_running:
+            return
+        self.progress_label.configure(text=f"Index diperbarui: {count} file berubah", text_color="yellow")
+        # Hasil pencarian nama langsung disegarkan; pencarian isi perlu diklik ulang
+        self._run_live_name_search()
+
+    def _cancel_search(self):
+        self._cancel_event.set()
+        self.btn_cancel.configure(state="disabled")
+        self.progress_label.configure(text="Membatalkan...", text_color="yellow")
+
+    def _emit_results(self, paths):
+        # Dipanggil dari thread worker; ditampilkan oleh _poll_search
+        with self._results_lock:
+            for p in paths:
+                if p not in self._seen_results:
+                    self._seen_results.add(p)
+                    self._pending_results.append(p)
+
+    def _poll_search(self):
+        # Satu update UI per interval, berapapun banyaknya callback dari worker
+        if not self._search_running:
+            return
+        progress, self._progress = self._progress, None
+        if progress:
+            stage, args = progress
+            getattr(self, f"_update_{stage}_progress")(*args)
+
+        with self._results_lock:
+            new, self._pending_results = self._pending_results, []
+        if new:
+            self._append_results(new)
+        self.after(PROGRESS_INTERVAL_MS, self._poll_search)
+
+    def _append_results(self, paths):
+        # results_list memegang list yang sama, cukup gambar ulang baris yang terlihat
+        self.search_results.extend(paths)
+        self.results_list.refresh()
+
+    def _select_result_number(self, number):
+        self.entry_result_number.delete(0, "end")
+        self.entry_result_number.insert(0, str(number))
+
+    def _sort_results(self):
+        # Urutkan di tempat supaya nomor [n] tetap sesuai dengan self.search_results
+        if self._search_running:
+            return
+        self.search_results.sort(key=self._sort_key())
+        self.results_list.set_items(self.search_results, self.results_list.message)
+
+    def _sort_key(self):
+        mode = self.sort_mode.get()
+        if mode == RELEVANCE:
+            # Hasil tanpa skor (cocok nama saja) di belakang, urut path
+            scores = self.result_scores
+            return lambda p: (-scores.get(p, 0.0), p.lower())
+        return RESULT_SORT_KEYS[mode]
+
+    def _run_search_logic(self, roots, query, cancel_event, search_workers=None, use_trigram=False,
+                          archives=False, rank=False):
+        start_time = time.time()
+        stats = self.last_stats = Stats()
+        ranked = []  # top-K (skor, path) semua root, hanya kalau rank
+        progress_lock = threading.Lock()
+        stage_progress = {}  # tahap -> {root: (current, total)}
+
         def scan_cb(count):
-            self.after(0, lambda: self._update_scan_progress(count))
-            
-        def search_cb(curr, tot):
-            self.after(0, lambda: self._update_search_progress(curr, tot))
+            self._progress = ("scan", (count,))
 
-        # 1. SCANNING WHEN ROOT IS CHANGED
-        if root_path != self.current_search_root:
+        def progress_cb(stage, root, curr, tot):
+            # Progress tiap root dijumlahkan, jadi satu progress bar untuk semua root
+            with progress_lock:
+                per_root = stage_progress.setdefault(stage, {})
+                per_root[root] = (curr, tot)
+                self._progress = (stage, (sum(c for c, _ in per_root.values()),
+                                          sum(t for _, t in per_root.values())))
+
+        def total_scanned():
+            return sum(len(self.scans[r]) for r in roots if r in self.scans)
+
+        # 1. SCANNING ROOTS THAT ARE NOT SCANNED YET
+        if any(r not in self.scans for r in roots):
             self.after(0, lambda: self.progress_bar.configure(mode="indeterminate"))
             self.after(0, lambda: self.progress_bar.start())
             
             try:
-                self.scanned_files, self.scanned_text_files = scan_directory(root_path, callback=scan_cb)
-                self.current_search_root = root_path
+                scan_roots(roots, callback=scan_cb, index=self.file_index, cancel_event=cancel_event,
+                           stats=stats, cache=self.scans)
+            except SearchCancelled:
+                self.after(0, lambda: self._finish_search(total_scanned(), time.time() - start_time, True))
+                return
             except Exception as e:
-                self.after(0, lambda: self.progress_label.configure(text=f"Error Scan: {e}", text_color="red"))
+                self._search_running = False
+                msg = f"Error Scan: {e}"
+                self.after(0, lambda: self.progress_label.configure(text=msg, text_color="red"))
                 self.after(0, lambda: self.btn_search.configure(state="normal"))
+                self.after(0, lambda: self.btn_cancel.configure(state="disabled"))
                 self.after(0, lambda: self.progress_bar.stop())
                 return
             
             self.after(0, lambda: self.progress_bar.stop())
+        self.current_roots = roots
+        self._trim_scans()
+        self.after(0, self._sync_watchers)
+        scans = {r: self.scans[r] for r in roots}
 
-        # 2. FILTERING
+        # 2. FILTER, NAME AND CONTENT SEARCH ON ALL ROOTS, MERGED INTO ONE RESULT LIST
         self.after(0, lambda: self.progress_bar.configure(mode="determinate"))
         self.after(0, lambda: self.progress_bar.set(0))
-        
-        results_name = []
-        if name_kw:
-            results_name = search_name_contains(name_kw, self.scanned_files)
-            
-        results_content = []
-        if content_kws:
-            target_list = self.scanned_text_files
-            results_content = search_content(content_kws, target_list, mode_and=mode_and, callback=search_cb)
-
-        # 3. MERGE RESULTS
-        if name_kw and content_kws:
-            final = set(results_name) | set(results_content)
-        elif name_kw:
-            final = set(results_name)
-        elif content_kws:
-            final = set(results_content)
-        else:
-            final = set()
-            
-        self.search_results = sorted(list(final))
+        trigram = ((lambda scan, callback, ids: self._get_trigram_index(scan, callback, cancel_event, stats, ids))
+                   if use_trigram else None)
+        cancelled = False
+        try:
+            final_results, ranked = search_query(scans, query, on_match=self._emit_results,
+                                                 top_k=RANK_TOP_K if rank else None, query_cache=self.query_cache,
+                                                 trigram=trigram, archives=archives,
+                                                 search_workers=search_workers, progress=progress_cb,
+                                                 cancel_event=cancel_event, stats=stats)
+        except SearchCancelled:
+            # Hasil yang sudah tampil tetap dipertahankan
+            cancelled = True
+            with self._results_lock:
+                final_results = sorted(self._seen_results)
+
+        scores = {p: score for score, p in ranked}
+        if scores:
+            final_results = sorted(set(final_results) | set(scores), key=lambda p: (-scores.get(p, 0.0), p.lower()))
         duration = time.time() - start_time
         
-        self.after(0, lambda: self._update_results_ui(len(self.scanned_files), duration))
-
-    def _update_results_ui(self, total_scanned, duration):
+        self.after(0, lambda: self._finish_search(total_scanned(), duration, cancelled, final_results, stats,
+                                                  scores if rank else None))
+
+    def _trim_scans(self):
+        # Root yang sedang dipakai tidak pernah dibuang
+        for root in self.current_roots:
+            if root in self.scans:
+                self.scans.move_to_end(root)
+        while len(self.scans) > max(MAX_CACHED_ROOTS, len(self.current_roots)):
+            self.scans.popitem(last=False)
+
+    def _finish_search(self, total_scanned, duration, cancelled=False, results=None, stats=None, scores=None):
+        self._search_running = False
+        self.result_scores = scores or {}
+        if scores is not None:
+            # Hasil berperingkat langsung ditampilkan urut skor
+            self.sort_mode.set(RELEVANCE)
+        if results is None:
+            with self._results_lock:
+                results = sorted(self._seen_results)
+        self.search_results = results
+        self.progress_bar.stop()
+        self.progress_bar.configure(mode="determinate")
+        self._update_results_ui(total_scanned, duration, cancelled, stats)
+
+    def _get_trigram_index(self, scan, callback=None, cancel_event=None, stats=None, ids=None):
+        # Index trigram dibuat saat pertama dipakai, lalu diperbarui secara inkremental
+        # (satu index untuk semua root, tiap root memperbarui bagiannya sendiri;
+        # dengan filter Query hanya kandidatnya yang disinkronkan)
+        try:
+            with self._trigram_lock:
+                if self.trigram_index is None:
+                    self.trigram_index = TrigramIndex()
+            self.trigram_index.update(scan, callback=callback, cancel_event=cancel_event, stats=stats, ids=ids)
+            return self.trigram_index
+        except (OSError, sqlite3.Error) as e:
+            print("Index trigram tidak tersedia:", e)
+            return None
+
+    def _update_results_ui(self, total_scanned, duration, cancelled=False, stats=None):
         self.btn_search.configure(state="normal")
+        self.btn_cancel.configure(state="disabled")
         self.progress_bar.set(1)
         
         count = len(self.search_results)
-        msg = f"Selesai: {count} hasil dari {total_scanned} file ({duration:.2f}s)"
-        self.progress_label.configure(text=msg, text_color="green")
-        
-        self.results_textbox.configure(state="normal")
-        self.results_textbox.delete("0.0", "end")
-        
-        if count == 0:
-            self.results_textbox.insert("0.0", "Tidak ditemukan hasil.")
+        if cancelled:
+            msg = f"Dibatalkan: {count} hasil sejauh ini ({duration:.2f}s)"
+            self.progress_label.configure(text=msg, text_color="yellow")
         else:
-            for idx, p in enumerate(self.search_results, 1):
-                self.results_textbox.insert("end", f"[{idx}] {p}\n")
+            msg = f"Selesai: {count} hasil dari {total_scanned} file ({duration:.2f}s)"
+            if stats is not None and stats.phases:
+                # Rincian per tahap; detail lengkap lewat tombol Statistik
+                msg += "\n" + " · ".join(f"{name} {p['wall']:.2f}s" for name, p in stats.phases.items())
+            self.progress_label.configure(text=msg, text_color="green")
         
-        self.results_textbox.configure(state="disabled")
+        if self.sort_mode.get() != "Path":
+            self.search_results.sort(key=self._sort_key())
+        self.results_list.set_items(self.search_results, "Tidak ditemukan hasil.")
 
     def _action_on_result(self, action):
         try:
@@ -537,6 +736,10 @@ class FileManagerApp(ctk.CTk):
             i = int(sel_str)
             if not (1 <= i <= len(self.search_results)): raise IndexError
             path = self.search_results[i - 1]
+            # Member arsip ("a.zip!/b.txt"): buka/tunjukkan arsipnya, preview tetap membaca member
+            archive, member = split_member_path(path)
+            if member is not None and action != "preview":
+                path = archive
             
             if action == "open":
                 open_path(path)
@@ -556,13 +759,35 @@ class FileManagerApp(ctk.CTk):
         kws = [k.strip() for k in content_kw_raw.split('\n') if k.strip()]
         if name_kw and not kws: kws = [name_kw]
         
-        snippets = get_previews(path, kws, max_snippets=5)
-        
         top = ctk.CTkToplevel(self)
         top.title(f"Preview: {os.path.basename(path)}")
         top.geometry("600x400")
         txt = ctk.CTkTextbox(top)
         txt.pack(fill="both", expand=True, padx=10, pady=10)
+        txt.insert("0.0", "Memuat preview...")
+        txt.configure(state="disabled")
+
+        # File besar dibaca di thread lain supaya jendela utama tidak macet
+        def worker():
+            snippets = get_previews(path, kws, max_snippets=5)
+            self.after(0, lambda: self._fill_preview(txt, snippets))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _show_stats(self):
+        top = ctk.CTkToplevel(self)
+        top.title("Statistik Pencarian Terakhir")
+        top.geometry("600x400")
+        txt = ctk.CTkTextbox(top, font=("Courier", 12))
+        txt.pack(fill="both", expand=True, padx=10, pady=10)
+        txt.insert("0.0", self.last_stats.report() if self.last_stats else "Belum ada pencarian.")
+        txt.configure(state="disabled")
+
+    def _fill_preview(self, txt, snippets):
+        if not txt.winfo_exists():
+            return
+        txt.configure(state="normal")
+        txt.delete("0.0", "end")
         
         if not snippets:
             txt.insert("0.0", "Tidak ada preview (keyword tidak ditemukan di teks).")
@@ -593,11 +818,25 @@ class FileManagerApp(ctk.CTk):
         ctk.CTkCheckBox(frame, text="Kelompokkan (Fungsi)", variable=self.check_kelompok, fg_color="red").grid(row=3, column=0, sticky="w", padx=30, pady=5)
         ctk.CTkCheckBox(frame, text="Sub-folder (Ekstensi)", variable=self.check_ext, fg_color="red").grid(row=4, column=0, sticky="w", padx=30, pady=5)
         
-        self.btn_organize = ctk.CTkButton(frame, text="Mulai Rapikan", command=self._action_organize, fg_color="red", height=40)
-        self.btn_organize.grid(row=5, column=0, pady=20)
+        self.check_dry_run = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame, text="Dry run (laporan saja, tanpa memindahkan)", variable=self.check_dry_run, fg_color="red").grid(row=5, column=0, sticky="w", padx=30, pady=5)
+        
+        button_row = ctk.CTkFrame(frame, fg_color="transparent")
+        button_row.grid(row=6, column=0, pady=20)
+        self.btn_organize = ctk.CTkButton(button_row, text="Mulai Rapikan", command=self._action_organize, fg_color="red", height=40)
+        self.btn_organize.pack(side="left", padx=5)
+        self.btn_resume = ctk.CTkButton(button_row, text="Lanjutkan", command=lambda: self._action_organize("resume"), fg_color="gray", height=40)
+        self.btn_resume.pack(side="left", padx=5)
+        self.btn_undo = ctk.CTkButton(button_row, text="Undo", command=lambda: self._action_organize("undo"), fg_color="gray", height=40)
+        self.btn_undo.pack(side="left", padx=5)
         
         self.status_organizer = ctk.CTkLabel(frame, text="")
-        self.status_organizer.grid(row=6, column=0)
+        self.status_organizer.grid(row=7, column=0)
+
+        frame.grid_rowconfigure(8, weight=1)
+        self.organizer_report = ctk.CTkTextbox(frame)
+        self.organizer_report.grid(row=8, column=0, sticky="nsew", padx=20, pady=(10, 20))
+        self.organizer_report.configure(state="disabled")
         
         return frame
 
@@ -607,22 +846,163 @@ class FileManagerApp(ctk.CTk):
             self.entry_organizer_path.delete(0, "end")
             self.entry_organizer_path.insert(0, f)
 
-    def _action_organize(self):
+    def _set_organizer_buttons(self, state):
+        for btn in (self.btn_organize, self.btn_resume, self.btn_undo):
+            btn.configure(state=state)
+
+    def _action_organize(self, action="organize"):
         folder = self.entry_organizer_path.get()
         if not folder: return
-        self.btn_organize.configure(state="disabled")
+        self._set_organizer_buttons("disabled")
         self.status_organizer.configure(text="Memproses...", text_color="yellow")
         
-        threading.Thread(target=self._run_organize, args=(folder,), daemon=True).start()
+        target = self._run_organize if action == "organize" else self._run_journal_action
+        args = (folder,) if action == "organize" else (folder, action)
+        threading.Thread(target=target, args=args, daemon=True).start()
+
+    def _run_journal_action(self, folder, action):
+        def progress_cb(done, total):
+            self.after(0, lambda: self.status_organizer.configure(text=f"Memproses {done} dari {total} file...", text_color="yellow"))
+
+        try:
+            if action == "resume":
+                moves = resume_organize(folder, callback=progress_cb)
+                msg = f"Selesai! {len(moves)} file sisa dipindahkan" if moves else "Tidak ada proses yang perlu dilanjutkan"
+            else:
+                moves = undo_organize(folder, callback=progress_cb)
+                msg = f"Undo selesai: {len(moves)} file dikembalikan" if moves else "Tidak ada yang bisa di-undo"
+            self.after(0, lambda: self.status_organizer.configure(text=msg, text_color="green"))
+        except Exception as e:
+            msg = f"Error: {e}"
+            self.after(0, lambda: self.status_organizer.configure(text=msg, text_color="red"))
+        self.after(0, lambda: self._set_organizer_buttons("normal"))
 
     def _run_organize(self, folder):
+        isKelompok = "y" if self.check_kelompok.get() else "n"
+        isExt = "y" if self.check_ext.get() else "n"
+
+        def progress_cb(done, total):
+            self.after(0, lambda: self.status_organizer.configure(text=f"Memindahkan {done} dari {total} file...", text_color="yellow"))
+
+        try:
+            if self.check_dry_run.get():
+                moves, _ = plan_organize(folder, isKelompok, isExt)
+                report = format_organize_report(moves)
+                self.after(0, lambda: self._show_organizer_report(report))
+                self.after(0, lambda: self.status_organizer.configure(text=f"Dry run: {len(moves)} file", text_color="green"))
+            else:
+                moves = organize(folder, isKelompok, isExt, callback=progress_cb)
+                self.after(0, lambda: self.status_organizer.configure(text=f"Selesai! {len(moves)} file dipindahkan", text_color="green"))
+        except Exception as e:
+            msg = f"Error: {e}"
+            self.after(0, lambda: self.status_organizer.configure(text=msg, text_color="red"))
+        self.after(0, lambda: self._set_organizer_buttons("normal"))
+
+    def _show_organizer_report(self, report):
+        self.organizer_report.configure(state="normal")
+        self.organizer_report.delete("0.0", "end")
+        self.organizer_report.insert("0.0", report)
+        self.organizer_report.configure(state="disabled")
+
+    # --- DUPLICATE FINDER ---
+    def _create_duplicate_finder_frame(self, parent):
+        frame = ctk.CTkFrame(parent, fg_color="transparent")
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_rowconfigure(5, weight=1)
+
+        ctk.CTkButton(frame, text="< Menu Utama", command=lambda: self.show_frame("MainMenu"), width=100, fg_color="gray").grid(row=0, column=0, sticky="w", padx=20, pady=10)
+        ctk.CTkLabel(frame, text="Pencarian File Duplikat", font=("Arial", 20, "bold")).grid(row=1, column=0, pady=10)
+
+        input_frame = ctk.CTkFrame(frame)
+        input_frame.grid(row=2, column=0, padx=20, sticky="ew")
+        self.entry_dup_path = ctk.CTkEntry(input_frame, placeholder_text="Folder root...")
+        self.entry_dup_path.pack(side="left", fill="x", expand=True, padx=10, pady=10)
+        ctk.CTkButton(input_frame, text="📂", width=40, command=self._select_dup_folder).pack(side="left", padx=10)
+
+        button_row = ctk.CTkFrame(frame, fg_color="transparent")
+        button_row.grid(row=3, column=0, pady=10)
+        self.btn_dup = ctk.CTkButton(button_row, text="Cari Duplikat", command=self._action_find_duplicates, fg_color="red", height=40)
+        self.btn_dup.pack(side="left", padx=5)
+        self.btn_dup_cancel = ctk.CTkButton(button_row, text="BATAL", command=lambda: self._dup_cancel_event.set(),
+                                            fg_color="gray", height=40, width=70, state="disabled")
+        self.btn_dup_cancel.pack(side="left", padx=5)
+
+        self.status_dup = ctk.CTkLabel(frame, text="")
+        self.status_dup.grid(row=4, column=0)
+
+        self.dup_textbox = ctk.CTkTextbox(frame)
+        self.dup_textbox.grid(row=5, column=0, sticky="nsew", padx=20, pady=(10, 20))
+        self.dup_textbox.configure(state="disabled")
+        return frame
+
+    def _select_dup_folder(self):
+        f = ctk.filedialog.askdirectory()
+        if f:
+            self.entry_dup_path.delete(0, "end")
+            self.entry_dup_path.insert(0, f)
+
+    def _action_find_duplicates(self):
+        folder = self.entry_dup_path.get().strip()
+        if not folder or not os.path.isdir(folder):
+            self.status_dup.configure(text="Error: Pilih folder yang valid!", text_color="red")
+            return
+        self._dup_cancel_event = threading.Event()
+        self.btn_dup.configure(state="disabled")
+        self.btn_dup_cancel.configure(state="normal")
+        self.status_dup.configure(text="Memindai...", text_color="yellow")
+        threading.Thread(target=self._run_find_duplicates, args=(folder, self._dup_cancel_event), daemon=True).start()
+
+    def _run_find_duplicates(self, folder, cancel_event):
+        start_time = time.time()
+        progress = {"text": None}
+        labels = {"partial": "Hash sebagian", "full": "Hash penuh"}
+
+        def hash_cb(kind, done, total):
+            progress["text"] = f"{labels[kind]}: {done} dari {total} file"
+
+        def poll():
+            # Progress digabung per interval, sama seperti File Finder
+            text, progress["text"] = progress["text"], None
+            if text:
+                self.status_dup.configure(text=text, text_color="yellow")
+            if self.btn_dup.cget("state") == "disabled":
+                self.after(PROGRESS_INTERVAL_MS, poll)
+
+        self.after(PROGRESS_INTERVAL_MS, poll)
         try:
-            organize(folder, "y" if self.check_kelompok.get() else "n", "y" if self.check_ext.get() else "n")
-            self.after(0, lambda: self.status_organizer.configure(text="Selesai!", text_color="green"))
+            # Pakai hasil scan File Finder kalau root ini sudah pernah dipindai
+            scan = self.scans.get(os.path.abspath(folder))
+            if scan is None:
+                scan = scan_directory(folder, index=self.file_index, cancel_event=cancel_event)
+            groups = find_duplicates(scan, callback=hash_cb, cancel_event=cancel_event)
+            wasted = sum(size * (len(paths) - 1) for size, paths in groups)
+            lines = []
+            for n, (size, paths) in enumerate(groups, 1):
+                lines.append(f"#{n} - {len(paths)} file x {size:,} byte")
+                lines.extend(f"    {p}" for p in paths)
+                lines.append("")
+            report = "\n".join(lines) if lines else "Tidak ada file duplikat."
+            msg = f"Selesai: {len(groups)} kelompok, {wasted / (1024 * 1024):.1f} MB terbuang ({time.time() - start_time:.2f}s)"
+            color = "green"
+        except SearchCancelled:
+            report, msg, color = "", "Dibatalkan.", "yellow"
         except Exception as e:
-            self.after(0, lambda: self.status_organizer.configure(text=f"Error: {e}", text_color="red"))
-        self.after(0, lambda: self.btn_organize.configure(state="normal"))
+            report, msg, color = "", f"Error: {e}", "red"
+        self.after(0, lambda: self._show_duplicates(report, msg, color))
+
+    def _show_duplicates(self, report, msg, color):
+        self.btn_dup.configure(state="normal")
+        self.btn_dup_cancel.configure(state="disabled")
+        self.status_dup.configure(text=msg, text_color=color)
+        self.dup_textbox.configure(state="normal")
+        self.dup_textbox.delete("0.0", "end")
+        self.dup_textbox.insert("0.0", report)
+        self.dup_textbox.configure(state="disabled")
 
 if __name__ == "__main__":
+    # Worker proses pencarian (spawn) menjalankan ulang modul __main__ lewat
+    # __file__-nya; fungsi worker ada di filemanager.search, jadi file GUI ini
+    # (dan customtkinter) tidak perlu ikut diimpor di tiap worker
+    del __file__
     app = FileManagerApp()
     app.mainloop()
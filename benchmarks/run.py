@@ -0,0 +1,284 @@
+# Benchmark jalur utama filemanager pada pohon sintetis (lihat treegen.py).
+#
+#   python -m benchmarks.run --files 20000 --save-baseline base.json
+#   python -m benchmarks.run --files 20000 --compare base.json
+#
+# Tiap tahap dijalankan --repeat kali untuk waktu (median), lalu sekali lagi di
+# bawah tracemalloc untuk puncak memori, supaya overhead tracing tidak ikut
+# terhitung di angka waktu. Memori worker proses (backend "processes") tidak
+# terukur oleh tracemalloc. Page cache OS tidak dikosongkan: angka I/O adalah
+# angka "warm". --compare keluar dengan kode 1 kalau ada tahap yang melambat
+# lebih dari --threshold dibanding baseline.
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import filemanager
+
+from .treegen import DEFAULTS, NEEDLE, WORDS, generate_flat, generate_tree, remove_tree
+
+LOWER_IS_BETTER = ("seconds", "p50_ms", "p90_ms", "p99_ms", "peak_kib")
+
+
+def percentile(values, q):
+    # Nearest-rank, cukup untuk ratusan sampai ribuan sampel
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+
+class Stage:
+    # run(ctx) -> (jumlah item, jumlah byte, latensi per item atau None);
+    # setup/teardown dijalankan di luar pengukuran
+    def __init__(self, name, run, setup=None, teardown=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+
+    def _once(self, ctx):
+        if self.setup:
+            self.setup(ctx)
+        try:
+            start = time.perf_counter()
+            items, nbytes, latencies = self.run(ctx)
+            return time.perf_counter() - start, items, nbytes, latencies
+        finally:
+            if self.teardown:
+                self.teardown(ctx)
+
+    def measure(self, ctx, repeat):
+        runs = [self._once(ctx) for _ in range(repeat)]
+        seconds = statistics.median(r[0] for r in runs)
+        _, items, nbytes, latencies = runs[-1]
+
+        tracemalloc.start()
+        try:
+            self._once(ctx)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        result = {"seconds": round(seconds, 4), "min_seconds": round(min(r[0] for r in runs), 4),
+                  "items": items, "items_per_s": round(items / seconds, 1) if seconds else None,
+                  "peak_kib": round(peak / 1024, 1)}
+        if nbytes:
+            result["mb_per_s"] = round(nbytes / (1024 * 1024) / seconds, 2) if seconds else None
+        if latencies:
+            for q in (50, 90, 99):
+                result[f"p{q}_ms"] = round(percentile(latencies, q) * 1000, 3)
+        return result
+
+
+def _timed(fn, args_list):
+    latencies = []
+    out = []
+    for args in args_list:
+        start = time.perf_counter()
+        out.append(fn(*args))
+        latencies.append(time.perf_counter() - start)
+    return out, latencies
+
+
+def build_stages(ctx, backends):
+    root = ctx["root"]
+
+    def scan(ctx):
+        result = filemanager.scan_directory(root)
+        ctx["scan"] = result
+        return len(result), 0, None
+
+    def fresh_index(ctx):
+        ctx["index_dir"] = tempfile.mkdtemp(prefix="fm-bench-index-")
+        ctx["index"] = filemanager.FileIndex(os.path.join(ctx["index_dir"], "index.sqlite3"))
+
+    def drop_index(ctx):
+        shutil.rmtree(ctx.pop("index_dir"), ignore_errors=True)
+
+    def scan_index(ctx):
+        return len(filemanager.scan_directory(root, index=ctx["index"])), 0, None
+
+    def warm_index(ctx):
+        fresh_index(ctx)
+        filemanager.scan_directory(root, index=ctx["index"])
+
+    def classify(ctx):
+        scan = ctx["scan"]
+        ids = list(scan.ids())
+        verdicts, latencies = _timed(filemanager.is_text_candidate,
+                                     [(scan.path(i), scan.sizes[i]) for i in ids])
+        ctx["text_files"] = [scan.path(i) for i, v in zip(ids, verdicts) if v]
+        ctx["text_bytes"] = sum(scan.sizes[i] for i, v in zip(ids, verdicts) if v)
+        return len(ids), 0, latencies
+
+    queries = WORDS[:8] + ["_0001", ".py", "zzz-no-match"]
+
+    def name_search(ctx):
+        scan = ctx["scan"]
+        scan._name_index = None  # index nama ikut diukur, dibangun saat query pertama
+        _, latencies = _timed(filemanager.search_name_contains, [(q, scan) for q in queries])
+        return len(queries), 0, latencies
+
+    def content_search(backend):
+        def run(ctx):
+            found = filemanager.search_content([NEEDLE], ctx["text_files"], backend=backend)
+            ctx["matches"] = found
+            return len(ctx["text_files"]), ctx["text_bytes"], None
+        return run
+
+    def ranked_search(ctx):
+        # Top-K dengan berhenti dini; file yang dilewati tetap dihitung sebagai item
+        filemanager.search_ranked([NEEDLE], ctx["text_files"], backend="threads")
+        return len(ctx["text_files"]), ctx["text_bytes"], None
+
+    def previews(ctx):
+        paths = ctx["matches"][:200]
+        _, latencies = _timed(filemanager.get_previews, [(p, [NEEDLE]) for p in paths])
+        return len(paths), 0, latencies
+
+    flat = os.path.join(os.path.dirname(root), os.path.basename(root) + "-organize")
+    flat_files = min(2000, ctx["params"]["files"])
+
+    def make_flat(ctx):
+        generate_flat(flat, flat_files, ctx["params"]["seed"])
+
+    def drop_flat(ctx):
+        remove_tree(flat)
+
+    def organize(ctx):
+        # [OK] per file dicetak ke stderr oleh organizer; dibuang supaya tidak ikut terukur
+        with open(os.devnull, "w") as devnull:
+            saved, sys.stderr = sys.stderr, devnull
+            try:
+                moves = filemanager.organize(flat, "y", "y")
+            finally:
+                sys.stderr = saved
+        return len(moves), 0, None
+
+    def organize_setup(ctx):
+        make_flat(ctx)
+
+    def undo(ctx):
+        return len(filemanager.undo_organize(flat)), 0, None
+
+    def undo_setup(ctx):
+        make_flat(ctx)
+        organize(ctx)
+
+    stages = [
+        Stage("scan", scan),
+        Stage("scan_index_cold", scan_index, setup=fresh_index, teardown=drop_index),
+        Stage("scan_index_warm", scan_index, setup=warm_index, teardown=drop_index),
+        Stage("classify", classify),
+        Stage("name_search", name_search),
+    ]
+    stages += [Stage(f"content_search_{b}", content_search(b)) for b in backends]
+    stages += [
+        Stage("content_ranked", ranked_search),
+        Stage("previews", previews),
+        Stage("organize", organize, setup=organize_setup, teardown=drop_flat),
+        Stage("organize_undo", undo, setup=undo_setup, teardown=drop_flat),
+    ]
+    return stages
+
+
+def compare(results, baseline, threshold):
+    # Mengembalikan daftar (tahap, metrik, lama, baru, rasio) yang memburuk
+    regressions = []
+    for name, metrics in results["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if not old:
+            continue
+        for key in LOWER_IS_BETTER:
+            if metrics.get(key) and old.get(key):
+                ratio = metrics[key] / old[key]
+                if ratio > 1 + threshold:
+                    regressions.append((name, key, old[key], metrics[key], ratio))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    cols = ("seconds", "items_per_s", "mb_per_s", "p50_ms", "p90_ms", "p99_ms", "peak_kib")
+    print(f"{'stage':<26}" + "".join(f"{c:>15}" for c in cols))
+    for name, metrics in results["stages"].items():
+        row = f"{name:<26}"
+        for c in cols:
+            value = metrics.get(c)
+            cell = "-" if value is None else f"{value:g}"
+            old = (baseline or {}).get("stages", {}).get(name, {}).get(c)
+            if value is not None and old:
+                cell += f" {(value / old - 1) * 100:+.0f}%"
+            row += f"{cell:>15}"
+        print(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark filemanager.")
+    parser.add_argument("--root", help="lokasi pohon sintetis (default: di folder temp, per parameter)")
+    for key, default in DEFAULTS.items():
+        parser.add_argument("--" + key.replace("_", "-"), type=type(default), default=default)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", help="daftar tahap dipisah koma (default: semua)")
+    parser.add_argument("--backends", default="threads,processes", help="backend search_content yang diukur")
+    parser.add_argument("--save-baseline", metavar="FILE")
+    parser.add_argument("--compare", metavar="FILE")
+    parser.add_argument("--threshold", type=float, default=0.2, help="batas perlambatan relatif (default: 0.2)")
+    parser.add_argument("--json", metavar="FILE", help="tulis hasil lengkap ke FILE")
+    args = parser.parse_args(argv)
+
+    params = {key: getattr(args, key) for key in DEFAULTS}
+    tag = "-".join(str(params[k]) for k in ("files", "depth", "fanout", "seed"))
+    root = os.path.abspath(args.root or os.path.join(tempfile.gettempdir(), f"filemanager-bench-{tag}"))
+
+    start = time.perf_counter()
+    manifest = generate_tree(root, **params)
+    print(f"pohon: {root} ({manifest['text'] + manifest['binary']} file, {manifest['dirs']} folder, "
+          f"{manifest['bytes'] / (1024 * 1024):.1f} MB, siap dalam {time.perf_counter() - start:.1f}s)",
+          file=sys.stderr)
+
+    ctx = {"root": root, "params": params}
+    stages = build_stages(ctx, args.backends.split(","))
+    wanted = set(args.stages.split(",")) if args.stages else None
+    results = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpu_count": os.cpu_count(), "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                 "repeat": args.repeat, "tree": manifest},
+        "stages": {},
+    }
+    for stage in stages:
+        # Tahap yang tidak diminta tetap dijalankan sekali kalau hasilnya dibutuhkan tahap berikutnya
+        if wanted is not None and stage.name not in wanted:
+            if stage.name in ("scan", "classify") or stage.name.startswith("content_search"):
+                stage._once(ctx)
+            continue
+        print(f"  {stage.name}...", file=sys.stderr)
+        results["stages"][stage.name] = stage.measure(ctx, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, key, old, new, ratio in regressions:
+            print(f"REGRESI {name}.{key}: {old:g} -> {new:g} ({(ratio - 1) * 100:+.0f}%)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
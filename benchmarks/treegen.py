@@ -0,0 +1,149 @@
+# Generator pohon folder sintetis untuk benchmark. Deterministik per seed, jadi
+# hasil run yang berbeda (dan baseline) mengukur pohon yang sama persis.
+import json
+import math
+import os
+import random
+import shutil
+
+# Kata untuk isi file teks dan nama file; NEEDLE hanya muncul di sebagian file
+# teks supaya pencarian isi punya hasil dengan jumlah yang bisa diatur
+WORDS = ("laporan keuangan proyek jadwal rapat catatan data tugas kantor sekolah "
+         "invoice budget report draft notes backup config server client module").split()
+NEEDLE = "zebrafish"
+TEXT_EXTS = (".txt", ".md", ".py", ".csv", ".log", ".json")
+KNOWN_BINARY_EXTS = (".jpg", ".png", ".zip", ".mp3")  # ditolak sniffing tanpa I/O
+OTHER_BINARY_EXTS = (".bin", ".dat")  # harus dibuka untuk tahu isinya biner
+
+DEFAULTS = {
+    "files": 10000,
+    "depth": 3,
+    "fanout": 6,
+    "text_ratio": 0.6,       # sisanya biner, separuh dengan ekstensi yang dikenal
+    "needle_ratio": 0.05,    # bagian file teks yang memuat NEEDLE
+    "size_dist": "lognormal",
+    "median_size": 4096,
+    "max_size": 4 * 1024 * 1024,
+    "seed": 0,
+}
+
+
+def _sizes(rng, params):
+    dist, median, limit = params["size_dist"], params["median_size"], params["max_size"]
+    for _ in range(params["files"]):
+        if dist == "fixed":
+            size = median
+        elif dist == "uniform":
+            size = rng.randint(0, 2 * median)
+        elif dist == "lognormal":
+            # Banyak file kecil, sedikit file besar, mirip folder kerja sungguhan
+            size = int(rng.lognormvariate(math.log(max(median, 1)), 1.0))
+        else:
+            raise ValueError(f"size_dist tidak dikenal: {dist}")
+        yield min(size, limit)
+
+
+def _directories(root, depth, fanout):
+    dirs = [root]
+    level = [root]
+    for d in range(depth):
+        level = [os.path.join(parent, f"dir{d}_{i}") for parent in level for i in range(fanout)]
+        dirs.extend(level)
+    return dirs
+
+
+def _text(rng, block, size, needle):
+    start = rng.randrange(len(block) - size) if size < len(block) else 0
+    data = (block * (size // len(block) + 1))[start:start + size]
+    if needle and size >= len(NEEDLE):
+        pos = rng.randrange(size - len(NEEDLE) + 1)
+        data = data[:pos] + NEEDLE.encode() + data[pos + len(NEEDLE):]
+    return data
+
+
+def _manifest_path(root):
+    # Manifest disimpan di sebelah root, bukan di dalamnya, supaya tidak ikut terpindai
+    return root.rstrip(os.sep) + ".json"
+
+
+def _read_manifest(root):
+    # Manifest buatan generator ini untuk root tersebut, atau None
+    try:
+        with open(_manifest_path(root), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("root") != root:
+        return None
+    return manifest
+
+
+def remove_tree(root):
+    # Hanya folder yang dibuat generator ini (punya manifest) yang boleh dihapus;
+    # folder kosong dibiarkan, folder lain yang berisi ditolak
+    if not os.path.lexists(root):
+        return
+    if _read_manifest(root) is None:
+        if os.path.isdir(root) and not os.listdir(root):
+            return
+        raise FileExistsError(f"{root} sudah ada dan bukan buatan generator benchmark; "
+                              "hapus sendiri atau pilih lokasi lain")
+    shutil.rmtree(root)
+    os.remove(_manifest_path(root))
+
+
+def generate_tree(root, **overrides):
+    # Mengembalikan ringkasan pohon; pohon yang sudah ada dengan parameter yang
+    # sama dipakai ulang
+    params = dict(DEFAULTS, **overrides)
+    unknown = set(params) - set(DEFAULTS)
+    if unknown:
+        raise TypeError(f"parameter tidak dikenal: {sorted(unknown)}")
+    manifest = _read_manifest(root)
+    if manifest is not None and os.path.isdir(root) and manifest.get("params") == params:
+        return manifest
+    remove_tree(root)
+
+    rng = random.Random(params["seed"])
+    block = " ".join(rng.choice(WORDS) for _ in range(16 * 1024)).encode() + b"\n"
+    dirs = _directories(root, params["depth"], params["fanout"])
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    counts = {"text": 0, "binary": 0, "needle": 0}
+    total_bytes = 0
+    for i, size in enumerate(_sizes(rng, params)):
+        stem = f"{rng.choice(WORDS)}_{i:06d}"
+        if rng.random() < params["text_ratio"]:
+            needle = rng.random() < params["needle_ratio"]
+            data = _text(rng, block, size, needle)
+            ext = rng.choice(TEXT_EXTS)
+            counts["text"] += 1
+            counts["needle"] += needle and size >= len(NEEDLE)
+        else:
+            # Byte acak dengan NUL di awal supaya sniffing pasti memutuskan biner
+            data = b"\x00" + rng.randbytes(max(size - 1, 0)) if size else b""
+            ext = rng.choice(KNOWN_BINARY_EXTS if rng.random() < 0.5 else OTHER_BINARY_EXTS)
+            counts["binary"] += 1
+        with open(os.path.join(rng.choice(dirs), stem + ext), "wb") as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    manifest = {"params": params, "root": root, "dirs": len(dirs), "bytes": total_bytes, **counts}
+    with open(_manifest_path(root), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def generate_flat(folder, files, seed=0):
+    # Folder datar berisi file kecil campuran kategori, untuk benchmark organize;
+    # folder lama dibuat ulang (lihat remove_tree)
+    rng = random.Random(seed)
+    exts = TEXT_EXTS + KNOWN_BINARY_EXTS + (".pdf", ".docx", ".mp4", ".exe")
+    remove_tree(folder)
+    os.makedirs(folder, exist_ok=True)
+    with open(_manifest_path(folder), "w", encoding="utf-8") as f:
+        json.dump({"root": folder, "flat": files, "seed": seed}, f, indent=2)
+    for i in range(files):
+        with open(os.path.join(folder, f"file_{i:06d}{rng.choice(exts)}"), "wb") as f:
+            f.write(b"x" * rng.randint(0, 512))
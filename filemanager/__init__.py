@@ -0,0 +1,66 @@
+# Backend File Manager tanpa GUI: scan, pencarian nama/isi, organize, duplikat.
+# Submodul baru diimpor saat namanya dipakai, jadi `import filemanager` (dan CLI)
+# tidak ikut memuat sqlite3, multiprocessing, ctypes, dst. kalau tidak perlu.
+import importlib
+
+_EXPORTS = {
+    "SearchCancelled": "common",
+    "is_text_candidate": "common",
+    "text_verdict": "common",
+    "invalidate_file_caches": "common",
+    "FILE_CATEGORIES": "common",
+    "KNOWN_BINARY_EXTS": "common",
+    "get_category": "common",
+    "get_ext": "common",
+    "is_archive": "common",
+    "FileIndex": "index",
+    "PathView": "scan",
+    "ScanResult": "scan",
+    "NameIndex": "scan",
+    "scan_directory": "scan",
+    "search_name_contains": "scan",
+    "parse_roots": "multiroot",
+    "normalize_roots": "multiroot",
+    "scan_roots": "multiroot",
+    "search_roots": "multiroot",
+    "search_query": "multiroot",
+    "DirectoryWatcher": "watch",
+    "KeywordMatcher": "search",
+    "ConcurrencyTuner": "search",
+    "search_content": "search",
+    "search_ranked": "search",
+    "SearchPool": "search",
+    "get_previews": "search",
+    "TrigramIndex": "trigram",
+    "split_member_path": "archive",
+    "QueryCache": "querycache",
+    "Query": "query",
+    "CATEGORY_NAMES": "query",
+    "parse_size": "query",
+    "parse_time": "query",
+    "OrganizeMove": "organizer",
+    "MoveJournal": "organizer",
+    "plan_organize": "organizer",
+    "format_organize_report": "organizer",
+    "execute_organize": "organizer",
+    "organize": "organizer",
+    "resume_organize": "organizer",
+    "undo_organize": "organizer",
+    "find_duplicates": "duplicates",
+    "Stats": "stats",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
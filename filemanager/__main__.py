@@ -0,0 +1,8 @@
+import sys
+import time
+
+_STARTED = time.perf_counter()
+
+from .cli import main  # noqa: E402
+
+sys.exit(main(started=_STARTED))
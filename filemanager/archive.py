@@ -0,0 +1,84 @@
+# Membaca member zip/tar(.gz/.bz2/.xz) langsung sebagai stream teks, tanpa
+# mengekstrak ke disk. Member ditunjuk dengan path "arsip.zip!/dalam/file.txt".
+import codecs
+import contextlib
+import tarfile
+import zipfile
+
+from .common import ARCHIVE_MEMBER_MAX_SIZE, ARCHIVE_SEP, KNOWN_BINARY_EXTS, get_ext, is_archive
+
+
+def member_path(archive, name):
+    return archive + ARCHIVE_SEP + name.lstrip("/")
+
+
+def split_member_path(path):
+    # "a.zip!/x/y.txt" -> ("a.zip", "x/y.txt"); path biasa -> (path, None)
+    start = 0
+    while True:
+        pos = path.find(ARCHIVE_SEP, start)
+        if pos < 0:
+            return path, None
+        if is_archive(path[:pos]):
+            return path[:pos], path[pos + len(ARCHIVE_SEP):]
+        start = pos + 1
+
+
+def _wanted(name, size, max_size):
+    # Member dilewati berdasarkan ukuran dan ekstensi sebelum dibaca sama sekali;
+    # arsip di dalam arsip ikut terlewati karena termasuk KNOWN_BINARY_EXTS
+    return 0 <= size <= max_size and get_ext(name) not in KNOWN_BINARY_EXTS
+
+
+def _decode(raw):
+    # Bukan TextIOWrapper: stream member tar ("r|*") tidak mendukung seekable()
+    return codecs.getreader("utf-8")(raw, errors="ignore")
+
+
+def _text_stream(raw):
+    # Sama dengan is_text_candidate: ada NUL di awal berarti biner
+    if b"\x00" in raw.peek(2048)[:2048]:
+        return None
+    return _decode(raw)
+
+
+def iter_text_members(path, max_size=ARCHIVE_MEMBER_MAX_SIZE):
+    # Yield (nama member, stream teks) berurutan; stream hanya valid sampai
+    # member berikutnya diminta
+    if get_ext(path) == ".zip":
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                # Member terenkripsi tidak bisa dibaca tanpa password
+                if info.is_dir() or info.flag_bits & 0x1 or not _wanted(info.filename, info.file_size, max_size):
+                    continue
+                with zf.open(info) as raw:
+                    text = _text_stream(raw)
+                    if text is not None:
+                        yield info.filename, text
+    else:
+        # "r|*": dibaca sekali dari depan sebagai stream, tar.gz tidak perlu seek
+        with tarfile.open(path, "r|*") as tf:
+            for info in tf:
+                if not info.isfile() or not _wanted(info.name, info.size, max_size):
+                    continue
+                text = _text_stream(tf.extractfile(info))
+                if text is not None:
+                    yield info.name, text
+
+
+@contextlib.contextmanager
+def open_text(path):
+    # File biasa atau satu member arsip, sebagai stream teks
+    archive, name = split_member_path(path)
+    if name is None:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            yield f
+    elif get_ext(archive) == ".zip":
+        with zipfile.ZipFile(archive) as zf, zf.open(name) as raw:
+            yield _decode(raw)
+    else:
+        with tarfile.open(archive, "r:*") as tf:
+            raw = tf.extractfile(name)
+            if raw is None:
+                raise OSError(f"bukan file biasa: {path}")
+            yield _decode(raw)
@@ -0,0 +1,356 @@
+# Command line: python -m filemanager {scan,search,organize} ...
+# Modul backend baru diimpor di dalam perintah yang membutuhkannya, jadi `--help`
+# atau `organize` tidak ikut memuat sqlite3/multiprocessing. Pakai --timing (atau
+# `python -X importtime -m filemanager ...`) untuk melihat biaya startup.
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from .common import ORGANIZE_WORKERS, ROOTS_PER_DEVICE, SCAN_WORKERS, SEARCH_WORKERS, TRIGRAM_INDEX_PATH
+
+
+class _Output:
+    # text: satu baris per hasil; ndjson: satu objek JSON per baris, langsung
+    # di-flush supaya bisa diproses sambil jalan; json: satu dokumen di akhir
+    def __init__(self, fmt, stream=None, stats=None):
+        self.fmt = fmt
+        self.stream = stream or sys.stdout
+        self.stats = stats
+
+    def item(self, record, text):
+        if self.fmt == "json":
+            return
+        if self.fmt == "ndjson":
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+        else:
+            self.stream.write(text + "\n")
+
+    def summary(self, record, text):
+        # Ringkasan text ke stderr supaya stdout tetap berisi path saja
+        if self.fmt == "text":
+            print(text, file=sys.stderr)
+        else:
+            self.item(record, text)
+
+    def document(self, doc):
+        if self.fmt == "json":
+            if self.stats is not None:
+                doc["stats"] = self.stats.to_dict()
+            json.dump(doc, self.stream, ensure_ascii=False, indent=2)
+            self.stream.write("\n")
+
+
+class _Timer:
+    def __init__(self, started, enabled):
+        self.enabled = enabled
+        self.last = started
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round(now - self.last, 4)
+        self.last = now
+        if self.enabled:
+            print(f"[timing] {phase}: {self.phases[phase] * 1000:.1f} ms", file=sys.stderr)
+        return self.phases[phase]
+
+
+def _open_index(args):
+    if args.no_index:
+        return None
+    import sqlite3
+    from .index import FileIndex
+    try:
+        return FileIndex(args.index) if args.index else FileIndex()
+    except (OSError, sqlite3.Error) as e:
+        print("Index tidak tersedia, scan tanpa index:", e, file=sys.stderr)
+        return None
+
+
+def _trigram_path(args):
+    # Index trigram ikut lokasi --index: x/index.sqlite3 -> x/index.trigrams.sqlite3
+    if not args.index:
+        return TRIGRAM_INDEX_PATH
+    return os.path.splitext(args.index)[0] + ".trigrams.sqlite3"
+
+
+def _read_queries(path, defaults=None):
+    # Satu query per baris: teks biasa = kata kunci nama, atau objek JSON
+    # {"id": ..., "name": "...", "content": ["..."], "mode": "and"|"or"} plus
+    # filter opsional dengan nama yang sama seperti opsinya: min_size, max_size,
+    # after, before, category, glob, regex
+    queries = []
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    q = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{lineno}: JSON tidak valid ({e})")
+            else:
+                q = {"name": line}
+            try:
+                queries.append(_make_query(q.pop("id", len(queries)), dict(defaults or {}, **q)))
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return queries
+
+
+_FILTER_KEYS = ("min_size", "max_size", "after", "before", "category", "glob", "regex")
+
+
+def _make_query(query_id, fields):
+    # Query divalidasi (regex dikompilasi, ukuran/waktu diurai) sebelum scan dimulai
+    from .query import Query
+    query = Query.from_dict(fields)
+    filters = {k: fields[k] for k in _FILTER_KEYS if fields.get(k) not in (None, "", [])}
+    return {"id": query_id, "name": query.name, "content": query.content,
+            "mode": "and" if query.mode_and else "or", "filters": filters, "query": query}
+
+
+def cmd_scan(args, out, timer):
+    from .multiroot import scan_roots
+    index = _open_index(args)
+    scans = scan_roots(args.roots, index=index, workers=args.workers, per_device=args.per_device, stats=out.stats)
+    seconds = timer.mark("scan")
+    paths = []
+    if args.list:
+        for scan in scans.values():
+            for path in scan:
+                out.item({"type": "file", "path": path}, path)
+                paths.append(path)
+    files = sum(len(scan) for scan in scans.values())
+    summary = {"type": "summary", "roots": {root: len(scan) for root, scan in scans.items()},
+               "files": files, "seconds": seconds}
+    out.summary(summary, f"{files} file di {', '.join(scans)} ({seconds:.2f}s)")
+    if args.list:
+        summary["paths"] = paths
+    out.document(summary)
+    return 0
+
+
+def cmd_search(args, out, timer):
+    if args.top is not None and args.top < 1:
+        raise ValueError("--top harus minimal 1")
+    if args.search_workers is not None and args.search_workers < 1:
+        raise ValueError("--search-workers harus minimal 1")
+    if args.top and args.archives:
+        # Skor per member arsip belum ada; arsip dibaca sebagai satu task utuh
+        raise ValueError("--top belum bisa digabung dengan --archives")
+    if args.trigram and args.no_index:
+        # Index trigram juga index persisten; --no-index berarti tidak ada yang ditulis ke disk
+        raise ValueError("--trigram tidak bisa digabung dengan --no-index")
+    queries = []
+    # Filter dari opsi berlaku untuk query --name/--content dan jadi default
+    # untuk tiap baris --queries
+    filters = {k: getattr(args, k) for k in _FILTER_KEYS if getattr(args, k)}
+    if args.name or args.content or (filters and not args.queries):
+        queries.append(_make_query(0, dict(filters, name=args.name or "", content=args.content or [],
+                                           mode="or" if args.mode_or else "and")))
+    if args.queries:
+        queries.extend(_read_queries(args.queries, filters))
+    if not queries:
+        raise ValueError("tidak ada query: pakai --name/--content, filter, atau --queries FILE")
+
+    from .multiroot import run_per_device, scan_roots, search_query
+    stats = out.stats
+    index = _open_index(args)
+    scans = scan_roots(args.roots, index=index, workers=args.workers, per_device=args.per_device, stats=stats)
+    files = sum(len(scan) for scan in scans.values())
+    scan_seconds = timer.mark("scan")
+
+    # Satu scan per root (dan satu klasifikasi teks/index trigram) untuk semua
+    # query; query isi yang berulang atau mempersempit query AND sebelumnya memakai cache
+    trigram_index = None
+    query_cache = None
+    if any(q["content"] for q in queries):
+        from .querycache import QueryCache
+        # Scan dibuat di perintah ini juga dan hanya hidup selama perintah berjalan
+        query_cache = QueryCache(live_only=False)
+        if args.trigram:
+            from .trigram import TrigramIndex
+            trigram_index = TrigramIndex(_trigram_path(args))
+            run_per_device(list(scans), lambda root: trigram_index.update(scans[root], workers=args.workers,
+                                                                          stats=stats), args.per_device)
+            timer.mark("trigram")
+
+    batch = len(queries) > 1
+    done = []
+    for q in queries:
+        started = time.perf_counter()
+        lock = threading.Lock()
+
+        def emit(paths):
+            # Dipanggil dari thread per root; search_roots sudah membuang duplikat
+            with lock:
+                for p in paths:
+                    out.item({"type": "match", "query": q["id"], "path": p}, f"{q['id']}\t{p}" if batch else p)
+
+        # ranked: top-K (skor, path) semua root, hanya dengan --top
+        found, ranked = search_query(scans, q["query"], on_match=emit, top_k=args.top, query_cache=query_cache,
+                                     trigram=(lambda scan, callback, ids: trigram_index) if trigram_index else None,
+                                     archives=args.archives, backend=args.backend, workers=args.workers,
+                                     search_workers=args.search_workers, per_device=args.per_device, stats=stats)
+        scores = {}
+        if ranked:
+            # Hasil isi berperingkat ditulis setelah hasil nama, dari skor tertinggi
+            seen = set(found)
+            for score, p in ranked:
+                scores[p] = round(score, 4)
+                if p in seen:
+                    continue
+                found.append(p)
+                out.item({"type": "match", "query": q["id"], "path": p, "score": scores[p]},
+                         f"{q['id']}\t{p}" if batch else p)
+        seconds = round(time.perf_counter() - started, 4)
+        if batch:
+            out.summary({"type": "query", "query": q["id"], "count": len(found), "seconds": seconds},
+                        f"# query {q['id']}: {len(found)} hasil ({seconds:.2f}s)")
+        done.append(dict({k: v for k, v in q.items() if k != "query"}, count=len(found), seconds=seconds,
+                         results=found, **({"scores": scores} if args.top else {})))
+    search_seconds = timer.mark("search")
+
+    roots = list(scans)
+    total = sum(q["count"] for q in done)
+    out.summary({"type": "summary", "roots": roots, "files": files, "queries": len(done),
+                 "matches": total, "scan_seconds": scan_seconds, "search_seconds": search_seconds},
+                f"{total} hasil untuk {len(done)} query dari {files} file di {len(roots)} root "
+                f"(scan {scan_seconds:.2f}s, cari {search_seconds:.2f}s)")
+    out.document({"roots": roots, "files": files, "scan_seconds": scan_seconds, "queries": done})
+    return 0
+
+
+def cmd_organize(args, out, timer):
+    from .organizer import organize, resume_organize, undo_organize
+    if not os.path.isdir(args.folder):
+        raise ValueError(f"bukan folder: {args.folder}")
+
+    if args.undo:
+        action, moves = "undo", undo_organize(args.folder, workers=args.workers)
+    elif args.resume:
+        action, moves = "resume", resume_organize(args.folder, workers=args.workers)
+    else:
+        action = "dry-run" if args.dry_run else "organize"
+        moves = organize(args.folder, "y" if args.kategori else "n", "y" if args.ext else "n",
+                         dry_run=args.dry_run, workers=args.workers, stats=out.stats)
+    seconds = timer.mark(action)
+
+    records = [m._asdict() for m in moves]
+    for m, record in zip(moves, records):
+        src, dst = (m.dst, m.src) if action == "undo" else (m.src, m.dst)
+        out.item(dict(record, type="move"), f"{src} -> {dst}")
+    out.summary({"type": "summary", "action": action, "files": len(moves), "seconds": seconds},
+                f"{action}: {len(moves)} file ({seconds:.2f}s)")
+    out.document({"action": action, "folder": os.path.abspath(args.folder), "seconds": seconds, "moves": records})
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m filemanager",
+                                     description="File Manager tanpa GUI: scan, cari dan rapikan file.")
+    parser.add_argument("--format", choices=("text", "json", "ndjson"), default="text",
+                        help="format output (default: text)")
+    parser.add_argument("--timing", action="store_true", help="tampilkan waktu startup dan tiap tahap ke stderr")
+    parser.add_argument("--stats", action="store_true",
+                        help="catat statistik per phase (waktu, byte dibaca, utilisasi worker, file terlambat)")
+    parser.add_argument("--profile", metavar="FILE", help="jalankan cProfile per phase dan simpan ke FILE (.prof)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_index_args(p):
+        p.add_argument("--index", metavar="PATH", help="lokasi index SQLite (default: ~/.file_manager)")
+        p.add_argument("--no-index", action="store_true", help="scan penuh tanpa index persisten")
+        p.add_argument("--workers", type=int, default=SCAN_WORKERS, help=f"jumlah thread scan (default: {SCAN_WORKERS})")
+        p.add_argument("--per-device", type=int, default=ROOTS_PER_DEVICE, metavar="N",
+                       help=f"root yang diproses bersamaan per device (default: {ROOTS_PER_DEVICE})")
+
+    p = sub.add_parser("scan", help="pindai folder dan perbarui index")
+    p.add_argument("roots", nargs="+", metavar="root", help="satu atau lebih folder, dipindai bersamaan")
+    p.add_argument("--list", action="store_true", help="tampilkan semua path file")
+    add_index_args(p)
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser("search", help="cari berdasarkan nama dan/atau isi file")
+    p.add_argument("roots", nargs="+", metavar="root", help="satu atau lebih folder; hasil digabung tanpa duplikat")
+    p.add_argument("-n", "--name", help="kata kunci nama file/folder")
+    p.add_argument("-c", "--content", action="append", metavar="KEYWORD", help="kata kunci isi (boleh berulang)")
+    p.add_argument("--or", dest="mode_or", action="store_true", help="mode OR untuk kata kunci isi (default: AND)")
+    p.add_argument("-q", "--queries", metavar="FILE",
+                   help="file berisi satu query per baris ('-' untuk stdin); satu scan untuk semua query")
+    p.add_argument("--trigram", action="store_true",
+                   help="persempit kandidat dengan index trigram (disimpan di samping --index)")
+    p.add_argument("--archives", action="store_true",
+                   help="cari juga isi member zip/tar (hasil: arsip.zip!/path/di/dalam)")
+    p.add_argument("--top", type=int, metavar="K",
+                   help="hasil isi diurutkan menurut relevansi (jumlah kemunculan, nama, kebaruan), "
+                        "hanya K terbaik; berhenti begitu sisa file tidak bisa masuk K terbaik")
+    filters = p.add_argument_group("filter", "dijalankan pada data scan sebelum ada file yang dibuka")
+    filters.add_argument("--min-size", metavar="SIZE", help="ukuran minimal, mis. 10K")
+    filters.add_argument("--max-size", metavar="SIZE", help="ukuran maksimal, mis. 5M")
+    filters.add_argument("--after", metavar="WHEN", help="diubah setelah: umur (30m, 12h, 7d, 2w) atau tanggal ISO")
+    filters.add_argument("--before", metavar="WHEN", help="diubah sebelum: umur atau tanggal ISO")
+    filters.add_argument("--category", action="append", metavar="NAME",
+                         help="kategori file dari FILE_CATEGORIES, mis. Dokumen (boleh berulang)")
+    filters.add_argument("--glob", metavar="PATTERN",
+                         help="pola nama file, mis. '*.log'; dengan '/' dicocokkan ke path lengkap")
+    filters.add_argument("--regex", metavar="PATTERN", help="regex nama file (tidak peka huruf besar/kecil)")
+    p.add_argument("--backend", choices=("auto", "threads", "processes"), default="auto")
+    p.add_argument("--search-workers", type=int, metavar="N",
+                   help=f"worker pencarian isi (default: {SEARCH_WORKERS} thread, atau satu proses per core)")
+    add_index_args(p)
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("organize", help="rapikan file per kategori/ekstensi")
+    p.add_argument("folder")
+    p.add_argument("--kategori", action="store_true", help="kelompokkan per kategori")
+    p.add_argument("--ext", action="store_true", help="kelompokkan per ekstensi")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--dry-run", action="store_true", help="hanya tampilkan rencana pemindahan")
+    mode.add_argument("--resume", action="store_true", help="lanjutkan proses yang terputus")
+    mode.add_argument("--undo", action="store_true", help="kembalikan hasil rapikan terakhir")
+    p.add_argument("--workers", type=int, default=ORGANIZE_WORKERS,
+                   help=f"jumlah thread pemindahan (default: {ORGANIZE_WORKERS})")
+    p.set_defaults(func=cmd_organize)
+    return parser
+
+
+def main(argv=None, started=None):
+    started = time.perf_counter() if started is None else started
+    args = build_parser().parse_args(argv)
+    timer = _Timer(started, args.timing)
+    timer.mark("startup")
+    stats = None
+    if args.stats or args.profile:
+        from .stats import Stats
+        stats = Stats(profile=bool(args.profile))
+    out = _Output(args.format, stats=stats)
+    try:
+        code = args.func(args, out, timer)
+        if stats is not None:
+            if args.format == "text":
+                print(stats.report(), file=sys.stderr)
+            elif args.format == "ndjson":
+                out.item(dict(stats.to_dict(), type="stats"), "")
+            if args.profile:
+                stats.dump_profile(args.profile)
+        return code
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Output dipotong (mis. `| head`): bukan error, stdout dialihkan supaya
+        # flush saat interpreter keluar tidak memicu error lagi
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
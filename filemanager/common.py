@@ -0,0 +1,199 @@
+# Konfigurasi, cache per file dan helper dasar yang dipakai semua modul.
+import collections
+import os
+import threading
+
+# --- GLOBAL CONFIG & DATA ---
+MAX_FILE_SIZE = 50 * 1024 * 1024 
+ARCHIVE_MEMBER_MAX_SIZE = MAX_FILE_SIZE  # member arsip yang lebih besar tidak dicari isinya
+ARCHIVE_SEP = "!/"  # path member arsip: "backup.zip!/folder/catatan.txt"
+ORGANIZE_WORKERS = 8
+ORGANIZE_JOURNAL = ".organize_journal.jsonl"
+JOURNAL_BATCH = 500  # record selesai ditulis per batch, bukan per file
+PARTIAL_HASH_SIZE = 64 * 1024  # dibaca dari awal dan akhir file
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_CACHE_SIZE = 50_000  # hash file yang diingat di memori kalau tidak ada FileIndex (LRU)
+SCAN_WORKERS = 16
+ROOTS_PER_DEVICE = 1  # root yang dipindai/dicari bersamaan per device (disk/share)
+INDEX_COMMIT_INTERVAL = 0.5  # detik; tulisan index di-commit paling lambat selang ini
+SEARCH_BUFFER_SIZE = 1024 * 1024  # karakter per potongan baca, per worker
+SEARCH_WORKERS = 20
+SEARCH_BATCH_SIZE = 64  # path per task, supaya overhead IPC proses tidak dominan
+SEARCH_CANCEL_POLL = 0.1  # detik; selang cek pembatalan selagi menunggu batch
+QUERY_CACHE_SIZE = 32  # jumlah hasil pencarian isi yang diingat (LRU)
+QUERY_CACHE_MAX_PATHS = 500_000  # batas total path di semua entri cache
+RANK_TOP_K = 100  # hasil terbaik yang disimpan pada pencarian berperingkat
+RANK_HIT_CAP = 20  # kemunculan per kata kunci yang masih menambah skor
+RANK_NAME_BONUS = 1.0  # kata kunci isi yang juga ada di nama file
+RANK_RECENCY_WEIGHT = 0.5  # file yang baru diubah sedikit lebih diutamakan
+RANK_RECENCY_HALF_LIFE = 30 * 86400  # detik; bonus kebaruan turun separuh tiap selang ini
+WATCH_POLL_INTERVAL = 2.0  # detik, untuk watcher polling (tanpa inotify)
+WATCH_FULL_POLL_EVERY = 15  # tiap N putaran polling semua file di-stat ulang
+WATCH_DEBOUNCE = 0.2  # event yang berdekatan diterapkan sebagai satu batch
+INDEX_PATH = os.path.join(os.path.expanduser("~"), ".file_manager", "index.sqlite3")
+TRIGRAM_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".file_manager", "trigrams.sqlite3")
+
+_HASH_CACHE = collections.OrderedDict()  # path -> (size, mtime, partial, full)
+_lock = threading.Lock()
+
+# --- FUNGSI DASAR ---
+class SearchCancelled(Exception):
+    pass
+
+def _check_cancel(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise SearchCancelled()
+
+def is_text_candidate(path, size=None):
+    # Format biner yang sudah dikenal langsung ditolak tanpa membuka file
+    if get_ext(path) in KNOWN_BINARY_EXTS:
+        return False
+    # size boleh diisi dari hasil stat walker supaya tidak stat dua kali
+    try:
+        if size is None:
+            size = os.path.getsize(path)
+    except Exception:
+        return False
+    if size < 0 or size > MAX_FILE_SIZE:
+        return False
+
+    try:
+        with open(path, "rb") as file:
+            chunk = file.read(2048)
+            if not chunk:
+                return True
+            if b"\x00" in chunk:
+                return False
+            try:
+                chunk.decode("utf-8")
+                return True
+            except Exception:
+                try:
+                    chunk.decode("latin-1")
+                    return True
+                except Exception:
+                    return False
+    except Exception:
+        return False
+
+def cached_hashes(path):
+    with _lock:
+        entry = _HASH_CACHE.get(path)
+        if entry is not None:
+            _HASH_CACHE.move_to_end(path)
+        return entry
+
+def remember_hashes(path, entry):
+    with _lock:
+        _HASH_CACHE[path] = entry
+        _HASH_CACHE.move_to_end(path)
+        while len(_HASH_CACHE) > HASH_CACHE_SIZE:
+            _HASH_CACHE.popitem(last=False)
+
+def invalidate_file_caches(paths):
+    # Dipanggil watcher untuk file yang berubah/hilang
+    with _lock:
+        for path in paths:
+            _HASH_CACHE.pop(path, None)
+
+def text_verdict(path, size, mtime_ns, stats=None):
+    # Tidak diingat di sini: hasilnya disimpan per file di bitmap ScanResult dan
+    # kolom is_text FileIndex (per size/mtime), jadi tidak ada dict per path
+    verdict = is_text_candidate(path, size)
+    if stats is not None:
+        if get_ext(path) in KNOWN_BINARY_EXTS or not 0 <= size <= MAX_FILE_SIZE:
+            stats.count("classify.skipped")
+        else:
+            stats.count("classify.files_opened")
+            stats.count("classify.bytes_read", min(size, 2048))
+    return verdict
+
+FILE_CATEGORIES = {
+    "Gambar": [
+        ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif",
+        ".svg", ".webp", ".ico", ".heic", ".heif", ".raw",
+        ".arw", ".cr2", ".nef", ".orf", ".rw2", ".psd", ".ai", ".eps"
+    ],
+
+    "Dokumen": [
+        ".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt",
+        ".xls", ".xlsx", ".csv", ".tsv", ".ppt", ".pptx",
+        ".epub", ".md"
+    ],
+
+    "Video": [
+        ".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv",
+        ".webm", ".mpeg", ".mpg", ".3gp", ".m4v"
+    ],
+
+    "Suara": [
+        ".mp3", ".wav", ".flac", ".aac", ".ogg", ".oga",
+        ".wma", ".m4a", ".amr", ".aiff"
+    ],
+
+    "Arsip": [
+        ".zip", ".rar", ".7z", ".tar", ".gz", ".bz2",
+        ".xz", ".iso", ".lz", ".zst"
+    ],
+
+    "Kode": [
+        ".py", ".js", ".ts", ".html", ".css", ".php",
+        ".java", ".cpp", ".c", ".h", ".hpp", ".cs",
+        ".rb", ".go", ".rs", ".kt", ".swift", ".m",
+        ".lua", ".sql", ".xml", ".json", ".yaml", ".yml"
+    ],
+
+    "3DModel": [
+        ".obj", ".fbx", ".stl", ".dae", ".blend",
+        ".gltf", ".glb"
+    ],
+
+    "Aplikasi-Executable-Installer": [
+        ".exe", ".msi", ".bat", ".cmd", ".sh", ".apk",
+        ".app", ".deb", ".rpm"
+    ],
+
+    "Database": [
+        ".db", ".sqlite", ".sqlite3", ".mdb",
+        ".accdb", ".sql", ".dbf"
+    ],
+
+    "GIS-MapData": [
+        ".shp", ".kml", ".kmz", ".geojson", ".gpx"
+    ],
+
+    "Font": [
+        ".ttf", ".otf", ".woff", ".woff2"
+    ],
+
+    "EBook": [
+        ".epub", ".mobi", ".azw3", ".fb2"
+    ]
+}
+
+# Format yang pasti biner: tidak pernah dibuka untuk sniffing teks
+KNOWN_BINARY_EXTS = {
+    ext
+    for category in ("Video", "Suara", "Arsip", "Gambar")
+    for ext in FILE_CATEGORIES[category]
+} - {".svg", ".eps"}
+
+# Lookup ekstensi -> kategori dalam O(1). Kategori pertama yang memuat ekstensi
+# menang, sama seperti urutan pencarian lama (misal .sql tetap "Kode").
+EXT_TO_CATEGORY = {}
+for _category, _extensions in FILE_CATEGORIES.items():
+    for _ext in _extensions:
+        EXT_TO_CATEGORY.setdefault(_ext, _category)
+
+def get_category(file):
+    return EXT_TO_CATEGORY.get(get_ext(file), "Lainnya")
+
+def get_ext(file):
+    ext = os.path.splitext(file)[1].lower()
+    return ext
+
+# Arsip yang isinya bisa dicari tanpa ekstraksi (lihat filemanager.archive)
+ARCHIVE_EXTS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+def is_archive(file):
+    return file.lower().endswith(ARCHIVE_EXTS)
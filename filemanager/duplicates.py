@@ -0,0 +1,152 @@
+import collections
+import concurrent.futures
+import contextlib
+import hashlib
+import os
+
+from .common import (HASH_CHUNK_SIZE, PARTIAL_HASH_SIZE, SCAN_WORKERS, _check_cancel, cached_hashes,
+                     remember_hashes)
+from .index import FileIndex
+from .stats import phase
+
+# --- DUPLICATE FINDER ---
+# Bertahap: kelompokkan per ukuran, lalu hash sebagian (awal + akhir file),
+# dan hash penuh hanya untuk yang masih bentrok. Hash disimpan per
+# (path, size, mtime) di index (atau, tanpa index, LRU terbatas di memori) supaya
+# run berikutnya hampir gratis.
+# Size/mtime selalu diambil dari stat baru, bukan dari hasil scan: file yang diubah
+# di tempat setelah scan tidak boleh dilaporkan duplikat berdasarkan hash lamanya.
+def _stat_stage(scan, ids, workers, cancel_event, stats=None):
+    # id -> (size, mtime_ns) terkini; file yang sudah hilang dibuang
+    def work(i):
+        try:
+            st = os.stat(scan.path(i))
+            return st.st_size, st.st_mtime_ns
+        except OSError:
+            return None
+
+    meta = {}
+    with phase(stats, "dup_stat"), concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(ids), 1024):
+            _check_cancel(cancel_event)
+            block = ids[start:start + 1024]
+            for i, value in zip(block, executor.map(work, block)):
+                if value is not None:
+                    meta[i] = value
+    if stats is not None:
+        stats.count("duplicates.stale", sum(1 for i, m in meta.items() if m != (scan.sizes[i], scan.mtimes[i])))
+    return meta
+
+def _partial_hash(path, size):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(PARTIAL_HASH_SIZE))
+        if size > 2 * PARTIAL_HASH_SIZE:
+            f.seek(size - PARTIAL_HASH_SIZE)
+        h.update(f.read(PARTIAL_HASH_SIZE))
+    return h.hexdigest()
+
+def _full_hash(path):
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+def _hash_stage(scan, meta, ids, kind, workers, callback, cancel_event, stats=None):
+    # Hitung hash `kind` ("partial"/"full") untuk ids, pakai cache kalau size/mtime
+    # (dari meta, hasil _stat_stage) sama
+    results = {}
+    todo = []
+    known = {}  # id -> entri hash tersimpan yang masih cocok size/mtime-nya
+    conn_ctx = scan.index.connect() if scan.index is not None else contextlib.nullcontext()
+    with conn_ctx as conn, phase(stats, "hash_" + kind):
+        for i in ids:
+            path = scan.path(i)
+            cached = FileIndex.hashes(conn, path) if conn is not None else cached_hashes(path)
+            if cached and tuple(cached[:2]) == meta[i]:
+                known[i] = tuple(cached)
+                value = cached[2] if kind == "partial" else cached[3]
+                if value:
+                    results[i] = value
+                    continue
+            todo.append(i)
+
+        def work(i):
+            path = scan.path(i)
+            try:
+                return _partial_hash(path, meta[i][0]) if kind == "partial" else _full_hash(path)
+            except OSError:
+                return None
+
+        done = len(ids) - len(todo)
+        if stats is not None:
+            stats.count(f"hash_{kind}.cached", done)
+            stats.count(f"hash_{kind}.files_opened", len(todo))
+            sizes = (meta[i][0] for i in todo)
+            if kind == "partial":
+                sizes = (min(size, 2 * PARTIAL_HASH_SIZE) for size in sizes)
+            stats.count(f"hash_{kind}.bytes_read", sum(sizes))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for start in range(0, len(todo), 256):
+                _check_cancel(cancel_event)
+                block = todo[start:start + 256]
+                rows = []
+                for i, value in zip(block, executor.map(work, block)):
+                    if value is None:
+                        continue
+                    results[i] = value
+                    old = known.get(i) or meta[i] + (None, None)
+                    entry = (old[0], old[1], value, old[3]) if kind == "partial" else old[:3] + (value,)
+                    rows.append((scan.path(i),) + entry)
+                if conn is not None and rows:
+                    FileIndex.store_hashes(conn, rows)
+                    conn.commit()
+                elif conn is None:
+                    for row in rows:
+                        remember_hashes(row[0], row[1:])
+                done += len(block)
+                if callback: callback(kind, done, len(ids))
+    return results
+
+def _collisions(groups):
+    return [ids for ids in groups.values() if len(ids) > 1]
+
+def find_duplicates(scan, callback=None, workers=SCAN_WORKERS, min_size=1, cancel_event=None, stats=None):
+    # 1. Ukuran sama, dari stat ulang semua file (hasil scan bisa sudah basi)
+    meta = _stat_stage(scan, list(scan.ids()), workers, cancel_event, stats)
+    by_size = collections.defaultdict(list)
+    for i, (size, _) in meta.items():
+        if size >= min_size:
+            by_size[size].append(i)
+    candidates = [i for ids in _collisions(by_size) for i in ids]
+
+    # 2. Hash sebagian (awal + akhir)
+    partial = _hash_stage(scan, meta, candidates, "partial", workers, callback, cancel_event, stats)
+    by_partial = collections.defaultdict(list)
+    for i, value in partial.items():
+        by_partial[(meta[i][0], value)].append(i)
+
+    # 3. Hash penuh hanya untuk file yang tidak seluruhnya tercakup hash sebagian
+    groups = []
+    need_full = []
+    for ids in _collisions(by_partial):
+        if meta[ids[0]][0] <= 2 * PARTIAL_HASH_SIZE:
+            groups.append(ids)
+        else:
+            need_full.extend(ids)
+    full = _hash_stage(scan, meta, need_full, "full", workers, callback, cancel_event, stats)
+    by_full = collections.defaultdict(list)
+    for i, value in full.items():
+        by_full[(meta[i][0], value)].append(i)
+    groups.extend(_collisions(by_full))
+
+    # (ukuran, [path...]); kelompok dengan ruang terbuang terbesar di atas
+    result = [(meta[ids[0]][0], sorted(scan.path(i) for i in ids)) for ids in groups]
+    result.sort(key=lambda group: (-group[0] * (len(group[1]) - 1), group[1][0]))
+    if stats is not None:
+        stats.count("duplicates.groups", len(result))
+    return result
@@ -0,0 +1,108 @@
+import contextlib
+import os
+import sqlite3
+
+from .common import INDEX_PATH
+
+# --- PERSISTENT FILE INDEX ---
+# Menyimpan path, size, mtime dan status teks/biner di SQLite supaya rescan
+# berikutnya hanya membaca folder yang mtime-nya berubah.
+class FileIndex:
+    def __init__(self, db_path=INDEX_PATH):
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    mtime INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+                CREATE TABLE IF NOT EXISTS files (
+                    dir TEXT,
+                    name TEXT,
+                    size INTEGER,
+                    mtime INTEGER,
+                    is_text INTEGER,
+                    PRIMARY KEY (dir, name)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS hashes (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER,
+                    mtime INTEGER,
+                    partial TEXT,
+                    full TEXT
+                );
+            """)
+
+    @contextlib.contextmanager
+    def connect(self):
+        # Satu koneksi per pemanggil, jadi aman dipakai dari thread mana saja
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def dir_mtime(conn, path):
+        row = conn.execute("SELECT mtime FROM dirs WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def subdirs(conn, path):
+        return [r[0] for r in conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))]
+
+    @staticmethod
+    def files(conn, path):
+        rows = conn.execute("SELECT name, size, mtime, is_text FROM files WHERE dir = ?", (path,))
+        return {name: (size, mtime, None if is_text is None else bool(is_text))
+                for name, size, mtime, is_text in rows}
+
+    @staticmethod
+    def store_dir(conn, path, parent, mtime, entries, subdirs, old_files, old_subdirs):
+        for gone in set(old_subdirs) - set(subdirs):
+            FileIndex.drop_tree(conn, gone)
+        gone_files = set(old_files) - set(entries)
+        if gone_files:
+            conn.executemany("DELETE FROM files WHERE dir = ? AND name = ?",
+                             [(path, name) for name in gone_files])
+        changed = [(path, name, size, mtime_ns, is_text)
+                   for name, (size, mtime_ns, is_text) in entries.items()
+                   if old_files.get(name) != (size, mtime_ns, is_text)]
+        if changed:
+            conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", changed)
+        conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (path, parent, mtime))
+
+    @staticmethod
+    def store_verdicts(conn, rows):
+        # rows: (path, size, mtime, is_text); hanya ditulis kalau file belum berubah
+        conn.executemany(
+            "UPDATE files SET is_text = ? WHERE dir = ? AND name = ? AND size = ? AND mtime = ?",
+            [(is_text,) + os.path.split(path) + (size, mtime) for path, size, mtime, is_text in rows])
+
+    @staticmethod
+    def hashes(conn, path):
+        return conn.execute("SELECT size, mtime, partial, full FROM hashes WHERE path = ?", (path,)).fetchone()
+
+    @staticmethod
+    def store_hashes(conn, rows):
+        # rows: (path, size, mtime, partial, full)
+        conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)", rows)
+
+    @staticmethod
+    def drop_hashes(conn, paths):
+        conn.executemany("DELETE FROM hashes WHERE path = ?", ((p,) for p in paths))
+
+    @staticmethod
+    def drop_tree(conn, path):
+        # Hapus folder beserta seluruh isinya (range query pada prefix path)
+        lo, hi = path + os.sep, path + chr(ord(os.sep) + 1)
+        conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, lo, hi))
+        conn.execute("DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)", (path, lo, hi))
@@ -0,0 +1,178 @@
+# Beberapa root sekaligus (home, share proyek, share arsip, ...). Root dipindai
+# dan dicari paralel antar device, tapi dibatasi per device: satu disk atau share
+# tidak jadi lebih cepat kalau dibebani banyak scan serentak, sedangkan scan tiap
+# root sendiri sudah paralel. Hasil scan disimpan per root, jadi mengganti
+# kumpulan root tidak membuang hasil root yang lain.
+import concurrent.futures
+import contextlib
+import functools
+import heapq
+import os
+import threading
+
+from .common import ROOTS_PER_DEVICE, SCAN_WORKERS, SearchCancelled, _check_cancel
+from .scan import scan_directory
+
+
+def parse_roots(text):
+    # Daftar root dipisah os.pathsep (";" di Windows, ":" di Linux/macOS) atau baris baru
+    return [r.strip() for line in text.splitlines() for r in line.split(os.pathsep) if r.strip()]
+
+
+def normalize_roots(roots):
+    # Path absolut, tanpa duplikat; root yang ada di dalam root lain dibuang
+    # karena isinya sudah ikut terpindai (dibandingkan lewat realpath)
+    real = {}
+    for root in roots:
+        root = os.path.abspath(root)
+        real.setdefault(os.path.realpath(root), root)
+    kept = []
+    for r, root in real.items():
+        inside = any(r != other and r.startswith(other.rstrip(os.sep) + os.sep) for other in real)
+        if not inside:
+            kept.append(root)
+    return kept
+
+
+def device_of(path):
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return path
+
+
+def run_per_device(roots, fn, per_device=ROOTS_PER_DEVICE, cancel_event=None):
+    # fn(root) untuk tiap root: paralel antar device, paling banyak per_device
+    # sekaligus dalam satu device. Mengembalikan {root: hasil} sesuai urutan roots;
+    # error pertama (selain SearchCancelled) dilempar ulang setelah semua selesai
+    if not roots:
+        return {}
+    limits = {}
+    for root in roots:
+        limits.setdefault(device_of(root), threading.Semaphore(max(1, per_device)))
+
+    def run(root):
+        with limits[device_of(root)]:
+            _check_cancel(cancel_event)
+            return fn(root)
+
+    results, errors = {}, []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(roots)) as executor:
+        futures = {executor.submit(run, root): root for root in roots}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                errors.append(e)
+                if cancel_event is not None and not isinstance(e, SearchCancelled):
+                    cancel_event.set()
+    if errors:
+        raise next((e for e in errors if not isinstance(e, SearchCancelled)), errors[0])
+    return {root: results[root] for root in roots}
+
+
+def scan_roots(roots, callback=None, index=None, workers=SCAN_WORKERS, per_device=ROOTS_PER_DEVICE,
+               cancel_event=None, stats=None, cache=None):
+    # cache: dict root -> ScanResult yang sudah ada; root yang sudah ada di sana
+    # tidak dipindai ulang, hasil scan baru ikut disimpan ke dalamnya
+    roots = normalize_roots(roots)
+    cache = {} if cache is None else cache
+    todo = [r for r in roots if r not in cache]
+    counts = dict.fromkeys(todo, 0)
+
+    def scan_one(root):
+        def progress(count):
+            # Jumlah file gabungan semua root yang sedang dipindai
+            counts[root] = count
+            callback(sum(counts.values()))
+        return scan_directory(root, callback=progress if callback else None, index=index, workers=workers,
+                              cancel_event=cancel_event, stats=stats)
+
+    cache.update(run_per_device(todo, scan_one, per_device, cancel_event))
+    return {root: cache[root] for root in roots}
+
+
+def search_roots(scans, search, on_match=None, per_device=ROOTS_PER_DEVICE, cancel_event=None):
+    # search(scan, emit) untuk satu root: hasil boleh dikirim lewat emit selama
+    # berjalan dan/atau dikembalikan di akhir. Hanya path yang belum pernah
+    # dikirim yang diteruskan ke on_match, jadi semua root jadi satu aliran hasil.
+    # Mengembalikan gabungan hasil, terurut dan tanpa duplikat.
+    seen = set()
+    lock = threading.Lock()
+
+    def emit(paths):
+        with lock:
+            new = [p for p in paths if p not in seen]
+            seen.update(new)
+        if new and on_match:
+            on_match(new)
+
+    def search_one(root):
+        emit(search(scans[root], emit) or ())
+
+    run_per_device(list(scans), search_one, per_device, cancel_event)
+    return sorted(seen)
+
+
+def search_query(scans, query, on_match=None, top_k=None, query_cache=None, trigram=None, archives=False,
+                 backend="auto", workers=SCAN_WORKERS, search_workers=None, per_device=ROOTS_PER_DEVICE,
+                 progress=None, cancel_event=None, stats=None):
+    # Pipeline lengkap satu Query di semua root. Per root: filter metadata/nama
+    # dulu, tahap nama dan isi hanya melihat kandidatnya; isi diambil dari
+    # query_cache kalau ada, sebelum file diklasifikasi. Semua root memakai satu
+    # SearchPool (search_workers worker; None = default backend), jadi backend
+    # "processes" hanya membuat satu pool, dan baru kalau ada file yang dicari.
+    # trigram(scan, callback, ids) -> TrigramIndex atau None, dipanggil hanya
+    # kalau ada kata kunci isi (ids: kandidat hasil filter, None = semua file);
+    # progress(stage, root, current, total) untuk tahap "classify", "index" dan "search".
+    # Mengembalikan (hasil lewat on_match, top_k (skor, path) terbaik semua
+    # root). Dengan top_k hasil isi baru final setelah semua root selesai, jadi
+    # tidak dikirim ke on_match; arsip tidak ikut karena skornya per file biasa.
+    from .search import SearchPool, search_content, search_ranked
+    keywords, mode_and = query.content, query.mode_and
+    ranked = []
+    lock = threading.Lock()
+
+    def report(stage, root):
+        return functools.partial(progress, stage, root) if progress else None
+
+    def search_one(scan, emit, pool):
+        candidates = query.candidate_ids(scan, stats) if query.has_filters else None
+        if query.name:
+            emit(query.name_matches(scan, candidates, stats))
+        elif not keywords:
+            # Hanya filter: semua file yang lolos adalah hasil
+            emit(query.paths(scan, candidates))
+        if not keywords:
+            return
+
+        scope = query.scope()
+        members = scan.archive_files(candidates) if archives and not top_k else None
+        if query_cache is not None and not top_k:
+            cached = query_cache.get(scan, keywords, mode_and, members is not None, scope)
+            if cached is not None:
+                if stats is not None:
+                    stats.count("query_cache.hits")
+                emit(cached)
+                return
+        # Sniff teks/biner baru dilakukan di sini, hanya kalau ada kata kunci isi
+        targets = scan.text_files(callback=report("classify", scan.root), workers=workers,
+                                  cancel_event=cancel_event, stats=stats, ids=candidates)
+        options = dict(callback=report("search", scan.root), backend=backend, cancel_event=cancel_event,
+                       stats=stats, pool=pool,
+                       trigram_index=trigram(scan, report("index", scan.root), candidates) if trigram else None)
+        if top_k:
+            found = search_ranked(keywords, targets, mode_and=mode_and, top_k=top_k, **options)
+            with lock:
+                ranked.extend(found)
+        elif query_cache is not None:
+            query_cache.search(scan, keywords, targets, mode_and=mode_and, on_match=emit, archives=members,
+                               scope=scope, **options)
+        else:
+            search_content(keywords, targets, mode_and=mode_and, on_match=emit, archives=members, **options)
+
+    pool = SearchPool(backend, search_workers, cancel_event) if keywords else None
+    with pool or contextlib.nullcontext():
+        found = search_roots(scans, lambda scan, emit: search_one(scan, emit, pool), on_match, per_device,
+                             cancel_event)
+    return found, heapq.nlargest(top_k, ranked) if top_k else []
@@ -0,0 +1,267 @@
+import collections
+import concurrent.futures
+import errno
+import json
+import os
+import shutil
+import sys
+import time
+
+from .common import JOURNAL_BATCH, ORGANIZE_JOURNAL, ORGANIZE_WORKERS, get_category, get_ext
+from .stats import phase
+
+OrganizeMove = collections.namedtuple("OrganizeMove", "src dst kategori ext")
+
+def plan_organize(folder_path, isKelompok, isExt):
+    # Tahap 1: tentukan semua pemindahan dan folder tujuan tanpa menyentuh file
+    moves = []
+    folders = set()
+    organizedFolder = os.path.join(folder_path, "ORGANIZED FILES")
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if entry.is_dir() or entry.name == ORGANIZE_JOURNAL:
+                continue
+
+            kategori = get_category(entry.name)
+            ext = get_ext(entry.name)
+            folderKategori = os.path.join(organizedFolder, kategori) if isKelompok == "y" else organizedFolder
+            folderExt = os.path.join(folderKategori, ext) if isExt == "y" else folderKategori
+
+            folders.add(folderExt)
+            moves.append(OrganizeMove(entry.path, _free_name(folderExt, entry.name), kategori, ext))
+    moves.sort()
+    return moves, folders
+
+def _free_name(folder, name):
+    # Tujuan yang sudah ada (mis. sisa rapikan sebelumnya) tidak ditimpa: nama
+    # diberi akhiran " (1)", " (2)", ... sampai belum terpakai
+    dst = os.path.join(folder, name)
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while os.path.lexists(dst):
+        dst = os.path.join(folder, f"{stem} ({n}){ext}")
+        n += 1
+    return dst
+
+def format_organize_report(moves, limit=50):
+    # Laporan dry-run: jumlah file per folder tujuan + contoh pemindahan
+    per_folder = collections.Counter(os.path.dirname(m.dst) for m in moves)
+    lines = [f"{len(moves)} file akan dipindahkan ke {len(per_folder)} folder:"]
+    for folder, count in sorted(per_folder.items()):
+        lines.append(f"  {folder}: {count} file")
+    lines.append("")
+    for m in moves[:limit]:
+        lines.append(f"{os.path.basename(m.src)} -> {m.kategori} ({m.ext})")
+    if len(moves) > limit:
+        lines.append(f"... dan {len(moves) - limit} file lainnya")
+    return "\n".join(lines)
+
+def _move_file(src, dst):
+    # Tidak pernah menimpa: file yang ditimpa tidak bisa dikembalikan oleh undo
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "sudah ada", dst)
+    try:
+        # Satu device: cukup rename (atomik, tanpa menyalin isi file)
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Beda device: salin lalu hapus
+        shutil.move(src, dst)
+
+# --- MOVE JOURNAL ---
+# Write-ahead journal di folder target: rencana lengkap ditulis (dan di-fsync)
+# sebelum file pertama dipindah, lalu nomor pemindahan yang selesai ditambahkan
+# per batch. Dengan itu proses yang terputus bisa dilanjutkan atau di-undo.
+class MoveJournal:
+    def __init__(self, folder_path):
+        self.path = os.path.join(folder_path, ORGANIZE_JOURNAL)
+        self.moves = []
+        self.folders = []
+        self.done = set()
+        self.undone = set()
+        self.finished = False
+        self._pending = {"done": [], "undone": []}
+        self._last_flush = time.monotonic()
+
+    def _write(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records))
+            f.flush()
+            os.fsync(f.fileno())
+
+    @classmethod
+    def load(cls, folder_path):
+        journal = cls(folder_path)
+        if not os.path.exists(journal.path):
+            return None
+        with open(journal.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # baris terakhir terpotong karena crash
+                kind = record["type"]
+                if kind == "begin":
+                    journal.folders = record["folders"]
+                elif kind == "plan":
+                    journal.moves.append(OrganizeMove(*record["move"]))
+                elif kind in ("done", "undone"):
+                    getattr(journal, kind).update(record["ids"])
+                elif kind == "end":
+                    journal.finished = True
+        return journal
+
+    def begin(self, moves, folders):
+        self.moves = list(moves)
+        self.folders = sorted(folders)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._write([{"type": "begin", "folders": self.folders}] +
+                    [{"type": "plan", "move": list(m)} for m in self.moves])
+
+    def mark(self, kind, i):
+        getattr(self, kind).add(i)
+        self._pending[kind].append(i)
+        if len(self._pending[kind]) >= JOURNAL_BATCH or time.monotonic() - self._last_flush > 0.5:
+            self.flush()
+
+    def flush(self):
+        records = [{"type": kind, "ids": ids} for kind, ids in self._pending.items() if ids]
+        if records:
+            self._write(records)
+        self._pending = {"done": [], "undone": []}
+        self._last_flush = time.monotonic()
+
+    def finish(self):
+        self.flush()
+        self._write([{"type": "end"}])
+        self.finished = True
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _run_moves(jobs, workers=ORGANIZE_WORKERS, callback=None, on_done=None):
+    # jobs: (id, src, dst). on_done dipanggil di thread pemanggil (aman untuk journal)
+    failed = []
+    done = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(jobs), 1024):
+            block = jobs[start:start + 1024]
+            futures = {executor.submit(_move_file, src, dst): (i, src, dst) for i, src, dst in block}
+            for future in concurrent.futures.as_completed(futures):
+                i, src, dst = futures[future]
+                try:
+                    future.result()
+                    if on_done: on_done(i, src, dst)
+                except OSError as e:
+                    failed.append((i, src, e))
+                done += 1
+            if callback: callback(done, len(jobs))
+    return failed
+
+def execute_organize(moves, folders, workers=ORGANIZE_WORKERS, callback=None, journal=None, skip=()):
+    # Tahap 2: buat semua folder sekali, lalu pindahkan file secara paralel
+    for folder in sorted(folders):
+        os.makedirs(folder, exist_ok=True)
+
+    def on_done(i, src, dst):
+        if journal is not None:
+            journal.mark("done", i)
+        m = moves[i]
+        #Hasil pemindahan/pengelompokan
+        print(f"[OK] {os.path.basename(m.src)} -> {m.kategori} ({m.ext})", file=sys.stderr)
+
+    jobs = [(i, m.src, m.dst) for i, m in enumerate(moves) if i not in skip]
+    try:
+        failed = _run_moves(jobs, workers, callback, on_done)
+    finally:
+        if journal is not None:
+            journal.flush()
+    if journal is not None and not failed:
+        journal.finish()
+    return failed
+
+def _raise_failed(failed, action="dipindahkan"):
+    if failed:
+        _, src, e = failed[0]
+        raise OSError(f"{len(failed)} file gagal {action}, misal {os.path.basename(src)}: {e}")
+
+def organize(folder_path, isKelompok, isExt, dry_run=False, workers=ORGANIZE_WORKERS, callback=None, stats=None):
+    if not os.path.isdir(folder_path):
+        return []
+    journal = MoveJournal.load(folder_path)
+    if journal is not None and not journal.finished and not dry_run:
+        raise RuntimeError("Ada proses rapikan yang terputus; lanjutkan atau undo dulu.")
+
+    # Menyesuaikan kelompok semua file yang ada di folder target
+    with phase(stats, "organize_plan"):
+        moves, folders = plan_organize(folder_path, isKelompok, isExt)
+    if stats is not None:
+        stats.count("organize.planned", len(moves))
+    if dry_run:
+        # Laporan dibuat pemanggil (format_organize_report / output JSON CLI)
+        return moves
+
+    journal = MoveJournal(folder_path)
+    with phase(stats, "organize_move"):
+        journal.begin(moves, folders)
+        _raise_failed(execute_organize(moves, folders, workers, callback, journal))
+    return moves
+
+def _reconcile(journal):
+    # Pemindahan yang sudah terjadi tapi belum sempat tercatat (crash sebelum
+    # batch "done" di-flush): src hilang, dst ada
+    for i, m in enumerate(journal.moves):
+        if i not in journal.done and not os.path.lexists(m.src) and os.path.lexists(m.dst):
+            journal.mark("done", i)
+    journal.flush()
+
+def resume_organize(folder_path, workers=ORGANIZE_WORKERS, callback=None):
+    journal = MoveJournal.load(folder_path)
+    if journal is None or journal.finished:
+        return []
+    _reconcile(journal)
+    todo = [m for i, m in enumerate(journal.moves) if i not in journal.done]
+    _raise_failed(execute_organize(journal.moves, journal.folders, workers, callback, journal, skip=journal.done))
+    return todo
+
+def undo_organize(folder_path, workers=ORGANIZE_WORKERS, callback=None):
+    journal = MoveJournal.load(folder_path)
+    if journal is None:
+        return []
+    _reconcile(journal)
+    jobs = [(i, m.dst, m.src) for i, m in enumerate(journal.moves)
+            if i in journal.done and i not in journal.undone and os.path.lexists(m.dst)]
+
+    try:
+        # _move_file juga tidak menimpa file baru yang muncul di lokasi asal
+        failed = _run_moves(jobs, workers, callback, lambda i, src, dst: journal.mark("undone", i))
+    finally:
+        journal.flush()
+
+    # Folder hasil rapikan (beserta folder kategori di atasnya) yang sudah
+    # kosong ikut dihapus, dari yang terdalam
+    root = os.path.normpath(folder_path)
+    created = set()
+    for folder in journal.folders:
+        folder = os.path.normpath(folder)
+        while folder != root and folder.startswith(root) and folder not in created:
+            created.add(folder)
+            folder = os.path.dirname(folder)
+    for folder in sorted(created, key=len, reverse=True):
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass
+    _raise_failed(failed, "dikembalikan")
+    # Journal baru dihapus kalau tiap pemindahan sudah dikembalikan atau memang
+    # belum pernah terjadi; selain itu journal adalah satu-satunya catatan asal file
+    unresolved = [m for i, m in enumerate(journal.moves)
+                  if i not in journal.undone and (i in journal.done or not os.path.lexists(m.src))]
+    if unresolved:
+        raise OSError(f"{len(unresolved)} file tidak bisa dikembalikan, misal {os.path.basename(unresolved[0].dst)}; "
+                      f"journal disimpan di {journal.path}")
+    journal.remove()
+    return [journal.moves[i] for i, _, _ in jobs]
@@ -0,0 +1,171 @@
+# Model query terstruktur: kata kunci nama/isi ditambah filter ukuran, waktu
+# ubah, kategori, glob dan regex nama. Filter dijalankan langsung di array hasil
+# scan (tanpa membuka file), urut dari yang paling murah, jadi tahap isi yang
+# mahal hanya menerima kandidat yang tersisa. Pola dikompilasi sekali per query.
+import array
+import datetime
+import fnmatch
+import os
+import re
+import time
+
+from .common import FILE_CATEGORIES, get_category
+from .scan import search_name_contains
+from .stats import phase
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2,
+               "g": 1024 ** 3, "gb": 1024 ** 3}
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*$", re.IGNORECASE)
+_AGE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([mhdw])\s*$", re.IGNORECASE)
+_AGE_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+CATEGORY_NAMES = tuple(FILE_CATEGORIES) + ("Lainnya",)
+
+
+def parse_size(text):
+    # "500", "10K", "1.5MB", "2g" -> byte
+    if isinstance(text, (int, float)):
+        return int(text)
+    m = _SIZE_RE.match(text)
+    if not m or m.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"ukuran tidak valid: {text!r} (contoh: 500, 10K, 5M, 1G)")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).lower()])
+
+
+def parse_time(text, now=None):
+    # Umur relatif ("30m", "12h", "7d", "2w" yang lalu) atau tanggal ISO
+    # ("2024-05-01", "2024-05-01T08:30") -> detik epoch
+    if isinstance(text, (int, float)):
+        return float(text)
+    m = _AGE_RE.match(text)
+    if m:
+        # Dibulatkan ke menit supaya query yang sama sebentar kemudian tetap
+        # punya kunci cache yang sama
+        now = time.time() if now is None else now
+        return now - now % 60 - float(m.group(1)) * _AGE_UNITS[m.group(2).lower()]
+    try:
+        return datetime.datetime.fromisoformat(text.strip()).timestamp()
+    except ValueError:
+        raise ValueError(f"waktu tidak valid: {text!r} (contoh: 7d, 12h, 2024-05-01)") from None
+
+
+class Query:
+    def __init__(self, name="", content=(), mode_and=True, min_size=None, max_size=None,
+                 modified_after=None, modified_before=None, categories=(), glob=None, regex=None):
+        if isinstance(content, str):
+            content = [content]
+        if isinstance(categories, str):
+            categories = [categories]
+        self.name = (name or "").strip()
+        self.content = [k for k in content if k.strip()]
+        self.mode_and = mode_and
+        self.min_size = None if min_size is None else parse_size(min_size)
+        self.max_size = None if max_size is None else parse_size(max_size)
+        self.modified_after = None if modified_after is None else parse_time(modified_after)
+        self.modified_before = None if modified_before is None else parse_time(modified_before)
+        unknown = [c for c in categories if c not in CATEGORY_NAMES]
+        if unknown:
+            raise ValueError(f"kategori tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(CATEGORY_NAMES)})")
+        self.categories = frozenset(categories)
+        self.glob = glob or None
+        self.regex = regex or None
+        # Glob dengan "/" dicocokkan ke path lengkap, selain itu ke nama file saja
+        self._glob = re.compile(fnmatch.translate(glob), re.IGNORECASE) if glob else None
+        self._glob_path = bool(glob) and ("/" in glob or os.sep in glob)
+        try:
+            self._regex = re.compile(regex, re.IGNORECASE) if regex else None
+        except re.error as e:
+            raise ValueError(f"regex tidak valid: {regex!r} ({e})") from None
+
+    @classmethod
+    def from_dict(cls, d):
+        # Kunci sama dengan opsi CLI: name, content, mode, min_size, max_size,
+        # after, before, category, glob, regex
+        mode = d.get("mode", "and")
+        if mode not in ("and", "or"):
+            raise ValueError(f"mode harus 'and' atau 'or', bukan {mode!r}")
+        return cls(d.get("name", ""), d.get("content", ()), mode == "and",
+                   min_size=d.get("min_size"), max_size=d.get("max_size"),
+                   modified_after=d.get("after"), modified_before=d.get("before"),
+                   categories=d.get("category", ()), glob=d.get("glob"), regex=d.get("regex"))
+
+    @property
+    def has_filters(self):
+        return self.scope() is not None
+
+    def is_empty(self):
+        return not self.name and not self.content and not self.has_filters
+
+    def scope(self):
+        # Filter dalam bentuk yang bisa di-hash (kunci QueryCache); None kalau tanpa filter
+        key = (self.min_size, self.max_size, self.modified_after, self.modified_before,
+               tuple(sorted(self.categories)), self.glob, self.regex)
+        return None if key == (None, None, None, None, (), None, None) else key
+
+    def describe(self):
+        parts = []
+        if self.min_size is not None:
+            parts.append(f">= {self.min_size:,} B")
+        if self.max_size is not None:
+            parts.append(f"<= {self.max_size:,} B")
+        if self.modified_after is not None:
+            parts.append(f"diubah setelah {time.strftime('%Y-%m-%d %H:%M', time.localtime(self.modified_after))}")
+        if self.modified_before is not None:
+            parts.append(f"diubah sebelum {time.strftime('%Y-%m-%d %H:%M', time.localtime(self.modified_before))}")
+        if self.categories:
+            parts.append("kategori " + "/".join(sorted(self.categories)))
+        if self.glob:
+            parts.append(f"glob {self.glob}")
+        if self.regex:
+            parts.append(f"regex {self.regex}")
+        return ", ".join(parts)
+
+    def candidate_ids(self, scan, stats=None):
+        # id file hidup yang lolos semua filter; predikat angka dulu (array),
+        # lalu ekstensi, baru pola nama yang paling mahal
+        ids = scan.ids()
+        if not self.has_filters:
+            return ids
+        with phase(stats, "filter"):
+            before = len(ids)
+            sizes, mtimes, names = scan.sizes, scan.mtimes, scan.names
+            if self.min_size is not None:
+                ids = [i for i in ids if sizes[i] >= self.min_size]
+            if self.max_size is not None:
+                ids = [i for i in ids if sizes[i] <= self.max_size]
+            if self.modified_after is not None:
+                after = int(self.modified_after * 1e9)
+                ids = [i for i in ids if mtimes[i] >= after]
+            if self.modified_before is not None:
+                before_ns = int(self.modified_before * 1e9)
+                ids = [i for i in ids if mtimes[i] < before_ns]
+            if self.categories:
+                ids = [i for i in ids if get_category(names[i]) in self.categories]
+            if self._glob is not None:
+                match = self._glob.match
+                if self._glob_path:
+                    ids = [i for i in ids if match(scan.path(i))]
+                else:
+                    ids = [i for i in ids if match(names[i])]
+            if self._regex is not None:
+                search = self._regex.search
+                ids = [i for i in ids if search(names[i])]
+            if stats is not None:
+                stats.count("filter.candidates", len(ids))
+                stats.count("filter.rejected", before - len(ids))
+            return array.array("I", ids)
+
+    def paths(self, scan, ids=None):
+        ids = self.candidate_ids(scan) if ids is None else ids
+        return [scan.path(i) for i in ids]
+
+    def name_matches(self, scan, ids=None, stats=None):
+        # Tanpa filter: sama dengan search_name_contains (file dan folder). Dengan
+        # filter: hanya file kandidat, karena filter berlaku untuk file
+        if not self.has_filters:
+            return search_name_contains(self.name, scan, stats=stats)
+        ids = self.candidate_ids(scan, stats) if ids is None else ids
+        with phase(stats, "name"):
+            k = self.name.lower()
+            names = scan.names
+            return sorted(scan.path(i) for i in ids if k in names[i].lower())
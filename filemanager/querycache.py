@@ -0,0 +1,138 @@
+# Cache hasil pencarian isi. Kunci: (root, generation scan, kata kunci yang
+# dinormalisasi, mode, ikut mencari di arsip atau tidak, filter Query).
+# Generation berubah tiap kali scan baru dibuat atau watcher menerapkan
+# perubahan, jadi entri lama otomatis tidak terpakai lagi.
+# Tanpa watcher, file yang diubah di tempat tidak menaikkan generation, jadi
+# secara default cache hanya dipakai untuk scan yang sedang dipantau watcher.
+# live_only=False untuk pemakai yang scan-nya baru dibuat dan berumur pendek
+# (mis. satu perintah CLI dengan banyak query).
+import collections
+import threading
+
+from .common import QUERY_CACHE_MAX_PATHS, QUERY_CACHE_SIZE
+from .search import search_content
+
+
+def normalize_keywords(keywords, mode_and=True):
+    # Sama dengan KeywordMatcher: huruf kecil, tanpa duplikat, urut. Satu kata
+    # kunci hasilnya sama untuk AND maupun OR, jadi disimpan sebagai AND.
+    words = tuple(sorted({k.lower() for k in keywords if k}))
+    return words, "and" if mode_and or len(words) == 1 else "or"
+
+
+class QueryCache:
+    def __init__(self, maxsize=QUERY_CACHE_SIZE, max_paths=QUERY_CACHE_MAX_PATHS, live_only=True):
+        self.maxsize = maxsize
+        self.live_only = live_only
+        self.max_paths = max_paths  # batas total path yang disimpan semua entri
+        self._entries = collections.OrderedDict()  # kunci -> tuple path, urutan LRU
+        self._paths = 0
+        self._lock = threading.Lock()
+        self.hits = self.narrowed = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._paths = 0
+
+    def usable(self, scan):
+        return not self.live_only or scan.watchers > 0
+
+    def _key(self, scan, keywords, mode_and, archives, scope):
+        words, mode = normalize_keywords(keywords, mode_and)
+        return (scan.root, scan.generation, words, mode, bool(archives), scope)
+
+    def _drop_stale(self, root, generation):
+        # Dipanggil dengan _lock; entri root yang sama dari generation lama dibuang
+        for key in [k for k in self._entries if k[0] == root and k[1] != generation]:
+            self._paths -= len(self._entries.pop(key))
+
+    def get(self, scan, keywords, mode_and=True, archives=False, scope=None):
+        # scope: Query.scope(), yaitu filter yang membatasi file_list
+        if not self.usable(scan):
+            return None
+        key = self._key(scan, keywords, mode_and, archives, scope)
+        with self._lock:
+            found = self._entries.get(key)
+            if found is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(found)
+
+    def put(self, scan, keywords, mode_and, paths, archives=False, scope=None):
+        key = self._key(scan, keywords, mode_and, archives, scope)
+        paths = tuple(paths)
+        if not self.usable(scan) or len(paths) > self.max_paths:
+            return
+        with self._lock:
+            self._drop_stale(scan.root, scan.generation)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._paths -= len(old)
+            self._entries[key] = paths
+            self._paths += len(paths)
+            while len(self._entries) > self.maxsize or self._paths > self.max_paths:
+                self._paths -= len(self._entries.popitem(last=False)[1])
+
+    def _narrowest(self, root, generation, words, archives, scope):
+        # Query AND yang lebih longgar: tiap kata kuncinya ada di dalam salah satu
+        # kata kunci baru ("zebra" untuk "zebrafish", atau subset kata kunci), jadi
+        # semua hasil query baru pasti ada di hasil query lama
+        best = None
+        with self._lock:
+            for (r, g, cached, mode, a, sc), paths in self._entries.items():
+                if (r, g, mode, a, sc) != (root, generation, "and", archives, scope) or cached == words:
+                    continue
+                if all(any(c in w for w in words) for c in cached):
+                    if best is None or len(paths) < len(best[1]):
+                        best = (cached, paths)
+        return best
+
+    def search(self, scan, keywords, file_list, mode_and=True, callback=None, on_match=None, archives=None,
+               scope=None, stats=None, **kwargs):
+        # Pengganti search_content(keywords, file_list, ...) untuk file_list =
+        # file teks dari scan; argumen lain diteruskan apa adanya
+        with_archives = archives is not None
+        if not self.usable(scan):
+            # Tanpa watcher hasil lama bisa basi: baca ulang file seperti biasa
+            if stats is not None:
+                stats.count("query_cache.bypassed")
+            return search_content(keywords, file_list, mode_and=mode_and, callback=callback, on_match=on_match,
+                                  archives=archives, stats=stats, **kwargs)
+        found = self.get(scan, keywords, mode_and, with_archives, scope)
+        if found is not None:
+            if stats is not None:
+                stats.count("query_cache.hits")
+            if found and on_match:
+                on_match(found)
+            if callback:
+                callback(len(file_list), len(file_list))
+            return found
+
+        words, mode = normalize_keywords(keywords, mode_and)
+        generation = scan.generation
+        base = self._narrowest(scan.root, generation, words, with_archives, scope) if mode == "and" else None
+        if base is not None:
+            # Cukup cek kata kunci yang belum dijamin cocok, hanya di hasil lama
+            # (member arsip di hasil lama dibuka langsung lewat path "a.zip!/b")
+            cached, candidates = base
+            self.narrowed += 1
+            if stats is not None:
+                stats.count("query_cache.narrowed")
+                stats.count("query_cache.candidates", len(candidates))
+            found = search_content([w for w in words if w not in cached], list(candidates), mode_and=True,
+                                   callback=callback, on_match=on_match, stats=stats, **kwargs)
+        else:
+            self.misses += 1
+            if stats is not None:
+                stats.count("query_cache.misses")
+            found = search_content(keywords, file_list, mode_and=mode_and, callback=callback,
+                                   on_match=on_match, archives=archives, stats=stats, **kwargs)
+        # Scan berubah selama pencarian: hasilnya mungkin campuran, jangan disimpan
+        if scan.generation == generation:
+            self.put(scan, words, mode == "and", found, with_archives, scope)
+        return found
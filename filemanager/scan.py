@@ -0,0 +1,626 @@
+import array
+import bisect
+import concurrent.futures
+import contextlib
+import itertools
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from .common import (INDEX_COMMIT_INTERVAL, KNOWN_BINARY_EXTS, SCAN_WORKERS, _check_cancel,
+                     SearchCancelled, get_ext, is_archive, text_verdict)
+from .index import FileIndex
+from .stats import phase
+
+# --- SEARCH LOGIC (BACKEND) ---
+# Hasil scan: tabel folder + (dir_id, nama) per file dalam array, status teks
+# sebagai bitmap. Path lengkap baru dibentuk saat dibutuhkan (ditampilkan/dibuka).
+# Status teks baru ditentukan saat pencarian isi membutuhkannya (lihat text_files).
+# Perubahan dari watcher diterapkan di tempat: file yang hilang ditandai di bitmap
+# _dead (id tidak bergeser), file baru ditambahkan di akhir, dan generation naik.
+# Generation diambil dari satu counter global, jadi (root, generation) tidak
+# pernah sama untuk dua isi folder yang berbeda, termasuk antar scan ulang.
+_GENERATIONS = itertools.count(1)
+
+class PathView:
+    # Urutan path "virtual" di atas ScanResult; slice menghasilkan list path biasa
+    __slots__ = ("scan", "ids")
+
+    def __init__(self, scan, ids):
+        self.scan = scan
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        path = self.scan.path
+        return (path(i) for i in self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.scan.path(j) for j in self.ids[i]]
+        return self.scan.path(self.ids[i])
+
+class ScanResult:
+    def __init__(self, root, index=None):
+        self.root = root
+        self.index = index
+        self.dirs = []  # hanya folder yang punya file (id folder untuk file_dir)
+        self._dir_ids = {}
+        self.walked_dirs = []  # semua folder saat scan (termasuk yang kosong), untuk watcher
+        self.file_dir = array.array("I")
+        self.names = NameTable()
+        self.sizes = array.array("q")
+        self.mtimes = array.array("q")
+        self._text_known = bytearray()
+        self._text_bits = bytearray()
+        self._dead = bytearray()
+        self.dead_count = 0
+        self.generation = next(_GENERATIONS)
+        # DirectoryWatcher aktif untuk scan ini; tanpa watcher, file yang diubah
+        # tidak menaikkan generation sampai folder dipindai ulang
+        self.watchers = 0
+        # Watcher mengubah bitmap dan array dari thread-nya sendiri sementara
+        # pencarian mengklasifikasi file; semua perubahan lewat lock ini
+        self._lock = threading.RLock()
+        # File hasil scan satu folder berurutan di array dan urut nama, jadi
+        # pencarian per folder cukup lewat offset; file baru dari watcher dicatat terpisah
+        self._dir_start = array.array("Q")
+        self._dir_count = array.array("Q")
+        self._added = {}  # dir_id -> {nama: id}
+        self._text_files = None
+        self._name_index = None
+
+    def dir_id(self, dirpath):
+        dir_id = self._dir_ids.get(dirpath)
+        if dir_id is None:
+            dir_id = self._dir_ids[dirpath] = len(self.dirs)
+            self.dirs.append(dirpath)
+            self._dir_start.append(0)
+            self._dir_count.append(0)
+        return dir_id
+
+    def add(self, dir_id, name, size, mtime_ns, is_text=None):
+        with self._lock:
+            self._add(dir_id, name, size, mtime_ns, is_text)
+
+    def _fill(self, blocks):
+        # Isi awal dari scan_directory: [(folder, blok dari _pack_entries)] dalam
+        # urutan akhir; belum dibagikan ke thread lain, jadi tanpa lock
+        for dirpath, (names, sizes, mtimes, flags) in blocks:
+            dir_id = self.dir_id(dirpath)
+            start = len(self.sizes)
+            self._dir_start[dir_id] = start
+            self._dir_count[dir_id] = len(sizes)
+            self.file_dir.extend(itertools.repeat(dir_id, len(sizes)))
+            self.sizes.extend(sizes)
+            self.mtimes.extend(mtimes)
+            need = (start + len(sizes) + 7) // 8 - len(self._dead)
+            for bitmap in (self._text_known, self._text_bits, self._dead):
+                bitmap.extend(bytes(need))
+            for n, flag in enumerate(flags):
+                if flag:
+                    self._set_text_flag(start + n, flag == 2)
+        self.names = NameTable.from_blocks(names for _, (names, _, _, _) in blocks)
+
+    def _add(self, dir_id, name, size, mtime_ns, is_text):
+        i = len(self.names)
+        self.file_dir.append(dir_id)
+        self.names.append(name)
+        self.sizes.append(size)
+        self.mtimes.append(mtime_ns)
+        if i % 8 == 0:
+            self._text_known.append(0)
+            self._text_bits.append(0)
+            self._dead.append(0)
+        self._set_text_flag(i, is_text)
+
+    def text_flag(self, i):
+        # True / False / None (belum diperiksa)
+        byte, bit = divmod(i, 8)
+        if not self._text_known[byte] >> bit & 1:
+            return None
+        return bool(self._text_bits[byte] >> bit & 1)
+
+    def set_text_flag(self, i, is_text):
+        with self._lock:
+            self._set_text_flag(i, is_text)
+
+    def _set_text_flag(self, i, is_text):
+        # Dipanggil dengan _lock
+        byte, bit = divmod(i, 8)
+        mask = 1 << bit
+        if is_text is None:
+            self._text_known[byte] &= ~mask
+        else:
+            self._text_known[byte] |= mask
+        if is_text:
+            self._text_bits[byte] |= mask
+        else:
+            self._text_bits[byte] &= ~mask
+
+    def is_live(self, i):
+        byte, bit = divmod(i, 8)
+        return not self._dead[byte] >> bit & 1
+
+    def _set_dead(self, i, dead):
+        # Dipanggil dengan _lock
+        if dead == (not self.is_live(i)):
+            return
+        byte, bit = divmod(i, 8)
+        if dead:
+            self._dead[byte] |= 1 << bit
+            self.dead_count += 1
+        else:
+            self._dead[byte] &= ~(1 << bit)
+            self.dead_count -= 1
+
+    def ids(self):
+        if not self.dead_count:
+            return range(len(self.names))
+        return [i for i in range(len(self.names)) if self.is_live(i)]
+
+    def path(self, i):
+        return os.path.join(self.dirs[self.file_dir[i]], self.names[i])
+
+    def __len__(self):
+        return len(self.names) - self.dead_count
+
+    def __iter__(self):
+        return (self.path(i) for i in self.ids())
+
+    def __getitem__(self, i):
+        ids = self.ids()
+        if isinstance(i, slice):
+            return [self.path(j) for j in ids[i]]
+        return self.path(ids[i])
+
+    def name_index(self):
+        # Dibangun sekali per hasil scan (dan per perubahan), memakai tabel folder yang sama
+        if self._name_index is None:
+            live = self.is_live if self.dead_count else None
+            self._name_index = NameIndex(self.dirs, self.file_dir, self.names, live)
+        return self._name_index
+
+    # --- perubahan inkremental (dipakai DirectoryWatcher) ---
+    def _dir_items(self, dir_id):
+        # (nama, id) semua file folder ini, termasuk yang sudah ditandai hilang
+        start = self._dir_start[dir_id]
+        for i in range(start, start + self._dir_count[dir_id]):
+            yield self.names[i], i
+        yield from self._added.get(dir_id, {}).items()
+
+    def _find(self, dir_id, name):
+        i = self._added.get(dir_id, {}).get(name)
+        if i is not None:
+            return i
+        start = self._dir_start[dir_id]
+        end = start + self._dir_count[dir_id]
+        i = bisect.bisect_left(self.names, name, start, end)
+        return i if i < end and self.names[i] == name else None
+
+    def entries(self, dirpath):
+        # Isi folder yang masih ada: {nama: (size, mtime, is_text)}
+        dir_id = self._dir_ids.get(dirpath)
+        if dir_id is None:
+            return {}
+        return {name: (self.sizes[i], self.mtimes[i], self.text_flag(i))
+                for name, i in self._dir_items(dir_id) if self.is_live(i)}
+
+    def set_watched(self, watched):
+        with self._lock:
+            self.watchers += 1 if watched else -1
+
+    def _changed(self):
+        # Dipanggil dengan _lock
+        self.generation = next(_GENERATIONS)
+        self._text_files = None
+        self._name_index = None
+
+    def apply_dir(self, dirpath, entries):
+        # Samakan isi satu folder dengan entries {nama: (size, mtime, is_text)};
+        # mengembalikan path yang dibuat, diubah atau dihapus
+        with self._lock:
+            return self._apply_dir(dirpath, entries)
+
+    def _apply_dir(self, dirpath, entries):
+        dir_id = self._dir_ids.get(dirpath)
+        changed = []
+        if dir_id is not None:
+            for name, i in list(self._dir_items(dir_id)):
+                if name not in entries and self.is_live(i):
+                    self._set_dead(i, True)
+                    changed.append(self.path(i))
+        for name, (size, mtime_ns, is_text) in entries.items():
+            i = self._find(dir_id, name) if dir_id is not None else None
+            if i is None:
+                if dir_id is None:
+                    dir_id = self.dir_id(dirpath)
+                i = len(self.names)
+                self._add(dir_id, name, size, mtime_ns, is_text)
+                self._added.setdefault(dir_id, {})[name] = i
+            elif self.is_live(i) and (self.sizes[i], self.mtimes[i]) == (size, mtime_ns):
+                continue
+            else:
+                # File berubah atau muncul lagi dengan nama yang sama: id lama dipakai ulang
+                self.sizes[i] = size
+                self.mtimes[i] = mtime_ns
+                self._set_text_flag(i, is_text)
+                self._set_dead(i, False)
+            changed.append(self.path(i))
+        if changed:
+            self._changed()
+        return changed
+
+    def drop_tree(self, dirpath):
+        # Folder dihapus/dipindah: semua file di dalamnya ditandai hilang
+        with self._lock:
+            return self._drop_tree(dirpath)
+
+    def _drop_tree(self, dirpath):
+        prefix = dirpath.rstrip(os.sep) + os.sep
+        changed = []
+        for d, dir_id in self._dir_ids.items():
+            if d == dirpath or d.startswith(prefix):
+                for _, i in self._dir_items(dir_id):
+                    if self.is_live(i):
+                        self._set_dead(i, True)
+                        changed.append(self.path(i))
+        if changed:
+            self._changed()
+        return changed
+
+    def text_ids(self):
+        return self.text_files().ids
+
+    def text_files(self, callback=None, workers=SCAN_WORKERS, cancel_event=None, stats=None, ids=None):
+        # ids: hanya file ini yang diklasifikasi (kandidat hasil filter Query);
+        # hasilnya tidak diingat, tapi status teks per file tetap tersimpan
+        if ids is not None:
+            with phase(stats, "classify"):
+                return self._classify(ids, callback, workers, cancel_event, stats)
+        text_files = self._text_files
+        if text_files is not None:
+            return text_files
+        generation = self.generation
+        with phase(stats, "classify"):
+            text_files = self._classify(self.ids(), callback, workers, cancel_event, stats)
+        with self._lock:
+            # Watcher mengubah isi selama klasifikasi: hasil ini tidak memuat
+            # file barunya, jadi tidak diingat (panggilan berikutnya mengulang)
+            if self.generation == generation:
+                self._text_files = text_files
+        return text_files
+
+    def archive_files(self, ids=None):
+        # Arsip zip/tar untuk search_content(archives=...); cukup dari nama, tanpa I/O
+        names = self.names
+        ids = self.ids() if ids is None else ids
+        return PathView(self, array.array("I", (i for i in ids if is_archive(names[i]))))
+
+    def _classify(self, ids, callback, workers, cancel_event, stats):
+        todo = [(i, self.sizes[i], self.mtimes[i]) for i in ids if self.text_flag(i) is None]
+        total = len(todo)
+        done = 0
+        if stats is not None:
+            stats.count("classify.known", len(ids) - total)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            # Diproses per blok supaya jumlah Future di memori tetap kecil
+            for start in range(0, total, 1024):
+                _check_cancel(cancel_event)
+                block = todo[start:start + 1024]
+                verdicts = list(executor.map(
+                    lambda item: text_verdict(self.path(item[0]), item[1], item[2], stats), block))
+                with self._lock:
+                    for (i, size, mtime_ns), verdict in zip(block, verdicts):
+                        # File yang diubah watcher sementara itu di-sniff ulang nanti
+                        if (self.sizes[i], self.mtimes[i]) == (size, mtime_ns):
+                            self._set_text_flag(i, verdict)
+                done += len(block)
+                if callback: callback(done, total)
+
+        if todo and self.index is not None:
+            try:
+                with self.index.connect() as conn:
+                    FileIndex.store_verdicts(conn, [
+                        (self.path(i), size, mtime_ns, self.text_flag(i)) for i, size, mtime_ns in todo
+                        if self.text_flag(i) is not None])
+            except sqlite3.Error as e:
+                print("Gagal menyimpan index:", e, file=sys.stderr)
+
+        return PathView(self, array.array("I", (i for i in ids if self.text_flag(i))))
+
+def _list_directory(path):
+    # Sama seperti os.walk: symlink ke folder tidak ditelusuri, sisanya dianggap file
+    subdirs, files = [], {}
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
+            except OSError:
+                pass
+            try:
+                st = entry.stat()
+                files[entry.name] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                files[entry.name] = (-1, 0)
+    return subdirs, files
+
+def _stat_files(dirpath, names):
+    # Tanpa listing: hanya file yang sudah dikenal yang di-stat ulang
+    stats = {}
+    for name in names:
+        try:
+            st = os.stat(os.path.join(dirpath, name))
+            stats[name] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            continue
+        except OSError:
+            stats[name] = (-1, 0)
+    return stats
+
+def _read_directory(dirpath, cached_mtime=None, cached_files=None):
+    # Dijalankan di worker: stat folder, lalu listing kalau berubah
+    try:
+        dir_mtime = os.stat(dirpath).st_mtime_ns
+    except OSError:
+        return None
+    cached_files = cached_files or {}
+    if cached_mtime is not None and cached_mtime == dir_mtime:
+        # Listing dilewati, tapi tiap file tetap di-stat: mengubah isi file di
+        # tempat tidak mengubah mtime folder
+        return dir_mtime, None, _merge_entries(_stat_files(dirpath, cached_files), cached_files)
+
+    try:
+        subdirs, stats = _list_directory(dirpath)
+    except OSError:
+        # mtime tidak disimpan supaya folder ini dicoba lagi di scan berikutnya
+        return None, [], {}
+    return dir_mtime, subdirs, _merge_entries(stats, cached_files)
+
+def _merge_entries(stats, cached_files):
+    # Status teks dari index hanya dipakai kalau size dan mtime file tidak berubah
+    entries = {}
+    for name, (size, mtime_ns) in stats.items():
+        cached = cached_files.get(name)
+        if cached and cached[:2] == (size, mtime_ns):
+            entries[name] = cached
+        else:
+            # Belum di-sniff; format biner yang dikenal bisa diputuskan tanpa I/O
+            is_text = False if get_ext(name) in KNOWN_BINARY_EXTS else None
+            entries[name] = (size, mtime_ns, is_text)
+    return entries
+
+def _pack_entries(entries):
+    # {nama: (size, mtime, is_text)} satu folder -> blok ringkas, urut nama;
+    # status teks: 0 belum diperiksa, 1 biner, 2 teks
+    names = sorted(entries)
+    sizes = array.array("q")
+    mtimes = array.array("q")
+    flags = bytearray()
+    for name in names:
+        size, mtime_ns, is_text = entries[name]
+        sizes.append(size)
+        mtimes.append(mtime_ns)
+        flags.append(0 if is_text is None else 2 if is_text else 1)
+    return "\0".join(names) + "\0", sizes, mtimes, bytes(flags)
+
+def scan_directory(root_path, callback=None, index=None, workers=SCAN_WORKERS, cancel_event=None, stats=None):
+    with phase(stats, "scan"):
+        root = os.path.abspath(root_path)
+        # Per folder hanya blok ringkas (nama digabung jadi satu string, size/mtime
+        # dalam array), bukan satu objek Python per file; disusun jadi ScanResult
+        # setelah walk selesai
+        children = {}  # folder -> subfolder
+        blocks = {}  # folder -> (nama\0nama\0..., sizes, mtimes, status teks)
+        count = 0
+        reported = 0
+
+        with contextlib.ExitStack() as stack:
+            conn = stack.enter_context(index.connect()) if index is not None else None
+            executor = stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers=workers))
+            pending = {}
+            uncommitted = 0
+            dirty_since = 0.0
+
+            def submit(dirpath, parent):
+                old_mtime, old_files, old_subdirs = None, {}, []
+                if conn is not None:
+                    old_mtime = FileIndex.dir_mtime(conn, dirpath)
+                    old_files = FileIndex.files(conn, dirpath)
+                    old_subdirs = FileIndex.subdirs(conn, dirpath)
+                future = executor.submit(_read_directory, dirpath, old_mtime, old_files)
+                pending[future] = (dirpath, parent, old_files, old_subdirs)
+
+            submit(root, None)
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    for future in pending:
+                        future.cancel()
+                    raise SearchCancelled()
+                # Selama ada tulisan yang belum di-commit, tunggu dengan batas waktu:
+                # kunci tulis SQLite tidak ditahan lama saat listing berikutnya lambat,
+                # jadi scan root lain (atau watcher) yang memakai index yang sama tidak macet
+                done, _ = concurrent.futures.wait(pending, timeout=INDEX_COMMIT_INTERVAL if uncommitted else None,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                if uncommitted and (uncommitted >= 1000 or time.monotonic() - dirty_since >= INDEX_COMMIT_INTERVAL):
+                    conn.commit()
+                    uncommitted = 0
+                for future in done:
+                    dirpath, parent, old_files, old_subdirs = pending.pop(future)
+                    result = future.result()
+                    if result is None:
+                        if conn is not None:
+                            FileIndex.drop_tree(conn, dirpath)
+                        continue
+                    if stats is not None:
+                        stats.count("scan.dirs_unchanged" if result[1] is None else "scan.dirs_listed")
+
+                    dir_mtime, subdirs, entries = result
+                    if subdirs is None:
+                        # Folder tidak berubah: daftar isi dari index tanpa listing ulang;
+                        # entries sudah berisi hasil stat ulang tiap file
+                        subdirs = old_subdirs
+                    if conn is not None and (result[1] is not None or entries != old_files):
+                        FileIndex.store_dir(conn, dirpath, parent, dir_mtime, entries,
+                                            subdirs, old_files, old_subdirs)
+                        if not uncommitted:
+                            dirty_since = time.monotonic()
+                        uncommitted += 1
+
+                    children[dirpath] = subdirs
+                    if entries:
+                        blocks[dirpath] = _pack_entries(entries)
+                    for sub in subdirs:
+                        submit(sub, dirpath)
+
+                    count += len(entries)
+                    # Update UI every 50 files to prevent lag
+                    if callback and count // 50 > reported:
+                        reported = count // 50
+                        callback(count)
+
+        # Urutan hasil deterministik: top-down seperti os.walk, nama diurutkan
+        result = ScanResult(root, index)
+        order = []
+        stack = [root]
+        while stack:
+            dirpath = stack.pop()
+            if dirpath in blocks:
+                order.append(dirpath)
+            stack.extend(sorted(children.get(dirpath, ()), reverse=True))
+        result._fill([(dirpath, blocks.pop(dirpath)) for dirpath in order])
+        result.walked_dirs = list(children)
+
+        if stats is not None:
+            stats.count("scan.files", count)
+        if callback: callback(count) # Final update
+        return result
+
+# --- NAME INDEX ---
+# Banyak nama disimpan dalam satu string dipisah "\0" (tidak mungkin ada di nama
+# file) plus array offset, jadi tidak ada satu objek str per file. Pencarian
+# substring cukup str.find di C lalu offset dipetakan balik dengan bisect.
+# Nama yang ditambahkan belakangan ditampung di list sampai freeze() berikutnya.
+class NameTable:
+    def __init__(self, names=()):
+        self.blob = ""
+        self.starts = array.array("Q")
+        self.pending = list(names)
+        self.freeze()
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        # blocks: string "nama\0nama\0" yang sudah berurutan; satu join untuk semua
+        table = cls()
+        table.blob = blob = "".join(blocks)
+        starts = table.starts
+        pos = 0
+        while pos < len(blob):
+            starts.append(pos)
+            pos = blob.index("\0", pos) + 1
+        return table
+
+    def freeze(self):
+        if not self.pending:
+            return
+        pos = len(self.blob)
+        for name in self.pending:
+            self.starts.append(pos)
+            pos += len(name) + 1
+        self.blob += "\0".join(self.pending) + "\0"
+        self.pending = []
+
+    def append(self, name):
+        self.pending.append(name)
+
+    def __len__(self):
+        return len(self.starts) + len(self.pending)
+
+    def __getitem__(self, i):
+        frozen = len(self.starts)
+        if i >= frozen:
+            return self.pending[i - frozen]
+        end = self.starts[i + 1] - 1 if i + 1 < frozen else len(self.blob) - 1
+        return self.blob[self.starts[i]:end]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def find(self, k):
+        if not k:
+            return list(range(len(self)))
+        hits = []
+        frozen = len(self.starts)
+        pos = self.blob.find(k)
+        while pos != -1:
+            i = bisect.bisect_right(self.starts, pos) - 1
+            hits.append(i)
+            # Lompat ke nama berikutnya supaya satu nama hanya dihitung sekali
+            if i + 1 >= frozen:
+                break
+            pos = self.blob.find(k, self.starts[i + 1])
+        hits.extend(frozen + j for j, name in enumerate(self.pending) if k in name)
+        return hits
+
+class NameIndex:
+    def __init__(self, dirs, file_dir, names, live=None):
+        self.dirs = dirs
+        self.file_dir = file_dir
+        self.names = names
+        # live: predikat id file (hasil scan yang sudah diubah watcher); folder
+        # hanya ikut kalau masih punya file yang hidup, sama seperti hasil scan baru
+        self.live = live
+        self._live_dirs = None if live is None else {file_dir[i] for i in range(len(names)) if live(i)}
+        self._files = NameTable(n.lower() for n in names)
+        self._dirs = NameTable(os.path.basename(d).lower() for d in dirs)
+        self._last = None  # (keyword, file hits, dir hits) untuk search-as-you-type
+
+    @classmethod
+    def from_paths(cls, paths):
+        dir_ids = {}
+        dirs = []
+        file_dir = array.array("I")
+        names = []
+        for p in paths:
+            d, name = os.path.split(p)
+            dir_id = dir_ids.get(d)
+            if dir_id is None:
+                dir_id = dir_ids[d] = len(dirs)
+                dirs.append(d)
+            file_dir.append(dir_id)
+            names.append(name)
+        return cls(dirs, file_dir, names)
+
+    def _find(self, blob, k, previous):
+        if previous is not None:
+            # Kata kunci makin panjang: cukup saring hasil sebelumnya
+            return [i for i in previous if k in blob[i]]
+        return blob.find(k)
+
+    def search(self, keyword):
+        k = keyword.lower()
+        files_prev = dirs_prev = None
+        if self._last and self._last[0] and self._last[0] in k:
+            _, files_prev, dirs_prev = self._last
+        file_hits = self._find(self._files, k, files_prev)
+        dir_hits = self._find(self._dirs, k, dirs_prev)
+        self._last = (k, file_hits, dir_hits)
+
+        if self.live is not None:
+            file_hits = [i for i in file_hits if self.live(i)]
+            dir_hits = [i for i in dir_hits if i in self._live_dirs]
+        found = {os.path.join(self.dirs[self.file_dir[i]], self.names[i]) for i in file_hits}
+        found.update(self.dirs[i] for i in dir_hits)
+        return sorted(found)
+
+def search_name_contains(keyword: str, file_list: list, stats=None):
+    with phase(stats, "name"):
+        index = file_list.name_index() if isinstance(file_list, ScanResult) else NameIndex.from_paths(file_list)
+        return index.search(keyword)
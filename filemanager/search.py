@@ -0,0 +1,631 @@
+import collections
+import concurrent.futures
+import contextlib
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import re
+import threading
+import time
+
+from .archive import iter_text_members, member_path, open_text
+from .common import (RANK_HIT_CAP, RANK_NAME_BONUS, RANK_RECENCY_HALF_LIFE, RANK_RECENCY_WEIGHT, RANK_TOP_K,
+                     SEARCH_BATCH_SIZE, SEARCH_BUFFER_SIZE, SEARCH_CANCEL_POLL, SEARCH_WORKERS, SearchCancelled)
+from .stats import phase
+
+# --- KEYWORD MATCHER ---
+def _trie_regex(words):
+    # Kata kunci disusun jadi trie lalu diubah ke satu regex, jadi prefix yang
+    # sama hanya dicek sekali dan pencarian berjalan di engine C milik `re`
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            body = ("(?:" + body + ")" if len(alts) == 1 else body) + "?"
+        return body
+
+    if max(map(len, words)) > 200:
+        # Kata kunci sangat panjang: hindari rekursi terlalu dalam
+        return "(?:" + "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)) + ")"
+    return build(trie)
+
+class KeywordMatcher:
+    # Di bawah jumlah ini `token in data` per kata kunci masih lebih cepat dari regex
+    FEW_KEYWORDS = 8
+
+    def __init__(self, keywords):
+        self.keywords = sorted({k.lower() for k in keywords if k})
+        self.max_len = max(map(len, self.keywords), default=0)
+        self._scan_re = None
+        self._highlight_re = None
+        if self.keywords:
+            body = _trie_regex(self.keywords)
+            # Lookahead supaya kemunculan yang tumpang tindih tetap dilaporkan
+            self._scan_re = re.compile("(?=(" + body + "))")
+            self._highlight_re = re.compile(body, re.IGNORECASE)
+            # Trie mengambil kecocokan terpanjang; kata kunci yang jadi prefix-nya ikut cocok
+            known = set(self.keywords)
+            self._implied = {
+                k: frozenset(k[:i] for i in range(1, len(k) + 1) if k[:i] in known)
+                for k in self.keywords
+            }
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def find(self, text, skip=frozenset()):
+        # text sudah lowercase; kembalikan kata kunci (selain skip) yang muncul di text
+        wanted = [k for k in self.keywords if k not in skip]
+        if len(wanted) <= self.FEW_KEYWORDS:
+            return {k for k in wanted if k in text}
+
+        found = set()
+        budget = 4 * len(wanted) + 64
+        for m in self._scan_re.finditer(text):
+            found |= self._implied[m.group(1)]
+            if len(found - skip) >= len(wanted):
+                break
+            budget -= 1
+            if not budget:
+                # Terlalu banyak kemunculan berulang: sisanya dicek langsung
+                found.update(k for k in wanted if k not in found and k in text)
+                break
+        return found - skip
+
+    def search(self, text):
+        # text sudah lowercase; cukup tahu ada/tidak
+        if len(self.keywords) <= self.FEW_KEYWORDS:
+            return any(k in text for k in self.keywords)
+        return self._scan_re.search(text) is not None
+
+    def highlight(self, text, fmt="--> {} <--"):
+        if self._highlight_re is None:
+            return text
+        return self._highlight_re.sub(lambda m: fmt.format(m.group(0)), text)
+
+def _match_stream(f, matcher, mode_and, buffer_size, read=None):
+    # Dibaca per potongan; ekor potongan sebelumnya disambung supaya kata kunci
+    # yang terpotong di batas potongan tetap ketemu
+    found = set()
+    overlap = matcher.max_len - 1
+    tail = ""
+    while True:
+        chunk = f.read(buffer_size)
+        if not chunk:
+            return False
+        if read is not None:
+            read[0] += len(chunk)
+        data = tail + chunk.lower()
+        # OR cukup satu; AND berhenti begitu semua sudah ketemu
+        if not mode_and:
+            if matcher.search(data):
+                return True
+        else:
+            found |= matcher.find(data, skip=found)
+            if len(found) == len(matcher):
+                return True
+        tail = data[-overlap:] if overlap else ""
+
+def _check_file_content(path, matcher, mode_and, buffer_size=SEARCH_BUFFER_SIZE, read=None):
+    if not isinstance(matcher, KeywordMatcher):
+        matcher = KeywordMatcher(matcher)
+    if not len(matcher):
+        return path if mode_and else None
+    try:
+        # open_text juga menerima path member arsip ("a.zip!/b.txt")
+        with open_text(path) as f:
+            if _match_stream(f, matcher, mode_and, buffer_size, read):
+                return path
+    except Exception:
+        pass
+    return None
+
+def _stopped(cancel):
+    # cancel: threading.Event (backend threads) atau Event dari Manager (backend
+    # processes). Manager yang sudah ditutup berarti pencarian sudah dibatalkan.
+    try:
+        return cancel is not None and cancel.is_set()
+    except (OSError, EOFError):
+        return True
+
+def _check_archive(path, matcher, mode_and, buffer_size=SEARCH_BUFFER_SIZE, read=None, cancel=None):
+    # Semua member teks satu arsip dicek berurutan dalam satu task
+    matches = []
+    if not len(matcher):
+        return matches
+    try:
+        for name, f in iter_text_members(path):
+            if _stopped(cancel):
+                break
+            if _match_stream(f, matcher, mode_and, buffer_size, read):
+                matches.append(member_path(path, name))
+    except Exception:
+        # Arsip rusak/terpotong: member yang sudah cocok tetap dilaporkan
+        pass
+    return matches
+
+def _check_one(path, matcher, mode_and, buffer_size, archive, read=None, cancel=None):
+    if archive:
+        return _check_archive(path, matcher, mode_and, buffer_size, read, cancel)
+    return [path] if _check_file_content(path, matcher, mode_and, buffer_size, read) else []
+
+# --- SEARCH EXECUTION ---
+_WORKER_MATCHER = None
+
+def _init_search_worker(matcher):
+    # Matcher dikirim sekali per proses, bukan per task
+    global _WORKER_MATCHER
+    _WORKER_MATCHER = matcher
+
+def _check_batch(paths, mode_and, buffer_size, matcher=None, archive=False, cancel=None):
+    matcher = matcher or _WORKER_MATCHER
+    # Hanya path yang cocok yang dikembalikan (dan melewati batas proses);
+    # pembatalan dicek sebelum tiap file, sisa batch tidak dibuka
+    matches = []
+    for p in paths:
+        if _stopped(cancel):
+            break
+        matches.extend(_check_one(p, matcher, mode_and, buffer_size, archive, cancel=cancel))
+    return matches
+
+def _check_batch_stats(paths, mode_and, buffer_size, matcher=None, archive=False, cancel=None, slowest=10):
+    # Sama dengan _check_batch plus waktu per file; hanya dipakai kalau stats aktif
+    matcher = matcher or _WORKER_MATCHER
+    matches = []
+    read = [0]
+    times = []
+    wall, cpu = time.perf_counter(), time.thread_time()
+    for p in paths:
+        if _stopped(cancel):
+            break
+        start = time.perf_counter()
+        matches.extend(_check_one(p, matcher, mode_and, buffer_size, archive, read, cancel))
+        times.append((time.perf_counter() - start, p))
+    info = {"files": len(times), "chars": read[0], "busy": time.perf_counter() - wall,
+            "cpu": time.thread_time() - cpu, "slowest": heapq.nlargest(slowest, times)}
+    return matches, info
+
+class ConcurrencyTuner:
+    # Hill climbing: jumlah task yang berjalan dinaikkan selama throughput (file/detik)
+    # membaik, dan dibalik arahnya kalau memburuk. Throughput = konkurensi / latensi
+    # per file, jadi disk lambat atau share SMB otomatis dapat paralelisme lebih kecil.
+    def __init__(self, ceiling, start=4, window=0.25):
+        self.ceiling = max(1, ceiling)
+        self.limit = min(self.ceiling, start)
+        self.step = max(1, self.ceiling // 8)
+        self.window = window
+        self.latency = 0.0  # rata-rata detik per file pada jendela terakhir
+        self._direction = 1
+        self._last_rate = None
+        self._reset(time.monotonic())
+
+    def _reset(self, now):
+        self._window_start = now
+        self._files = 0
+        self._busy = 0.0
+
+    def record(self, files, elapsed):
+        self._files += files
+        self._busy += elapsed
+        now = time.monotonic()
+        span = now - self._window_start
+        if span < self.window or not self._files:
+            return
+
+        rate = self._files / span
+        self.latency = self._busy / self._files
+        if self._last_rate is not None and rate < self._last_rate * 0.95:
+            self._direction = -self._direction
+        new_limit = self.limit + self._direction * self.step
+        if new_limit < 1 or new_limit > self.ceiling:
+            # Mentok di batas: jendela berikutnya mencoba arah sebaliknya
+            self._direction = -self._direction
+        self.limit = min(self.ceiling, max(1, new_limit))
+        self._last_rate = rate
+        self._reset(now)
+
+def _choose_backend(backend, total):
+    if backend == "auto":
+        # Proses baru sepadan kalau file cukup banyak dan ada lebih dari satu core
+        return "processes" if (os.cpu_count() or 1) > 1 and total >= 2000 else "threads"
+    if backend not in ("threads", "processes"):
+        raise ValueError(f"Backend tidak dikenal: {backend}")
+    return backend
+
+def _make_search_executor(backend, workers, matcher):
+    # backend sudah dipilih _choose_backend
+    if backend == "threads":
+        workers = workers or SEARCH_WORKERS
+        return concurrent.futures.ThreadPoolExecutor(max_workers=workers), matcher, workers
+    # "spawn" supaya aman dipakai dari thread GUI di semua OS
+    workers = workers or os.cpu_count() or 1
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_search_worker, initargs=(matcher,))
+    return executor, None, workers
+
+class SearchPool:
+    # Executor bersama untuk beberapa pencarian yang berjalan bersamaan (mis.
+    # semua root dalam satu query), jadi backend "processes" tidak membuat pool
+    # baru per root. Executor (dan Manager untuk pembatalan) baru dibuat saat
+    # pencarian pertama yang punya file; dengan "auto" tiap pencarian memilih
+    # threads/processes dari jumlah kandidatnya sendiri. Matcher dikirim bersama
+    # tiap batch karena kata kuncinya bisa berbeda, kecuali pool dibuat untuk
+    # satu pencarian saja (matcher=...).
+    def __init__(self, backend="auto", workers=None, cancel_event=None, matcher=None):
+        _choose_backend(backend, 0)
+        self.backend = backend
+        self.workers = workers
+        self.cancel_event = cancel_event
+        self.matcher = matcher
+        self._executors = {}  # backend -> (executor, matcher per task, jumlah worker)
+        self._manager = None
+        self._task_cancel = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        # Gagal atau dibatalkan: batch yang masih antre dibuang, tidak ditunggu
+        self.shutdown(wait=exc_type is None, cancel_futures=exc_type is not None)
+
+    def get(self, total, matcher):
+        # (executor, matcher per task, jumlah worker, event pembatalan yang dicek worker)
+        backend = _choose_backend(self.backend, total)
+        with self._lock:
+            if backend not in self._executors:
+                self._executors[backend] = _make_search_executor(backend, self.workers, self.matcher)
+            executor, task_matcher, workers = self._executors[backend]
+            cancel = self.cancel_event
+            if backend == "processes" and cancel is not None:
+                if self._manager is None:
+                    # threading.Event tidak bisa dikirim ke proses lain: worker memakai
+                    # Event dari Manager yang di-set begitu pembatalan terlihat
+                    self._manager = multiprocessing.get_context("spawn").Manager()
+                    self._task_cancel = self._manager.Event()
+                cancel = self._task_cancel
+        return executor, task_matcher if self.matcher is not None else matcher, workers, cancel
+
+    def cancel(self):
+        # Teruskan pembatalan ke worker proses yang sedang memproses batch
+        with self._lock:
+            if self._task_cancel is not None:
+                self._task_cancel.set()
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        if cancel_futures:
+            self.cancel()
+        with self._lock:
+            executors, self._executors = list(self._executors.values()), {}
+            manager, self._manager, self._task_cancel = self._manager, None, None
+        for executor, _, _ in executors:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        if manager is not None:
+            manager.shutdown()
+
+def _search_pool(pool, backend, workers, cancel_event, matcher):
+    # (pool, konteks with); pool milik pemanggil tidak ditutup di sini
+    if pool is not None:
+        return pool, contextlib.nullcontext()
+    pool = SearchPool(backend, workers, cancel_event, matcher)
+    return pool, pool
+
+def _backend_name(executor):
+    return "processes" if isinstance(executor, concurrent.futures.ProcessPoolExecutor) else "threads"
+
+def search_content(keywords: list, file_list: list, mode_and: bool = True, callback=None,
+                   buffer_size=SEARCH_BUFFER_SIZE, trigram_index=None,
+                   backend="auto", workers=None, batch_size=SEARCH_BATCH_SIZE, adaptive=True,
+                   cancel_event=None, on_match=None, archives=None, stats=None, pool=None):
+    # archives: path zip/tar yang member teksnya ikut dicari, satu arsip per
+    # task; hasilnya berupa path "arsip.zip!/member" (lihat filemanager.archive).
+    # pool: SearchPool bersama; tanpa pool dibuat executor sendiri untuk pencarian ini.
+    # Worker mengecek pembatalan sebelum tiap file (lewat event pool)
+    archives = list(archives or ())
+    with phase(stats, "content"):
+        if trigram_index is not None:
+            before = len(file_list)
+            file_list = trigram_index.filter(file_list, keywords, mode_and)
+            if stats is not None:
+                stats.count("content.trigram_pruned", before - len(file_list))
+        matcher = KeywordMatcher(keywords)
+        found = []
+        total = len(file_list) + len(archives)
+        completed = 0
+    
+        if not total:
+            # Semua kandidat tersaring: tidak perlu executor
+            if callback: callback(0, 0)
+            return []
+        pool, owner = _search_pool(pool, backend, workers, cancel_event, matcher)
+        executor, task_matcher, ceiling, cancel = pool.get(total, matcher)
+        # max_workers hanya batas atas; jumlah task yang berjalan diatur tuner
+        tuner = ConcurrencyTuner(ceiling)
+        if not adaptive:
+            tuner.limit = tuner.ceiling
+        # Arsip (task paling lama) dijadwalkan lebih dulu supaya tidak jadi ekor
+        batches = itertools.chain(
+            (([a], True) for a in archives),
+            ((file_list[start:start + batch_size], False) for start in range(0, len(file_list), batch_size)))
+        check = _check_batch if stats is None else _check_batch_stats
+        busy = cpu = 0.0
+        started_at = time.perf_counter()
+
+        poll = SEARCH_CANCEL_POLL if cancel_event is not None else None
+        with owner:
+            pending = {}
+            while True:
+                # Backpressure: submit baru hanya kalau masih ada slot
+                while len(pending) < tuner.limit:
+                    batch, archive = next(batches, (None, False))
+                    if batch is None:
+                        break
+                    future = executor.submit(check, batch, mode_and, buffer_size, task_matcher, archive, cancel)
+                    pending[future] = (len(batch), time.monotonic(), archive)
+                if not pending:
+                    break
+                if cancel_event is not None and cancel_event.is_set():
+                    # Batch yang sedang berjalan berhenti di file berikutnya
+                    pool.cancel()
+                    for future in pending:
+                        future.cancel()
+                    raise SearchCancelled()
+
+                # Dengan cancel_event tidak menunggu batch lebih lama dari SEARCH_CANCEL_POLL
+                done, _ = concurrent.futures.wait(pending, timeout=poll, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    size, started, archive = pending.pop(future)
+                    matches = future.result()
+                    if stats is not None:
+                        matches, info = matches
+                        busy += info["busy"]
+                        cpu += info["cpu"]
+                        stats.count("content.archives" if archive else "content.files_opened", info["files"])
+                        stats.count("content.chars_read", info["chars"])
+                        stats.file_times(info["slowest"])
+                    found.extend(matches)
+                    # Hasil dikirim segera, tidak menunggu seluruh pencarian selesai
+                    if matches and on_match:
+                        on_match(matches)
+                    # Lama satu arsip tidak mencerminkan latensi per file, tidak ikut ke tuner
+                    if adaptive and not archive:
+                        tuner.record(size, time.monotonic() - started)
+                
+                    completed += size
+                    if callback:
+                        callback(completed, total)
+                
+        if callback: callback(total, total)
+        if stats is not None:
+            # Utilisasi = waktu sibuk worker / (durasi x jumlah worker maksimum)
+            wall = time.perf_counter() - started_at
+            stats.count("content.matches", len(found))
+            stats.set("content.backend", _backend_name(executor))
+            stats.set("content.workers", ceiling)
+            stats.set("content.final_concurrency", tuner.limit)
+            stats.set("content.worker_cpu_seconds", round(cpu, 3))
+            stats.set("content.worker_utilization", round(busy / (wall * ceiling), 3) if wall else 0.0)
+        return sorted(found)
+
+# --- RANKED SEARCH ---
+# Skor file = kemunculan kata kunci (per kata kunci dibatasi RANK_HIT_CAP dan
+# diskalakan log ke 0..1) + bonus kata kunci di nama file + bonus kebaruan.
+# Dua bonus terakhir sudah diketahui sebelum file dibuka, jadi tiap file punya
+# batas atas skor. File diperiksa urut dari batas atas terbesar; begitu batas
+# atas file berikutnya tidak bisa mengalahkan top-K, sisanya tidak dibuka.
+def _count_stream(f, matcher, mode_and, buffer_size, cap):
+    # Jumlah kemunculan per kata kunci (urutan matcher.keywords), berhenti begitu
+    # semuanya mencapai cap; None kalau file tidak cocok
+    counts = [0] * len(matcher)
+    ends = [0] * len(matcher)  # akhir kemunculan terakhir yang dihitung, posisi di data
+    overlap = matcher.max_len - 1
+    tail = ""
+    while True:
+        chunk = f.read(buffer_size)
+        if not chunk:
+            break
+        data = tail + chunk.lower()
+        for n, k in enumerate(matcher.keywords):
+            # Hanya kemunculan yang berakhir di potongan baru (yang seluruhnya di ekor sudah
+            # diperiksa) dan tidak menumpuk kemunculan terakhir, sama seperti str.count
+            start = max(ends[n], len(tail) - len(k) + 1)
+            while counts[n] < cap:
+                i = data.find(k, start)
+                if i < 0:
+                    break
+                counts[n] += 1
+                start = ends[n] = i + len(k)
+        if min(counts) >= cap:
+            break
+        tail = data[-overlap:] if overlap else ""
+        shift = len(data) - len(tail)
+        ends = [end - shift for end in ends]
+    return counts if (all(counts) if mode_and else any(counts)) else None
+
+def _rank_batch(paths, mode_and, buffer_size, cap, matcher=None, cancel=None):
+    # Hanya (path, counts) file yang cocok yang dikembalikan
+    matcher = matcher or _WORKER_MATCHER
+    results = []
+    for path in paths:
+        if _stopped(cancel):
+            break
+        try:
+            with open_text(path) as f:
+                counts = _count_stream(f, matcher, mode_and, buffer_size, cap)
+        except Exception:
+            continue
+        if counts is not None:
+            results.append((path, counts))
+    return results
+
+def search_ranked(keywords: list, file_list: list, mode_and: bool = True, top_k=RANK_TOP_K, callback=None,
+                  buffer_size=SEARCH_BUFFER_SIZE, trigram_index=None, backend="auto", workers=None,
+                  batch_size=SEARCH_BATCH_SIZE, adaptive=True, cancel_event=None, stats=None, now=None,
+                  pool=None):
+    # Seperti search_content, tapi mengembalikan top_k (skor, path) terbaik,
+    # urut dari skor tertinggi. file_list dari ScanResult.text_files() memakai
+    # mtime hasil scan; list path biasa di-stat satu per satu.
+    with phase(stats, "content"):
+        matcher = KeywordMatcher(keywords)
+        if not len(matcher) or top_k <= 0:
+            if callback:
+                callback(len(file_list), len(file_list))
+            return []
+        known = None
+        scan = getattr(file_list, "scan", None)
+        if scan is not None:
+            mtimes = scan.mtimes
+            known = {p: mtimes[i] / 1e9 for p, i in zip(file_list, file_list.ids)}
+            file_list = list(known)
+        if trigram_index is not None:
+            before = len(file_list)
+            file_list = trigram_index.filter(file_list, keywords, mode_and)
+            if stats is not None:
+                stats.count("content.trigram_pruned", before - len(file_list))
+
+        now = time.time() if now is None else now
+        words = matcher.keywords
+
+        def prior(path):
+            # Bagian skor yang tidak perlu membuka file
+            if known is not None:
+                mtime = known[path]
+            else:
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    mtime = 0.0
+            name = os.path.basename(path).lower()
+            bonus = RANK_NAME_BONUS * sum(k in name for k in words) / len(words)
+            return bonus + RANK_RECENCY_WEIGHT * 0.5 ** (max(0.0, now - mtime) / RANK_RECENCY_HALF_LIFE)
+
+        priors = {p: prior(p) for p in file_list}
+        order = sorted(priors, key=priors.__getitem__, reverse=True)
+        # Skor sama: file yang lebih dulu di order menang, jadi hasilnya sama
+        # persis dengan pencarian tanpa berhenti dini, apa pun urutan selesainya task
+        position = {p: n for n, p in enumerate(order)}
+        hit_max = float(len(words))
+        scale = math.log1p(RANK_HIT_CAP)
+        total = len(order)
+        completed = matched = 0
+        heap = []  # min-heap (skor, -posisi, path), paling banyak top_k
+
+        if not total:
+            # Semua kandidat tersaring: tidak perlu executor
+            if callback: callback(0, 0)
+            return []
+        pool, owner = _search_pool(pool, backend, workers, cancel_event, matcher)
+        executor, task_matcher, ceiling, cancel = pool.get(total, matcher)
+        tuner = ConcurrencyTuner(ceiling)
+        if not adaptive:
+            tuner.limit = tuner.ceiling
+        next_start = 0
+
+        poll = SEARCH_CANCEL_POLL if cancel_event is not None else None
+        with owner:
+            pending = {}
+            while True:
+                while len(pending) < tuner.limit and next_start < total:
+                    # Batas atas menurun sepanjang order: kalau file berikutnya pun
+                    # tidak bisa masuk top-K, semua sisanya juga tidak
+                    if len(heap) >= top_k and heap[0][0] >= hit_max + priors[order[next_start]]:
+                        if stats is not None:
+                            stats.count("content.rank_skipped", total - next_start)
+                        next_start = total
+                        break
+                    batch = order[next_start:next_start + batch_size]
+                    next_start += len(batch)
+                    future = executor.submit(_rank_batch, batch, mode_and, buffer_size, RANK_HIT_CAP, task_matcher,
+                                             cancel)
+                    pending[future] = (len(batch), time.monotonic())
+                if not pending:
+                    break
+                if cancel_event is not None and cancel_event.is_set():
+                    # Batch yang sedang berjalan berhenti di file berikutnya
+                    pool.cancel()
+                    for future in pending:
+                        future.cancel()
+                    raise SearchCancelled()
+
+                # Dengan cancel_event tidak menunggu batch lebih lama dari SEARCH_CANCEL_POLL
+                done, _ = concurrent.futures.wait(pending, timeout=poll, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    size, started = pending.pop(future)
+                    for path, counts in future.result():
+                        matched += 1
+                        hits = sum(math.log1p(min(c, RANK_HIT_CAP)) for c in counts) / scale
+                        item = (hits + priors[path], -position[path], path)
+                        if len(heap) < top_k:
+                            heapq.heappush(heap, item)
+                        elif item > heap[0]:
+                            heapq.heapreplace(heap, item)
+                    if adaptive:
+                        tuner.record(size, time.monotonic() - started)
+
+                    completed += size
+                    if callback:
+                        callback(completed, total)
+
+        if callback: callback(total, total)
+        if stats is not None:
+            stats.count("content.files_opened", completed)
+            stats.count("content.matches", matched)
+            stats.set("content.backend", _backend_name(executor))
+        return [(score, path) for score, _, path in sorted(heap, reverse=True)]
+
+def get_previews(path: str, keywords, context_lines: int = 1, max_snippets: int = 3):
+    # keywords boleh berupa list atau KeywordMatcher yang sudah dibuat search_content;
+    # path boleh berupa member arsip dari hasil search_content(archives=...)
+    matcher = keywords if isinstance(keywords, KeywordMatcher) else KeywordMatcher(keywords)
+    snippets = []
+    if not len(matcher):
+        return snippets
+
+    # File dibaca baris per baris: konteks sebelum disimpan di deque, konteks
+    # sesudah diisi ke snippet yang masih terbuka, lalu berhenti begitu cukup
+    before = collections.deque(maxlen=context_lines)
+    open_snippets = []  # [nomor baris, baris-baris, sisa konteks sesudah]
+    started = 0
+
+    def close(snippet):
+        snippets.append((snippet[0], [matcher.highlight(ln) for ln in snippet[1]]))
+
+    try:
+        with open_text(path) as f:
+            for i, raw in enumerate(f, 1):
+                line = raw.rstrip("\r\n")
+                for snippet in open_snippets:
+                    snippet[1].append(line)
+                    snippet[2] -= 1
+                while open_snippets and open_snippets[0][2] <= 0:
+                    close(open_snippets.pop(0))
+
+                if started < max_snippets and matcher.search(line.lower()):
+                    started += 1
+                    open_snippets.append([i, list(before) + [line], context_lines])
+                    if context_lines <= 0:
+                        close(open_snippets.pop())
+
+                if len(snippets) >= max_snippets:
+                    break
+                before.append(line)
+    except Exception:
+        return snippets
+
+    # Akhir file: snippet yang belum lengkap konteks sesudahnya tetap dipakai
+    for snippet in open_snippets:
+        close(snippet)
+    return snippets
@@ -0,0 +1,132 @@
+# Instrumentasi opsional. Fungsi backend menerima stats=None; tanpa objek Stats
+# tidak ada yang dicatat, dan jalur panas hanya membayar satu cek `is None`.
+# cpu dan profile=True (cProfile di dalam tiap phase) hanya mengukur thread
+# pemanggil: phase yang berjalan bersamaan di thread lain (mis. per root) tidak
+# saling membebankan CPU, dan kerja di worker terlihat lewat counter dan slowest.
+import collections
+import contextlib
+import heapq
+import json
+import threading
+import time
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def phase(stats, name):
+    # `with phase(stats, "scan"):` aman dipakai walau stats None
+    return _NO_PHASE if stats is None else stats.phase(name)
+
+
+class Stats:
+    def __init__(self, slowest=10, profile=False, trace=None):
+        self.phases = {}  # nama -> {"wall", "cpu", "calls"}
+        self.counters = collections.Counter()
+        self.values = {}
+        self.slowest_limit = slowest
+        self._slowest = []  # min-heap (detik, path), hanya N terlambat yang disimpan
+        self.profile = profile
+        self.profiles = {}  # nama phase -> cProfile.Profile
+        self._profiling = None
+        self.trace = trace  # trace(event, nama, data) untuk tracer eksternal
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if self.trace:
+            self.trace("start", name, None)
+        profiler = None
+        if self.profile:
+            # Satu profiler aktif sekaligus: phase bersarang ikut tercatat di profil
+            # phase terluar, phase yang bersamaan di thread lain tidak diprofil
+            import cProfile
+            with self._lock:
+                if self._profiling is None:
+                    profiler = self._profiling = self.profiles.setdefault(name, cProfile.Profile())
+            if profiler is not None:
+                profiler.enable()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield self
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            if profiler is not None:
+                profiler.disable()
+                with self._lock:
+                    self._profiling = None
+            with self._lock:
+                entry = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+                entry["wall"] += wall
+                entry["cpu"] += cpu
+                entry["calls"] += 1
+            if self.trace:
+                self.trace("end", name, {"wall": wall, "cpu": cpu})
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def set(self, name, value):
+        self.values[name] = value
+
+    def file_times(self, items):
+        # items: iterable (detik, path)
+        with self._lock:
+            for item in items:
+                if len(self._slowest) < self.slowest_limit:
+                    heapq.heappush(self._slowest, item)
+                elif item > self._slowest[0]:
+                    heapq.heapreplace(self._slowest, item)
+
+    @property
+    def slowest(self):
+        return sorted(self._slowest, reverse=True)
+
+    def to_dict(self):
+        return {
+            "phases": {name: {k: round(v, 6) if isinstance(v, float) else v for k, v in p.items()}
+                       for name, p in self.phases.items()},
+            "counters": dict(self.counters),
+            "values": self.values,
+            "slowest": [{"path": path, "seconds": round(seconds, 6)} for seconds, path in self.slowest],
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    def report(self):
+        lines = [f"{'phase':<16}{'wall':>9}{'cpu':>9}"]
+        for name, p in self.phases.items():
+            calls = f"  x{p['calls']}" if p["calls"] > 1 else ""
+            lines.append(f"{name:<16}{p['wall']:>8.3f}s{p['cpu']:>8.3f}s{calls}")
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{name}: {value:,}" for name, value in sorted(self.counters.items()))
+        if self.values:
+            lines.append("")
+            lines.extend(f"{name}: {value}" for name, value in sorted(self.values.items()))
+        if self._slowest:
+            lines.append("")
+            lines.append("File paling lambat:")
+            lines.extend(f"  {seconds * 1000:8.1f} ms  {path}" for seconds, path in self.slowest)
+        return "\n".join(lines)
+
+    def profile_report(self, limit=20, sort="cumulative"):
+        import io
+        import pstats
+        out = io.StringIO()
+        for name, profiler in self.profiles.items():
+            out.write(f"=== {name} ===\n")
+            pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump_profile(self, path):
+        # Semua phase digabung jadi satu file .prof (bisa dibuka snakeviz/pstats)
+        import pstats
+        profilers = list(self.profiles.values())
+        if not profilers:
+            return
+        merged = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            merged.add(profiler)
+        merged.dump_stats(path)
@@ -0,0 +1,174 @@
+import array
+import concurrent.futures
+import os
+import threading
+import zlib
+
+from .common import SCAN_WORKERS, SEARCH_BUFFER_SIZE, TRIGRAM_INDEX_PATH, _check_cancel
+from .index import FileIndex
+from .stats import phase
+
+# --- TRIGRAM CONTENT INDEX ---
+# Opsional: posting list trigram (byte UTF-8 dari teks lowercase) per file teks.
+# Query cukup memverifikasi file kandidat hasil irisan posting list.
+def _trigrams(data: bytes):
+    return {int.from_bytes(data[i:i + 3], "big") for i in range(len(data) - 2)}
+
+def _file_trigrams(path, buffer_size=SEARCH_BUFFER_SIZE):
+    grams = set()
+    tail = b""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            while True:
+                chunk = f.read(buffer_size)
+                if not chunk:
+                    break
+                data = tail + chunk.lower().encode("utf-8")
+                grams.update(data[i:i + 3] for i in range(len(data) - 2))
+                tail = data[-2:]
+    except Exception:
+        pass
+    return sorted(int.from_bytes(g, "big") for g in grams)
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+class TrigramIndex:
+    def __init__(self, db_path=TRIGRAM_INDEX_PATH):
+        self.db_path = db_path
+        self._ids = None  # path -> doc id, dimuat sekali lalu dijaga oleh update()
+        self._lock = threading.Lock()  # update() per root bisa berjalan bersamaan
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE,
+                    size INTEGER,
+                    mtime INTEGER,
+                    grams BLOB
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    gram INTEGER,
+                    doc INTEGER,
+                    PRIMARY KEY (gram, doc)
+                ) WITHOUT ROWID;
+            """)
+
+    connect = FileIndex.connect
+
+    def _doc_ids(self, conn):
+        # Dipanggil dengan _lock
+        if self._ids is None:
+            self._ids = {path: doc for doc, path in conn.execute("SELECT id, path FROM docs")}
+        return self._ids
+
+    def _remove(self, conn, doc):
+        row = conn.execute("SELECT grams FROM docs WHERE id = ?", (doc,)).fetchone()
+        if row and row[0]:
+            grams = array.array("I")
+            grams.frombytes(zlib.decompress(row[0]))
+            conn.executemany("DELETE FROM postings WHERE gram = ? AND doc = ?", ((g, doc) for g in grams))
+        conn.execute("DELETE FROM docs WHERE id = ?", (doc,))
+
+    def update(self, scan, callback=None, workers=SCAN_WORKERS, cancel_event=None, stats=None, ids=None):
+        # Sinkronkan index dengan file teks hasil scan: yang hilang/berubah
+        # size atau mtime dibuang, yang baru/berubah diindeks ulang. Size/mtime
+        # dari stat baru, bukan dari scan: file yang diubah di tempat setelah scan
+        # harus diindeks ulang, kalau tidak filter() membuangnya dari kandidat.
+        # ids: hanya file ini (kandidat hasil filter Query) yang diklasifikasi
+        # dan disinkronkan; entri file lain, termasuk yang sudah dihapus,
+        # menunggu update tanpa ids
+        targets = scan.text_files(workers=workers, cancel_event=cancel_event, stats=stats, ids=ids)
+        paths = list(targets)
+        lo, hi = scan.root.rstrip(os.sep) + os.sep, scan.root.rstrip(os.sep) + chr(ord(os.sep) + 1)
+        with self.connect() as conn, phase(stats, "trigram_update"):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                current = {p: meta for p, meta in zip(paths, executor.map(_stat, paths)) if meta}
+            _check_cancel(cancel_event)
+            todo = []
+            stored = {path: (doc, size, mtime) for doc, path, size, mtime in conn.execute(
+                "SELECT id, path, size, mtime FROM docs WHERE path >= ? AND path < ?", (lo, hi))}
+            if ids is not None:
+                stored = {p: stored[p] for p in paths if p in stored}
+            stale = [(path, doc) for path, (doc, size, mtime_ns) in stored.items()
+                     if current.get(path) != (size, mtime_ns)]
+            for path, doc in stale:
+                self._remove(conn, doc)
+            with self._lock:
+                known = self._doc_ids(conn)
+                for path, _ in stale:
+                    known.pop(path, None)
+            for path, meta in current.items():
+                if path not in stored or stored[path][1:] != meta:
+                    todo.append((path,) + meta)
+
+            total = len(todo)
+            done = 0
+            if stats is not None:
+                stats.count("trigram.indexed", total)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                for start in range(0, total, 256):
+                    _check_cancel(cancel_event)
+                    block = todo[start:start + 256]
+                    added = {}
+                    for (path, size, mtime_ns), grams in zip(block, executor.map(_file_trigrams, (b[0] for b in block))):
+                        blob = zlib.compress(array.array("I", grams).tobytes())
+                        cur = conn.execute("INSERT INTO docs (path, size, mtime, grams) VALUES (?, ?, ?, ?)",
+                                           (path, size, mtime_ns, blob))
+                        added[path] = cur.lastrowid
+                        conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)",
+                                         ((g, cur.lastrowid) for g in grams))
+                    conn.commit()
+                    with self._lock:
+                        known.update(added)
+                    done += len(block)
+                    if callback: callback(done, total)
+
+    def _docs_with(self, conn, grams):
+        docs = None
+        for gram in sorted(grams):
+            if docs is not None and len(docs) <= 5000:
+                # Kandidat sudah sedikit: cek keanggotaan saja, tidak ambil posting list penuh
+                ids = list(docs)
+                docs = set()
+                for start in range(0, len(ids), 500):
+                    part = ids[start:start + 500]
+                    docs.update(r[0] for r in conn.execute(
+                        "SELECT doc FROM postings WHERE gram = ? AND doc IN (%s)" % ",".join("?" * len(part)),
+                        [gram] + part))
+            else:
+                posting = {r[0] for r in conn.execute("SELECT doc FROM postings WHERE gram = ?", (gram,))}
+                docs = posting if docs is None else docs & posting
+            if not docs:
+                break
+        return docs
+
+    def filter(self, file_list, keywords, mode_and=True):
+        # Kembalikan file_list yang mungkin cocok; file yang belum terindeks tetap ikut
+        per_keyword = [_trigrams(k.lower().encode("utf-8")) for k in keywords if k]
+        if mode_and:
+            grams = set().union(*per_keyword)
+            if not grams:
+                return file_list
+        elif not per_keyword or not all(per_keyword):
+            # OR dengan kata kunci < 3 byte tidak bisa dipersempit
+            return file_list
+
+        with self.connect() as conn:
+            with self._lock:
+                ids = self._doc_ids(conn)
+                docs = [ids.get(p) for p in file_list]
+            if mode_and:
+                candidates = self._docs_with(conn, grams)
+            else:
+                candidates = set()
+                for grams in per_keyword:
+                    candidates |= self._docs_with(conn, grams)
+        return [p for p, doc in zip(file_list, docs) if doc is None or doc in candidates]
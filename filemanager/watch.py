@@ -0,0 +1,288 @@
+import collections
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import sqlite3
+import struct
+import sys
+import threading
+import time
+
+from .common import WATCH_DEBOUNCE, WATCH_FULL_POLL_EVERY, WATCH_POLL_INTERVAL, invalidate_file_caches
+from .index import FileIndex
+from .scan import _list_directory, _read_directory
+
+# --- LIVE WATCHER ---
+# Menjaga ScanResult (dan FileIndex) tetap sesuai isi disk tanpa scan ulang.
+# Backend hanya melaporkan folder mana yang "kotor"; folder itu lalu dibaca ulang
+# dengan _read_directory dan selisihnya diterapkan, jadi create/delete/modify/move
+# semuanya ditangani dengan jalur yang sama seperti scan biasa.
+class _InotifyBackend:
+    name = "inotify"
+    # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    # | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONTFOLLOW
+    MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800 | 0x01000000 | 0x02000000
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify hanya ada di Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(0o2000000)  # IN_CLOEXEC
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._paths = {}  # folder -> wd
+        self._wds = {}    # wd -> folder
+
+    def add(self, dirpath):
+        if dirpath in self._paths:
+            return
+        wd = self._add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return  # folder sudah hilang atau tidak bisa dibaca
+            # mis. ENOSPC: batas fs.inotify.max_user_watches tercapai
+            raise OSError(err, os.strerror(err), dirpath)
+        self._paths[dirpath] = wd
+        self._wds[wd] = dirpath
+
+    def remove(self, dirpath):
+        wd = self._paths.pop(dirpath, None)
+        if wd is not None:
+            self._wds.pop(wd, None)
+            self._rm_watch(self.fd, wd)
+
+    def wait(self, stop, timeout=0.5):
+        # Set folder yang berubah, atau None kalau antrean kernel penuh (semua dianggap berubah)
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        data = os.read(self.fd, 64 * 1024)
+        dirty = set()
+        pos = 0
+        while pos + 16 <= len(data):
+            wd, mask, _cookie, length = struct.unpack_from("iIII", data, pos)
+            pos += 16 + length
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            dirpath = self._wds.get(wd)
+            if dirpath is None:
+                continue
+            if mask & self.IN_IGNORED:
+                # Watch dilepas kernel (folder dihapus); folder induk yang akan membereskannya
+                self._wds.pop(wd, None)
+                if self._paths.get(dirpath) == wd:
+                    del self._paths[dirpath]
+            dirty.add(dirpath)
+        return dirty
+
+    def drain(self):
+        return self.wait(None, 0)
+
+    def close(self):
+        os.close(self.fd)
+
+class _PollingBackend:
+    name = "polling"
+
+    def __init__(self, interval=WATCH_POLL_INTERVAL):
+        self.interval = interval
+        self._mtimes = {}
+        self._rounds = 0
+
+    def add(self, dirpath):
+        # Dipanggil lagi setelah folder dibaca ulang untuk mencatat mtime terbaru
+        try:
+            self._mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            self._mtimes[dirpath] = None
+
+    def remove(self, dirpath):
+        self._mtimes.pop(dirpath, None)
+
+    def wait(self, stop):
+        if stop.wait(self.interval):
+            return set()
+        self._rounds += 1
+        if self._rounds % WATCH_FULL_POLL_EVERY == 0:
+            # Isi file bisa berubah tanpa mengubah mtime folder: sesekali baca semua
+            return None
+        dirty = set()
+        for dirpath, mtime in list(self._mtimes.items()):
+            try:
+                current = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                dirty.add(dirpath)
+        return dirty
+
+    def drain(self):
+        return set()
+
+    def close(self):
+        pass
+
+def _walk_dirs(root):
+    # Semua folder di bawah root (symlink tidak diikuti, sama seperti scan)
+    found = []
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        found.append(dirpath)
+        try:
+            subdirs, _ = _list_directory(dirpath)
+        except OSError:
+            continue
+        stack.extend(subdirs)
+    return found
+
+class DirectoryWatcher:
+    # on_change(paths) dipanggil dari thread watcher setelah satu batch diterapkan
+    def __init__(self, scan, index=None, on_change=None, use_inotify=True, interval=WATCH_POLL_INTERVAL):
+        self.scan = scan
+        self.index = index
+        self.on_change = on_change
+        self.use_inotify = use_inotify
+        self.interval = interval
+        self.backend = None
+        self._subdirs = {}  # folder -> set(subfolder) yang sedang dipantau
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _open_backend(self, dirs):
+        if self.use_inotify:
+            try:
+                backend = _InotifyBackend()
+            except (OSError, AttributeError):
+                backend = None
+            if backend is not None:
+                try:
+                    for dirpath in dirs:
+                        backend.add(dirpath)
+                    return backend
+                except OSError as e:
+                    print("inotify tidak bisa dipakai, beralih ke polling:", e, file=sys.stderr)
+                    backend.close()
+        backend = _PollingBackend(self.interval)
+        for dirpath in dirs:
+            backend.add(dirpath)
+        return backend
+
+    def _run(self):
+        # Daftar folder dari scan (atau watcher sebelumnya), tanpa menelusuri ulang
+        dirs = list(self.scan.walked_dirs) or _walk_dirs(self.scan.root)
+        for dirpath in dirs:
+            self._subdirs[dirpath] = set()
+        for dirpath in dirs:
+            parent = os.path.dirname(dirpath)
+            if dirpath != self.scan.root and parent in self._subdirs:
+                self._subdirs[parent].add(dirpath)
+        self.backend = self._open_backend(dirs)
+        try:
+            # Watch sudah terpasang: perubahan sejak scan (atau sejak watcher
+            # sebelumnya berhenti) disusulkan dengan membaca ulang semua folder sekali
+            changed = self.apply(set(self._subdirs))
+        except (OSError, sqlite3.Error) as e:
+            print("Watcher gagal menyinkronkan folder:", e, file=sys.stderr)
+            self.backend.close()
+            return
+        if changed and self.on_change:
+            self.on_change(changed)
+        # Mulai sekarang perubahan menaikkan generation (QueryCache boleh dipakai)
+        self.scan.set_watched(True)
+        try:
+            while not self._stop.is_set():
+                dirty = self.backend.wait(self._stop)
+                if dirty is not None and not dirty:
+                    continue
+                # Event yang datang berdekatan (mis. copy banyak file) digabung dulu
+                time.sleep(WATCH_DEBOUNCE)
+                more = self.backend.drain()
+                if dirty is None or more is None:
+                    dirty = set(self._subdirs)
+                else:
+                    dirty |= more
+                if self._stop.is_set():
+                    break
+                try:
+                    changed = self.apply(dirty)
+                except (OSError, sqlite3.Error) as e:
+                    print("Watcher gagal menerapkan perubahan:", e, file=sys.stderr)
+                    continue
+                if changed and self.on_change:
+                    self.on_change(changed)
+        finally:
+            self.scan.set_watched(False)
+            # Watcher berikutnya untuk scan ini mulai dari daftar folder terbaru
+            self.scan.walked_dirs = list(self._subdirs)
+            self.backend.close()
+
+    def _forget(self, dirpath):
+        stack = [dirpath]
+        while stack:
+            d = stack.pop()
+            stack.extend(self._subdirs.pop(d, ()))
+            self.backend.remove(d)
+
+    def _drop(self, dirpath, conn):
+        self._forget(dirpath)
+        if conn is not None:
+            FileIndex.drop_tree(conn, dirpath)
+        return self.scan.drop_tree(dirpath)
+
+    def apply(self, dirty):
+        changed = []
+        root = self.scan.root
+        queue = collections.deque(sorted(dirty))
+        seen = set()
+        with contextlib.ExitStack() as stack:
+            conn = stack.enter_context(self.index.connect()) if self.index is not None else None
+            while queue:
+                dirpath = queue.popleft()
+                if dirpath in seen or dirpath not in self._subdirs:
+                    continue  # sudah diproses, atau ikut terhapus bersama folder induknya
+                seen.add(dirpath)
+                # Watch dipasang sebelum folder dibaca supaya perubahan di antaranya tidak hilang
+                self.backend.add(dirpath)
+                result = _read_directory(dirpath, None, self.scan.entries(dirpath))
+                if result is None:
+                    changed += self._drop(dirpath, conn)
+                    continue
+
+                dir_mtime, subdirs, entries = result
+                old_subdirs = self._subdirs[dirpath]
+                for gone in old_subdirs - set(subdirs):
+                    changed += self._drop(gone, conn)
+                for sub in set(subdirs) - old_subdirs:
+                    # Folder baru (dibuat atau dipindah ke sini): pantau lalu baca isinya
+                    self._subdirs[sub] = set()
+                    queue.append(sub)
+                self._subdirs[dirpath] = set(subdirs)
+                changed += self.scan.apply_dir(dirpath, entries)
+
+                if conn is not None:
+                    parent = None if dirpath == root else os.path.dirname(dirpath)
+                    FileIndex.store_dir(conn, dirpath, parent, dir_mtime, entries, subdirs,
+                                        FileIndex.files(conn, dirpath), FileIndex.subdirs(conn, dirpath))
+            if changed and conn is not None:
+                FileIndex.drop_hashes(conn, changed)
+        invalidate_file_caches(changed)
+        return changed
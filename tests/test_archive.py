@@ -0,0 +1,70 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from filemanager import Query, get_previews, scan_roots, search_content, search_query, split_member_path
+from filemanager.archive import iter_text_members
+
+
+def _zip(path):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("docs/notes.txt", "first line\nthe Needle is here\nlast line\n")
+        zf.writestr("docs/other.txt", "nothing to see\n")
+        zf.writestr("logo.png", "needle in a binary extension")
+        zf.writestr("blob.dat", b"needle\x00\x01")
+        zf.writestr("docs/", "")
+    return str(path)
+
+
+def _tar(path, mode):
+    with tarfile.open(path, mode) as tf:
+        for name, text in (("a/readme.md", "needle and haystack\n"), ("a/b.txt", "haystack\n")):
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.mark.parametrize("name, mode", [("b.tar", "w"), ("b.tar.gz", "w:gz"), ("b.tar.bz2", "w:bz2"),
+                                        ("b.tar.xz", "w:xz")])
+def test_search_finds_members_of_zip_and_tar_archives(tmp_path, name, mode):
+    zip_path = _zip(tmp_path / "backup.zip")
+    tar_path = _tar(tmp_path / name, mode)
+    plain = tmp_path / "plain.txt"
+    plain.write_text("needle\n")
+
+    found = search_content(["needle"], [str(plain)], archives=[zip_path, tar_path], backend="threads")
+    # Member biner (ekstensi atau isi) dan folder dilewati
+    assert found == sorted([str(plain), zip_path + "!/docs/notes.txt", tar_path + "!/a/readme.md"])
+    assert search_content(["needle", "haystack"], [], archives=[tar_path], backend="threads") == \
+        [tar_path + "!/a/readme.md"]
+    assert split_member_path(tar_path + "!/a/readme.md") == (tar_path, "a/readme.md")
+
+
+def test_previews_open_archive_members(tmp_path):
+    zip_path = _zip(tmp_path / "backup.zip")
+    tar_path = _tar(tmp_path / "b.tar.gz", "w:gz")
+    assert get_previews(zip_path + "!/docs/notes.txt", ["needle"]) == \
+        [(2, ["first line", "the --> Needle <-- is here", "last line"])]
+    assert get_previews(tar_path + "!/a/readme.md", ["haystack"], context_lines=0) == \
+        [(1, ["needle and --> haystack <--"])]
+
+
+def test_members_over_the_size_limit_are_skipped(tmp_path):
+    zip_path = _zip(tmp_path / "backup.zip")
+    assert [name for name, _ in iter_text_members(zip_path)] == ["docs/notes.txt", "docs/other.txt"]
+    assert [name for name, _ in iter_text_members(zip_path, max_size=20)] == ["docs/other.txt"]
+
+
+def test_query_searches_archives_found_by_the_scan_only_when_asked(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    zip_path = _zip(root / "backup.zip")
+    scans = scan_roots([str(root)])
+    found, _ = search_query(scans, Query(content=["needle"]), archives=True, backend="threads")
+    assert found == [zip_path + "!/docs/notes.txt"]
+    found, _ = search_query(scans, Query(content=["needle"]), backend="threads")
+    assert found == []
@@ -0,0 +1,34 @@
+import json
+import os
+
+from filemanager.cli import main
+
+
+def _root(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "a.txt").write_text("alpha beta\n")
+    return str(root)
+
+
+def test_trigram_index_follows_index_path(tmp_path, capsys):
+    root = _root(tmp_path)
+    index = str(tmp_path / "data" / "index.sqlite3")
+    assert main(["search", root, "-c", "alpha", "--trigram", "--index", index]) == 0
+    assert capsys.readouterr().out.split() == [os.path.join(root, "a.txt")]
+    assert os.path.exists(str(tmp_path / "data" / "index.trigrams.sqlite3"))
+
+
+def test_trigram_refused_without_index(tmp_path, capsys):
+    root = _root(tmp_path)
+    assert main(["search", root, "-c", "alpha", "--trigram", "--no-index"]) == 1
+    assert "--no-index" in capsys.readouterr().err
+
+
+def test_search_workers_option_sizes_the_search_pool(tmp_path, capsys):
+    root = _root(tmp_path)
+    assert main(["--stats", "--format", "json", "search", root, "-c", "alpha", "--no-index",
+                 "--backend", "threads", "--search-workers", "3"]) == 0
+    doc = json.loads(capsys.readouterr().out)
+    assert doc["stats"]["values"]["content.workers"] == 3
+    assert main(["search", root, "-c", "alpha", "--search-workers", "0"]) == 1
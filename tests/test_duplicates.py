@@ -0,0 +1,49 @@
+import os
+
+from filemanager import FileIndex, Stats, common, find_duplicates, scan_directory
+
+
+def _write(path, text, mtime_ns=None):
+    with open(path, "w") as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_edited_file_is_not_reported_with_stale_hash(tmp_path):
+    index = FileIndex(str(tmp_path / "index.sqlite3"))
+    root = tmp_path / "root"
+    root.mkdir()
+    a, b = str(root / "a.txt"), str(root / "b.txt")
+    _write(a, "hello world!\n")
+    _write(b, "hello world!\n")
+    scan = scan_directory(str(root), index=index)
+    assert find_duplicates(scan) == [(13, [a, b])]
+
+    # Diubah setelah scan, tanpa scan ulang; panjang sama, mtime berbeda
+    _write(b, "HELLO WORLD!\n", os.stat(b).st_mtime_ns + 10**9)
+    assert find_duplicates(scan) == []
+
+    # Ukuran berubah: tidak lagi satu kelompok ukuran
+    _write(b, "hello world!\n" + "x" * 28)
+    assert find_duplicates(scan_directory(str(root), index=index)) == []
+
+
+def test_hash_cache_is_bounded_and_unused_with_index(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    root.mkdir()
+    for n in range(6):
+        _write(str(root / f"f{n}.txt"), "same content\n")
+    monkeypatch.setattr(common, "_HASH_CACHE", common.collections.OrderedDict())
+    monkeypatch.setattr(common, "HASH_CACHE_SIZE", 4)
+
+    scan = scan_directory(str(root))
+    assert len(find_duplicates(scan)[0][1]) == 6
+    assert len(common._HASH_CACHE) == 4
+    stats = Stats()
+    find_duplicates(scan, stats=stats)
+    assert stats.counters["hash_partial.cached"] == 4
+
+    common._HASH_CACHE.clear()
+    find_duplicates(scan_directory(str(root), index=FileIndex(str(tmp_path / "index.sqlite3"))))
+    assert len(common._HASH_CACHE) == 0
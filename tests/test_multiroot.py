@@ -0,0 +1,44 @@
+from filemanager import Query, QueryCache, scan_roots, search_query
+from filemanager import search as search_module
+
+
+def _roots(tmp_path):
+    roots = []
+    for n in range(3):
+        root = tmp_path / f"root{n}"
+        root.mkdir()
+        (root / f"notes{n}.txt").write_text("alpha beta\n")
+        (root / f"other{n}.txt").write_text("gamma\n")
+        roots.append(str(root))
+    return roots
+
+
+def test_one_executor_shared_by_all_roots(tmp_path, monkeypatch):
+    scans = scan_roots(_roots(tmp_path))
+    made = []
+    real = search_module._make_search_executor
+
+    def counting(*args):
+        made.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(search_module, "_make_search_executor", counting)
+    found, ranked = search_query(scans, Query(content=["alpha"]), backend="threads")
+    assert [p.rsplit("/", 1)[1] for p in found] == ["notes0.txt", "notes1.txt", "notes2.txt"]
+    assert ranked == [] and len(made) == 1
+
+    made.clear()
+    found, ranked = search_query(scans, Query(content=["alpha"]), top_k=2, backend="threads")
+    assert found == [] and len(ranked) == 2 and len(made) == 1
+
+
+def test_pipeline_filters_before_content_and_uses_cache(tmp_path):
+    scans = scan_roots(_roots(tmp_path))
+    cache = QueryCache(live_only=False)
+    query = Query(content=["alpha"], glob="notes1*")
+    emitted = []
+    found, _ = search_query(scans, query, on_match=emitted.extend, query_cache=cache, backend="threads")
+    assert found == sorted(emitted) and [p.rsplit("/", 1)[1] for p in found] == ["notes1.txt"]
+
+    found_again, _ = search_query(scans, query, query_cache=cache, backend="threads")
+    assert found_again == found and cache.hits == 3
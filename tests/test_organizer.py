@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from filemanager import organizer
+from filemanager.common import ORGANIZE_JOURNAL
+from filemanager.organizer import MoveJournal, organize, resume_organize, undo_organize
+
+
+def _make_files(folder, count):
+    names = [f"catatan{i:02}.txt" for i in range(count)]
+    for name in names:
+        with open(os.path.join(folder, name), "w") as f:
+            f.write(name)
+    return names
+
+
+def _crashed_organize(folder, monkeypatch):
+    # Crash sebelum batch "done" sempat di-flush: journal hanya berisi rencana
+    monkeypatch.setattr(MoveJournal, "flush", lambda self: None)
+    monkeypatch.setattr(MoveJournal, "finish", lambda self: None)
+    organize(str(folder), "y", "n")
+    monkeypatch.undo()
+
+
+def test_undo_after_crash_restores_unflushed_moves(tmp_path, monkeypatch):
+    names = _make_files(tmp_path, 20)
+    _crashed_organize(tmp_path, monkeypatch)
+    assert not any((tmp_path / n).exists() for n in names)
+
+    restored = undo_organize(str(tmp_path))
+
+    assert len(restored) == 20
+    assert all((tmp_path / n).read_text() == n for n in names)
+    assert not (tmp_path / "ORGANIZED FILES").exists()
+    assert not (tmp_path / ORGANIZE_JOURNAL).exists()
+
+
+def test_undo_keeps_journal_when_a_move_cannot_be_restored(tmp_path, monkeypatch):
+    names = _make_files(tmp_path, 3)
+    _crashed_organize(tmp_path, monkeypatch)
+    # File hasil rapikan hilang: asalnya tidak bisa dikembalikan, journal harus tetap ada
+    os.remove(tmp_path / "ORGANIZED FILES" / "Dokumen" / names[0])
+
+    with pytest.raises(OSError):
+        undo_organize(str(tmp_path))
+
+    assert all((tmp_path / n).exists() for n in names[1:])
+    assert (tmp_path / ORGANIZE_JOURNAL).exists()
+
+
+def test_resume_after_crash_finishes_remaining_moves(tmp_path, monkeypatch):
+    names = _make_files(tmp_path, 10)
+    real_move = organizer._move_file
+    moved = []
+
+    def crash_after_five(src, dst):
+        if len(moved) >= 5:
+            raise KeyboardInterrupt
+        real_move(src, dst)
+        moved.append(src)
+
+    monkeypatch.setattr(organizer, "_move_file", crash_after_five)
+    monkeypatch.setattr(MoveJournal, "flush", lambda self: None)
+    with pytest.raises(KeyboardInterrupt):
+        organize(str(tmp_path), "y", "n", workers=1)
+    monkeypatch.undo()
+
+    resume_organize(str(tmp_path))
+
+    target = tmp_path / "ORGANIZED FILES" / "Dokumen"
+    assert sorted(os.listdir(target)) == names
+    assert MoveJournal.load(str(tmp_path)).finished
+
+
+def test_organize_never_overwrites_existing_destination(tmp_path):
+    target = tmp_path / "ORGANIZED FILES" / "Dokumen"
+    target.mkdir(parents=True)
+    (target / "a.txt").write_text("lama")
+    (tmp_path / "a.txt").write_text("baru")
+
+    moves = organize(str(tmp_path), "y", "n")
+
+    assert (target / "a.txt").read_text() == "lama"
+    assert (target / "a (1).txt").read_text() == "baru"
+    assert [os.path.basename(m.dst) for m in moves] == ["a (1).txt"]
+
+    undo_organize(str(tmp_path))
+    assert (tmp_path / "a.txt").read_text() == "baru"
+    assert (target / "a.txt").read_text() == "lama"
+
+
+def test_move_fails_instead_of_clobbering(tmp_path):
+    (tmp_path / "src.txt").write_text("src")
+    (tmp_path / "dst.txt").write_text("dst")
+
+    with pytest.raises(FileExistsError):
+        organizer._move_file(str(tmp_path / "src.txt"), str(tmp_path / "dst.txt"))
+
+    assert (tmp_path / "src.txt").read_text() == "src"
+    assert (tmp_path / "dst.txt").read_text() == "dst"
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from filemanager import Query, Stats, parse_size, parse_time, scan_directory, scan_roots, search_query
+
+NOW = 1_700_000_000
+DAY = 86400
+
+
+def _scan(tmp_path):
+    # nama -> (ukuran, umur dalam hari)
+    files = {
+        "logs/app.log": (4000, 1), "logs/old.log": (200, 30), "logs/big.log": (6 * 1024 ** 2, 2),
+        "docs/report.txt": (100, 3), "docs/Report-2024.md": (50, 10), "img/photo.png": (3000, 1),
+        "src/main.py": (700, 5),
+    }
+    root = tmp_path / "root"
+    for rel, (size, age) in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x" * size)
+        os.utime(path, (NOW - age * DAY, NOW - age * DAY))
+    return scan_directory(str(root)), str(root)
+
+
+def _names(query, scan, root):
+    return sorted(os.path.relpath(p, root) for p in query.paths(scan))
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({"min_size": "1K"}, ["img/photo.png", "logs/app.log", "logs/big.log"]),
+    ({"max_size": "100"}, ["docs/Report-2024.md", "docs/report.txt"]),
+    ({"min_size": 100, "max_size": "5MB"}, ["docs/report.txt", "img/photo.png", "logs/app.log", "logs/old.log",
+                                            "src/main.py"]),
+    ({"modified_after": NOW - 2.5 * DAY}, ["img/photo.png", "logs/app.log", "logs/big.log"]),
+    ({"modified_before": NOW - 7 * DAY}, ["docs/Report-2024.md", "logs/old.log"]),
+    ({"categories": "Gambar"}, ["img/photo.png"]),
+    ({"categories": ["Dokumen", "Lainnya"]}, ["docs/Report-2024.md", "docs/report.txt", "logs/app.log",
+                                             "logs/big.log", "logs/old.log"]),
+    ({"glob": "*.LOG"}, ["logs/app.log", "logs/big.log", "logs/old.log"]),
+    ({"glob": "*/docs/*"}, ["docs/Report-2024.md", "docs/report.txt"]),
+    ({"regex": r"^report\b"}, ["docs/Report-2024.md", "docs/report.txt"]),
+    ({"glob": "*.log", "max_size": "5M", "modified_after": NOW - 7 * DAY}, ["logs/app.log"]),
+])
+def test_each_filter_selects_the_expected_files(tmp_path, kwargs, expected):
+    scan, root = _scan(tmp_path)
+    assert _names(Query(**kwargs), scan, root) == expected
+
+
+def test_content_stage_only_opens_filtered_candidates(tmp_path):
+    scan, root = _scan(tmp_path)
+    stats = Stats()
+    query = Query(content=["x"], glob="*.log", max_size="5M")
+    found, _ = search_query(scan_roots([root]), query, backend="threads", stats=stats)
+    assert sorted(os.path.relpath(p, root) for p in found) == ["logs/app.log", "logs/old.log"]
+    assert stats.counters["content.files_opened"] == 2
+    assert stats.counters["filter.rejected"] == len(scan) - 2
+
+
+def test_parsers_and_invalid_filters():
+    assert parse_size("10K") == 10240 and parse_size("1.5mb") == 1572864 and parse_size(7) == 7
+    minute = NOW - NOW % 60
+    assert parse_time("2d", now=minute + 59) == minute - 2 * DAY
+    assert parse_time("2024-05-01") == parse_time("2024-05-01T00:00")
+    for kwargs in ({"min_size": "10 parsecs"}, {"modified_after": "yesterday"}, {"categories": "Musik?"},
+                   {"regex": "("}):
+        with pytest.raises(ValueError):
+            Query(**kwargs)
+    assert Query().is_empty() and not Query(glob="*.txt").is_empty()
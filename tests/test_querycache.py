@@ -0,0 +1,33 @@
+from filemanager import QueryCache, scan_directory
+
+
+def _setup(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    path = root / "a.txt"
+    path.write_text("alpha beta\n")
+    scan = scan_directory(str(root))
+    return scan, path
+
+
+def test_cache_not_used_without_watcher(tmp_path):
+    scan, path = _setup(tmp_path)
+    cache = QueryCache()
+    files = scan.text_files()
+    assert cache.search(scan, ["alpha"], files, backend="threads") == [str(path)]
+
+    # Diubah di tempat; tanpa watcher generation tidak naik
+    path.write_text("beta only\n")
+
+    assert cache.search(scan, ["alpha"], files, backend="threads") == []
+    assert cache.hits == 0 and len(cache) == 0
+
+
+def test_cache_used_while_watched_or_when_not_live_only(tmp_path):
+    scan, path = _setup(tmp_path)
+    files = scan.text_files()
+    for cache in (QueryCache(live_only=False), QueryCache()):
+        scan.watchers = 0 if not cache.live_only else 1
+        assert cache.search(scan, ["alpha"], files, backend="threads") == [str(path)]
+        assert cache.search(scan, ["alpha"], files, backend="threads") == [str(path)]
+        assert cache.hits == 1
@@ -0,0 +1,56 @@
+import tkinter as tk
+
+import pytest
+
+ctk = pytest.importorskip("customtkinter")
+
+from File_Manager import VirtualResultList  # noqa: E402
+
+
+@pytest.fixture
+def widget():
+    try:
+        root = ctk.CTk()
+    except tk.TclError:
+        pytest.skip("tidak ada display")
+    root.geometry("400x220")
+    widget = VirtualResultList(root)
+    widget.pack(fill="both", expand=True)
+    root.update()
+    yield widget
+    root.destroy()
+
+
+def _shown(widget):
+    canvas = widget.canvas
+    return [canvas.itemcget(text, "text") for _, text in widget._rows if canvas.itemcget(text, "state") != "hidden"]
+
+
+def test_only_visible_rows_are_drawn_and_numbers_follow_the_list(widget):
+    items = [f"/root/f{n:06}.txt" for n in range(100_000)]
+    selected = []
+    widget.on_select = selected.append
+    widget.set_items(items)
+    widget.update()
+
+    # List milik pemanggil dipakai langsung; canvas hanya berisi baris yang terlihat
+    assert widget.items is items
+    assert len(widget.canvas.find_all()) == 2 * len(widget._rows) <= 2 * (widget._visible_rows() + 1)
+    assert _shown(widget)[0] == "[1] /root/f000000.txt"
+
+    widget.scroll(1000)
+    assert _shown(widget)[0] == f"[1001] {items[1000]}"
+    widget._on_key(1)
+    assert selected == [1001] and widget.selected == 1000
+
+    # Urutkan di tempat: cukup gambar ulang, nomor [n] tetap menunjuk items[n - 1]
+    items.sort(reverse=True)
+    widget.refresh()
+    assert _shown(widget)[0] == f"[{widget.top + 1}] {items[widget.top]}"
+    assert len(widget.canvas.find_all()) == 2 * len(widget._rows)
+
+
+def test_message_shown_when_there_are_no_results(widget):
+    widget.set_items([], "Tidak ada hasil")
+    widget.update()
+    assert _shown(widget) == ["Tidak ada hasil"]
@@ -0,0 +1,146 @@
+import os
+
+from filemanager import FileIndex, NameIndex, scan_directory, search_name_contains
+
+
+def _edit_in_place(path, text):
+    # Isi file berubah tanpa mengubah mtime folder (seperti editor yang menulis di tempat)
+    folder = os.path.dirname(path)
+    dir_mtime = os.stat(folder).st_mtime_ns
+    with open(path, "a") as f:
+        f.write(text)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    os.utime(folder, ns=(dir_mtime, dir_mtime))
+
+
+def _sizes(scan):
+    return {scan.path(i): scan.sizes[i] for i in scan.ids()}
+
+
+def test_warm_rescan_sees_files_edited_in_place(tmp_path):
+    index = FileIndex(str(tmp_path / "index.sqlite3"))
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    path = str(root / "sub" / "a.txt")
+    with open(path, "w") as f:
+        f.write("hello world!\n")
+    assert _sizes(scan_directory(str(root), index=index)) == {path: 13}
+
+    _edit_in_place(path, "x" * 28)
+
+    assert _sizes(scan_directory(str(root), index=index)) == {path: 41}
+    # Index ikut diperbarui, jadi scan berikutnya juga benar
+    assert _sizes(scan_directory(str(root), index=index)) == {path: 41}
+
+
+def test_text_files_not_cached_when_changed_during_classification(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    for n in range(3):
+        (root / f"{n}.txt").write_text("teks\n")
+    scan = scan_directory(str(root))
+    new = root / "baru.txt"
+
+    def watcher_applies_change(done, total):
+        # Seperti DirectoryWatcher yang menerapkan file baru di tengah klasifikasi
+        if not new.exists():
+            new.write_text("teks\n")
+            entries = scan.entries(str(root))
+            st = new.stat()
+            entries[new.name] = (st.st_size, st.st_mtime_ns, None)
+            scan.apply_dir(str(root), entries)
+
+    first = scan.text_files(callback=watcher_applies_change)
+    assert str(new) not in list(first)
+    assert str(new) in list(scan.text_files())
+
+
+def test_text_files_keeps_no_path_keyed_verdict_cache(tmp_path):
+    from filemanager import common
+
+    for n in range(20):
+        with open(tmp_path / f"f{n}.txt", "w") as f:
+            f.write("hello\n")
+    scan = scan_directory(str(tmp_path))
+    assert len(scan.text_files()) == 20
+    # Verdict cukup disimpan di bitmap ScanResult; tidak ada dict per path di common
+    assert not any(isinstance(v, dict) and str(tmp_path / "f0.txt") in v
+                   for v in vars(common).values())
+
+
+def test_apply_dir_uses_scan_offsets_and_tracks_new_files(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    for name in ("b.txt", "a.txt", "c.txt"):
+        (sub / name).write_text(name)
+    scan = scan_directory(str(tmp_path))
+    # Tanpa tabel nama -> id per file; folder dicari lewat offset di array
+    assert scan._added == {}
+    entries = scan.entries(str(sub))
+    assert sorted(entries) == ["a.txt", "b.txt", "c.txt"]
+
+    entries.pop("a.txt")
+    entries["b.txt"] = (99,) + entries["b.txt"][1:]
+    entries["d.txt"] = (1, 0, None)
+    changed = scan.apply_dir(str(sub), entries)
+    assert sorted(os.path.basename(p) for p in changed) == ["a.txt", "b.txt", "d.txt"]
+    assert sorted(scan.entries(str(sub))) == ["b.txt", "c.txt", "d.txt"]
+    assert scan.entries(str(sub))["b.txt"][0] == 99
+    assert scan.apply_dir(str(sub), scan.entries(str(sub))) == []
+    assert sorted(os.path.basename(p) for p in scan) == ["b.txt", "c.txt", "d.txt"]
+
+
+def _walk_order(root):
+    # Urutan yang dijanjikan scan_directory: top-down seperti os.walk, nama diurutkan
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        paths.extend(os.path.join(dirpath, name) for name in sorted(filenames))
+    return paths
+
+
+def test_parallel_walk_matches_sorted_os_walk_for_any_worker_count(tmp_path):
+    root = tmp_path / "root"
+    for d in range(6):
+        for s in range(3):
+            folder = root / f"d{d}" / f"s{5 - s}"
+            folder.mkdir(parents=True)
+            for n in range(30):
+                (folder / f"{(n * 7) % 30:02}.txt").write_text("x" * n)
+    (root / "top.txt").write_text("top")
+    expected = _walk_order(str(root))
+
+    for workers in (1, 8):
+        counts = []
+        scan = scan_directory(str(root), callback=counts.append, workers=workers)
+        assert list(scan) == expected
+        assert _sizes(scan) == {path: os.path.getsize(path) for path in expected}
+        # Progress naik terus dan diakhiri jumlah total file
+        assert counts == sorted(counts) and counts[-1] == len(expected)
+
+
+def _name_matches(keyword, paths):
+    # Perilaku search_name_contains lama: nama file atau nama folder yang memuat keyword
+    k = keyword.lower()
+    found = {p for p in paths if k in os.path.basename(p).lower()}
+    found.update(os.path.dirname(p) for p in paths if k in os.path.basename(os.path.dirname(p)).lower())
+    return sorted(found)
+
+
+def test_name_index_matches_plain_substring_search_while_typing(tmp_path):
+    root = tmp_path / "root"
+    for folder in ("Reports", "reports/2024", "misc", "Repo-old"):
+        (root / folder).mkdir(parents=True)
+    for n, name in enumerate(["report.TXT", "q1.csv", "REPO.md", "notes.txt", "rep", "a.report.bak"]):
+        for folder in ("Reports", "reports/2024", "misc", "Repo-old"):
+            (root / folder / f"{n}{name}").write_text("")
+    scan = scan_directory(str(root))
+    paths = list(scan)
+    index = NameIndex.from_paths(paths)
+    # Kata kunci makin panjang memakai hasil sebelumnya, lalu kata kunci baru
+    for keyword in ["r", "re", "rep", "repo", "report", "reports", "2024", "RE", "txt", "zzz", "e"]:
+        expected = _name_matches(keyword, paths)
+        assert index.search(keyword) == expected
+        assert search_name_contains(keyword, scan) == expected
+        assert search_name_contains(keyword, paths) == expected
@@ -0,0 +1,255 @@
+import concurrent.futures
+import contextlib
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from filemanager import ConcurrencyTuner, SearchCancelled, Stats, get_previews, search_content, search_ranked
+from filemanager import search as search_module
+from filemanager.search import KeywordMatcher, _check_batch, _check_file_content, _count_stream
+
+
+class _CancelAfter:
+    # Event yang menjadi set setelah dicek n kali
+    def __init__(self, n):
+        self.n = n
+
+    def is_set(self):
+        self.n -= 1
+        return self.n < 0
+
+
+def _files(tmp_path, count):
+    paths = []
+    for n in range(count):
+        path = tmp_path / f"f{n:02}.txt"
+        path.write_text("alpha\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_batch_stops_between_files_when_cancelled(tmp_path):
+    paths = _files(tmp_path, 10)
+    found = _check_batch(paths, True, 1024, KeywordMatcher(["alpha"]), cancel=_CancelAfter(3))
+    assert found == paths[:3]
+
+
+def test_cancel_stops_a_running_batch(tmp_path, monkeypatch):
+    paths = _files(tmp_path, 40)
+    event = threading.Event()
+    opened = []
+    check = search_module._check_file_content
+
+    def cancel_after_first(path, *args):
+        # Tombol Batal ditekan saat file pertama sedang dibaca
+        opened.append(path)
+        event.set()
+        return check(path, *args)
+
+    monkeypatch.setattr(search_module, "_check_file_content", cancel_after_first)
+    with pytest.raises(SearchCancelled):
+        search_content(["alpha"], paths, backend="threads", batch_size=len(paths), cancel_event=event)
+    assert opened == paths[:1]
+
+
+def test_pool_picks_backend_per_search_and_creates_nothing_unused(monkeypatch):
+    made = []
+    real = search_module._make_search_executor
+
+    def counting(backend, workers, matcher):
+        made.append((backend, workers))
+        return real(backend, workers, matcher)
+
+    monkeypatch.setattr(search_module, "_make_search_executor", counting)
+    event = threading.Event()
+    with search_module.SearchPool("auto", workers=3, cancel_event=event) as pool:
+        assert search_content(["alpha"], [], cancel_event=event, pool=pool) == []
+        assert made == [] and pool._manager is None
+        _, _, workers, cancel = pool.get(10, KeywordMatcher(["alpha"]))
+        # Sedikit kandidat: thread, event pembatalan dipakai langsung tanpa Manager
+        assert made == [("threads", 3)] and workers == 3 and cancel is event and pool._manager is None
+
+
+@pytest.mark.parametrize("buffer_size", range(1, 9))
+def test_stream_counts_match_whole_text_across_chunk_boundaries(buffer_size):
+    text = "bbababaaabbbbaabbabbabbabbab aaaa"
+    matcher = KeywordMatcher(["aba", "bab", "aa"])
+    counts = _count_stream(io.StringIO(text), matcher, True, buffer_size, 1000)
+    assert counts == [text.count(k) for k in matcher.keywords]
+
+
+@pytest.mark.parametrize("buffer_size", [1, 2, 3, 5, 8, 64])
+def test_streaming_match_finds_keywords_split_across_chunks(tmp_path, buffer_size):
+    path = tmp_path / "a.txt"
+    path.write_text("xxxxxxx Needle yyyyyyy HAYSTACK zzzz")
+    assert _check_file_content(str(path), ["needle", "haystack"], True, buffer_size) == str(path)
+    assert _check_file_content(str(path), ["needle", "missing"], True, buffer_size) is None
+    assert _check_file_content(str(path), ["missing", "haystack"], False, buffer_size) == str(path)
+
+
+def test_streaming_match_stops_reading_once_decided(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_text("alpha beta " + "x" * 100_000)
+    read = [0]
+    assert _check_file_content(str(path), ["beta"], False, 1024, read) == str(path)
+    assert read[0] == 1024
+    read = [0]
+    assert _check_file_content(str(path), ["alpha", "beta"], True, 1024, read) == str(path)
+    assert read[0] == 1024
+    # AND yang tidak lengkap harus membaca sampai habis
+    read = [0]
+    assert _check_file_content(str(path), ["alpha", "gamma"], True, 1024, read) is None
+    assert read[0] == path.stat().st_size
+
+
+def test_matcher_reports_every_keyword_like_a_per_keyword_scan():
+    # Lebih banyak dari FEW_KEYWORDS, jadi lewat automaton regex; termasuk kata
+    # kunci yang jadi prefix kata kunci lain dan kemunculan yang tumpang tindih
+    keywords = ["part-1", "part-10", "part-100", "abc", "bcd", "cde", "x", "xy", "zz", "q" * 250, "nope"]
+    matcher = KeywordMatcher([k.upper() for k in keywords] + [""])
+    assert len(matcher) > KeywordMatcher.FEW_KEYWORDS
+    text = "order part-100 and abcde, xy, zzz " + "q" * 250
+    assert matcher.find(text) == {k for k in keywords if k in text}
+    assert matcher.find(text, skip={"abc", "x"}) == {k for k in keywords if k in text} - {"abc", "x"}
+    assert matcher.search(text) and not matcher.search("nothing here")
+    assert matcher.highlight("Part-10 and ABC", "[{}]") == "[Part-10] and [ABC]"
+
+
+def test_only_a_bounded_number_of_batches_is_in_flight(tmp_path, monkeypatch):
+    paths = _files(tmp_path, 60)
+    outstanding = []
+    peak = [0]
+    lock = threading.Lock()
+
+    class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            future = super().submit(*args, **kwargs)
+            with lock:
+                outstanding.append(future)
+                outstanding[:] = [f for f in outstanding if not f.done()]
+                peak[0] = max(peak[0], len(outstanding))
+            return future
+
+    def slow_batch(paths, *args):
+        time.sleep(0.005)
+        return check(paths, *args)
+
+    check = search_module._check_batch
+    monkeypatch.setattr(search_module, "_check_batch", slow_batch)
+    monkeypatch.setattr(search_module, "_make_search_executor",
+                        lambda backend, workers, matcher: (CountingExecutor(max_workers=workers), matcher, workers))
+    found = search_content(["alpha"], paths, backend="threads", workers=3, batch_size=1, adaptive=False)
+    assert found == paths
+    assert peak[0] <= 3
+
+
+def test_tuner_climbs_while_throughput_improves_and_stays_within_bounds(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(search_module.time, "monotonic", lambda: clock[0])
+    tuner = ConcurrencyTuner(ceiling=16, start=4, window=1.0)
+    limits = []
+    for _ in range(40):
+        # Throughput naik sampai 10 task berjalan, lalu turun (disk jenuh)
+        clock[0] += 1.0
+        tuner.record(100 * min(tuner.limit, 20 - tuner.limit), 1.0)
+        limits.append(tuner.limit)
+    assert all(1 <= limit <= 16 for limit in limits)
+    assert max(limits[:5]) > 4
+    # Setelah mendaki, tuner berputar di sekitar titik terbaik
+    assert all(6 <= limit <= 14 for limit in limits[10:])
+
+
+def _previews_by_reading_everything(path, keyword, context_lines, max_snippets):
+    # get_previews lama: seluruh file di-splitlines, satu kata kunci
+    with open(path) as f:
+        lines = f.read().splitlines()
+    snippets = []
+    for i, line in enumerate(lines):
+        if keyword in line.lower():
+            snippet = lines[max(0, i - context_lines):i + context_lines + 1]
+            snippets.append((i + 1, [ln.replace(keyword, f"--> {keyword} <--") for ln in snippet]))
+            if len(snippets) >= max_snippets:
+                break
+    return snippets
+
+
+@pytest.mark.parametrize("context_lines", [0, 1, 2])
+@pytest.mark.parametrize("max_snippets", [1, 3, 10])
+def test_previews_match_whole_file_previews(tmp_path, context_lines, max_snippets):
+    path = tmp_path / "log.txt"
+    hits = {1, 3, 4, 9, 15, 16}
+    path.write_text("\n".join(f"line {n} error" if n in hits else f"line {n}" for n in range(1, 17)) + "\n")
+    assert get_previews(str(path), ["ERROR"], context_lines, max_snippets) == \
+        _previews_by_reading_everything(str(path), "error", context_lines, max_snippets)
+
+
+def test_previews_stop_reading_after_enough_snippets(tmp_path, monkeypatch):
+    path = tmp_path / "big.log"
+    path.write_text("".join("line warn\n" if n in (2, 5, 9) else "line\n" for n in range(100_000)))
+    lines_read = [0]
+    real_open = search_module.open_text
+
+    @contextlib.contextmanager
+    def counting_open(path):
+        with real_open(path) as f:
+            def lines():
+                for line in f:
+                    lines_read[0] += 1
+                    yield line
+            yield lines()
+
+    monkeypatch.setattr(search_module, "open_text", counting_open)
+    snippets = get_previews(str(path), KeywordMatcher(["warn", "line warn"]), context_lines=1, max_snippets=3)
+    assert [n for n, _ in snippets] == [3, 6, 10]
+    assert snippets[0][1] == ["line", "--> line warn <--", "line"]
+    assert lines_read[0] <= 12
+
+
+def _ranked_files(tmp_path, now):
+    # Variasi jumlah kemunculan, nama dan umur; beberapa file punya skor sama persis
+    paths = []
+    for n in range(120):
+        name = f"alpha_{n:03}.txt" if n % 7 == 0 else f"file_{n:03}.txt"
+        path = tmp_path / name
+        path.write_text(("alpha " * (n % 25) + "beta " * (n % 4) + "\n") if n % 5 else "nothing\n")
+        age = (n % 9) * 86400 * 20
+        os.utime(path, (now - age, now - age))
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("mode_and", [True, False])
+@pytest.mark.parametrize("top_k", [1, 5, 17])
+def test_ranked_top_k_is_the_prefix_of_the_full_ranking(tmp_path, mode_and, top_k):
+    now = 1_700_000_000
+    paths = _ranked_files(tmp_path, now)
+    full = search_ranked(["alpha", "beta"], paths, mode_and, top_k=len(paths), backend="threads", now=now)
+    assert len(full) == sum(1 for p in paths if search_content(["alpha", "beta"], [p], mode_and, backend="threads"))
+    assert full == sorted(full, key=lambda item: -item[0])
+    progress = []
+    top = search_ranked(["alpha", "beta"], paths, mode_and, top_k=top_k, backend="threads", workers=4,
+                        batch_size=3, now=now, callback=lambda done, total: progress.append((done, total)))
+    assert top == full[:top_k]
+    assert progress == sorted(progress) and progress[-1] == (len(paths), len(paths))
+
+
+def test_ranked_search_stops_when_the_rest_cannot_enter_the_top_k(tmp_path):
+    now = 1_700_000_000
+    paths = []
+    for n in range(50):
+        # Lima file baru dengan kata kunci di nama dan isi, sisanya lama dan cocok lemah
+        best = n < 5
+        path = tmp_path / (f"alpha_{n}.txt" if best else f"old_{n}.txt")
+        path.write_text("alpha " * (30 if best else 1))
+        age = 0 if best else 3650 * 86400
+        os.utime(path, (now - age, now - age))
+        paths.append(str(path))
+    stats = Stats()
+    top = search_ranked(["alpha"], paths[::-1], top_k=5, backend="threads", workers=1, batch_size=1,
+                        adaptive=False, now=now, stats=stats)
+    assert sorted(p for _, p in top) == sorted(paths[:5])
+    assert stats.counters["content.rank_skipped"] == 45
+    assert stats.counters["content.files_opened"] == 5
@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+
+from filemanager import Stats, scan_directory, search_content
+from filemanager.stats import phase
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_overlapping_phases_are_charged_only_their_own_cpu():
+    stats = Stats()
+    started = threading.Event()
+
+    def busy():
+        with stats.phase("busy"):
+            started.set()
+            _busy(0.3)
+
+    thread = threading.Thread(target=busy)
+    thread.start()
+    started.wait()
+    with stats.phase("idle"):
+        time.sleep(0.2)
+    thread.join()
+    assert stats.phases["idle"]["wall"] >= 0.2
+    assert stats.phases["idle"]["cpu"] < 0.05
+    assert stats.phases["busy"]["cpu"] > 0.15
+
+
+def test_only_one_phase_profiles_at_a_time():
+    stats = Stats(profile=True)
+    barrier = threading.Barrier(4)
+
+    def run(n):
+        barrier.wait()
+        with stats.phase(f"p{n}"):
+            _busy(0.05)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stats._profiling is None
+    assert 1 <= len(stats.profiles) <= 4
+    assert all(stats.phases[f"p{n}"]["calls"] == 1 for n in range(4))
+
+
+def test_scan_and_content_search_record_phases_and_counters(tmp_path):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    for n in range(6):
+        (root / "sub" / f"{n}.txt").write_text("alpha " * n)
+    (root / "image.png").write_bytes(b"\x89PNG")
+    stats = Stats(slowest=3)
+
+    scan = scan_directory(str(root), stats=stats)
+    texts = scan.text_files(stats=stats)
+    found = search_content(["alpha"], texts, backend="threads", workers=2, stats=stats)
+
+    assert len(found) == 5
+    assert set(stats.phases) >= {"scan", "classify", "content"}
+    assert all(p["calls"] >= 1 and p["wall"] >= 0 for p in stats.phases.values())
+    counters = stats.counters
+    assert counters["scan.files"] == 7 and counters["scan.dirs_listed"] == 2
+    assert counters["content.files_opened"] == 6 and counters["content.matches"] == 5
+    assert counters["content.chars_read"] == sum(len("alpha " * n) for n in range(6))
+    assert stats.values["content.backend"] == "threads" and stats.values["content.workers"] == 2
+    assert 0 <= stats.values["content.worker_utilization"] <= 1
+    assert len(stats.slowest) == 3 and stats.slowest == sorted(stats.slowest, reverse=True)
+
+    doc = json.loads(stats.to_json())
+    assert doc["counters"]["content.matches"] == 5
+    assert {s["path"] for s in doc["slowest"]} <= set(texts)
+    assert "content" in stats.report()
+
+
+def test_phase_without_stats_is_a_no_op():
+    with phase(None, "scan") as value:
+        assert value is None
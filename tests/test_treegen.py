@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from benchmarks.treegen import generate_flat, generate_tree, remove_tree
+
+
+def test_refuses_existing_folder_it_did_not_create(tmp_path):
+    root = tmp_path / "precious"
+    root.mkdir()
+    (root / "important.txt").write_text("keep me")
+    with pytest.raises(FileExistsError):
+        generate_tree(str(root), files=5)
+    with pytest.raises(FileExistsError):
+        generate_flat(str(root), 5)
+    assert (root / "important.txt").read_text() == "keep me"
+
+
+def test_regenerates_and_removes_its_own_trees(tmp_path):
+    root = str(tmp_path / "tree")
+    first = generate_tree(root, files=5, depth=1, fanout=2)
+    assert generate_tree(root, files=5, depth=1, fanout=2) == first
+    assert generate_tree(root, files=7, depth=1, fanout=2)["params"]["files"] == 7
+
+    flat = str(tmp_path / "tree-organize")
+    generate_flat(flat, 5)
+    generate_flat(flat, 3)
+    assert len(os.listdir(flat)) == 3
+    remove_tree(flat)
+    remove_tree(root)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,55 @@
+import os
+import threading
+
+import pytest
+
+from filemanager import SearchCancelled, TrigramIndex, scan_directory, search_content
+
+
+def test_update_reindexes_file_edited_after_scan(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    path = str(root / "a.txt")
+    with open(path, "w") as f:
+        f.write("hello world\n")
+    scan = scan_directory(str(root))
+    files = scan.text_files()
+    index = TrigramIndex(str(tmp_path / "trigrams.sqlite3"))
+    index.update(scan)
+    assert index.filter(list(files), ["zebra"]) == []
+
+    # Diubah di tempat tanpa scan ulang
+    with open(path, "a") as f:
+        f.write("zebra\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    index.update(scan)
+
+    assert index.filter(list(files), ["zebra"]) == [path]
+    assert search_content(["zebra"], list(files), trigram_index=index, backend="threads") == [path]
+
+
+def test_update_with_ids_classifies_and_indexes_only_candidates(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (root / name).write_text("zebra\n")
+    scan = scan_directory(str(root))
+    wanted = [i for i in scan.ids() if scan.path(i).endswith("a.txt")]
+    index = TrigramIndex(str(tmp_path / "trigrams.sqlite3"))
+    index.update(scan, ids=wanted)
+
+    # File di luar kandidat belum disniff dan belum diindeks
+    assert [scan.text_flag(i) for i in scan.ids()].count(None) == 2
+    with index.connect() as conn:
+        assert [r[0] for r in conn.execute("SELECT path FROM docs")] == [str(root / "a.txt")]
+
+
+def test_update_stops_when_cancelled(tmp_path):
+    (tmp_path / "a.txt").write_text("zebra\n")
+    scan = scan_directory(str(tmp_path))
+    event = threading.Event()
+    event.set()
+    with pytest.raises(SearchCancelled):
+        TrigramIndex(str(tmp_path / "t.sqlite3")).update(scan, cancel_event=event)
+    assert scan.text_flag(next(iter(scan.ids()))) is None
@@ -0,0 +1,36 @@
+import time
+
+from filemanager import DirectoryWatcher, scan_directory
+
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_watcher_catches_up_on_changes_made_before_it_started(tmp_path):
+    root = tmp_path / "root"
+    (root / "kosong").mkdir(parents=True)
+    (root / "a.txt").write_text("lama\n")
+    scan = scan_directory(str(root))
+    assert str(root / "kosong") in scan.walked_dirs
+
+    # Perubahan setelah scan, sebelum watcher jalan (mis. saat watcher lama sudah berhenti)
+    (root / "a.txt").write_text("isi yang lebih panjang\n")
+    (root / "kosong" / "b.txt").write_text("baru\n")
+    watcher = DirectoryWatcher(scan).start()
+    try:
+        assert _wait(lambda: scan.watchers == 1)
+        sizes = {scan.path(i): scan.sizes[i] for i in scan.ids()}
+        assert sizes == {str(root / "a.txt"): 23, str(root / "kosong" / "b.txt"): 5}
+
+        # Folder yang kosong saat scan tetap dipantau
+        (root / "kosong" / "c.txt").write_text("c\n")
+        assert _wait(lambda: str(root / "kosong" / "c.txt") in list(scan))
+    finally:
+        watcher.stop()
+    assert _wait(lambda: scan.watchers == 0)